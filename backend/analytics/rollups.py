@@ -0,0 +1,111 @@
+"""
+Incremental sales rollups for analytics app.
+
+The DailySalesReport row of a restaurant/day is kept current by applying
+counter deltas with F() expressions whenever an order is created or changes
+status, so dashboards read a single row instead of scanning orders. Figures
+that cannot be maintained exactly this way (edits to delivered orders,
+deleted orders) are corrected by the reconcile_sales_rollups task.
+"""
+from collections import Counter
+from decimal import Decimal
+
+from django.db.models import Case, DecimalField, F, FloatField, Value, When
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+
+def _update_rollup(restaurant_id, day, **updates):
+    from analytics.models import DailySalesReport
+
+    # Make sure the row exists without racing concurrent creators
+    DailySalesReport.objects.bulk_create(
+        [DailySalesReport(restaurant_id=restaurant_id, date=day)],
+        ignore_conflicts=True,
+    )
+    DailySalesReport.objects.filter(restaurant_id=restaurant_id, date=day).update(
+        updated_at=timezone.now(), **updates
+    )
+
+
+def _decimal(value):
+    # Unsaved instances may still hold the fields' float defaults
+    return Decimal(str(value or 0))
+
+
+def _transition_delta(status, previous_status, new_status):
+    """+1 when an order enters `status`, -1 when it leaves it, 0 otherwise."""
+    return int(new_status == status) - int(previous_status == status)
+
+
+def record_order_created(order):
+    """Count a newly placed order in its restaurant/day rollup."""
+    from orders.models import Order
+
+    day = timezone.localdate(order.created_at)
+    updates = {'total_orders': F('total_orders') + 1}
+
+    is_new_customer = not Order.objects.filter(
+        restaurant_id=order.restaurant_id,
+        user_id=order.user_id,
+        created_at__date=day,
+    ).exclude(pk=order.pk).exists()
+    if is_new_customer:
+        updates['unique_customers'] = F('unique_customers') + 1
+
+    updates.update(_status_updates(order, None))
+    _update_rollup(order.restaurant_id, day, **updates)
+
+
+def record_order_status_change(order, previous_status):
+    """Move an order between the completed/cancelled counters of its rollup."""
+    updates = _status_updates(order, previous_status)
+    if updates:
+        _update_rollup(order.restaurant_id, timezone.localdate(order.created_at), **updates)
+
+
+def record_orders_cancelled(orders):
+    """
+    Count orders cancelled in bulk (bypassing signals) in their rollups.
+
+    `orders` are PENDING orders given as dicts with restaurant_id and
+    created_at; one UPDATE is issued per affected restaurant/day.
+    """
+    per_day = Counter(
+        (order['restaurant_id'], timezone.localdate(order['created_at'])) for order in orders
+    )
+    for (restaurant_id, day), count in per_day.items():
+        _update_rollup(restaurant_id, day, cancelled_orders=F('cancelled_orders') + count)
+
+
+def _status_updates(order, previous_status):
+    updates = {}
+
+    cancelled = _transition_delta('CANCELLED', previous_status, order.status)
+    if cancelled:
+        updates['cancelled_orders'] = F('cancelled_orders') + cancelled
+
+    completed = _transition_delta('DELIVERED', previous_status, order.status)
+    if completed:
+        total, discount = _decimal(order.total), _decimal(order.discount)
+        gross_revenue = F('gross_revenue') + total * completed
+        completed_orders = F('completed_orders') + completed
+        updates.update({
+            'completed_orders': completed_orders,
+            'gross_revenue': gross_revenue,
+            'net_revenue': F('net_revenue') + (total - discount) * completed,
+            'tax_collected': F('tax_collected') + _decimal(order.tax) * completed,
+            'delivery_fees': F('delivery_fees') + _decimal(order.delivery_fee) * completed,
+            'discounts_given': F('discounts_given') + discount * completed,
+            # Right-hand F() values are read before the update, so recompute
+            # the average from the post-update totals explicitly
+            'average_order_value': Case(
+                When(
+                    completed_orders__gt=-completed,
+                    then=Cast(gross_revenue, FloatField()) / completed_orders,
+                ),
+                default=Value(0),
+                output_field=DecimalField(max_digits=10, decimal_places=2),
+            ),
+        })
+    return updates
@@ -1,67 +1,146 @@
 """
 Celery tasks for analytics app.
 """
-from celery import shared_task
+from decimal import Decimal
+from celery import group, shared_task
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from datetime import timedelta
-from django.db.models import Sum, Count, Avg
+from django.db.models import Sum, Count, Avg, Q
+from django.db.models.functions import TruncDate
 
 
-@shared_task
-def generate_daily_reports():
+REPORT_FIELDS = [
+    'total_orders', 'completed_orders', 'cancelled_orders',
+    'gross_revenue', 'net_revenue', 'tax_collected', 'delivery_fees', 'discounts_given',
+    'average_order_value', 'unique_customers',
+]
+
+
+def build_daily_reports(start_date, end_date):
     """
-    Generate daily sales reports for all restaurants.
-    Runs daily at 00:30 AM via Celery Beat.
+    Create or update DailySalesReport rows of every active restaurant for
+    each day from start_date to end_date inclusive.
+
+    All figures come from one grouped aggregation over orders, and the
+    reports are written with a bulk upsert on (restaurant, date).
+    Returns the number of reports written.
     """
     from analytics.models import DailySalesReport
     from restaurants.models import Restaurant
     from orders.models import Order
-    
-    yesterday = (timezone.now() - timedelta(days=1)).date()
-    reports_generated = 0
-    
-    for restaurant in Restaurant.objects.filter(status='ACTIVE'):
-        # Get orders for yesterday
-        orders = Order.objects.filter(
-            restaurant=restaurant,
-            created_at__date=yesterday
+
+    completed = Q(status='DELIVERED')
+    rows = (
+        Order.objects.filter(
+            restaurant__status='ACTIVE',
+            created_at__date__gte=start_date,
+            created_at__date__lte=end_date,
         )
-        
-        completed_orders = orders.filter(status='DELIVERED')
-        cancelled_orders = orders.filter(status='CANCELLED')
-        
-        # Calculate revenue
-        gross_revenue = completed_orders.aggregate(Sum('total'))['total__sum'] or 0
-        tax_collected = completed_orders.aggregate(Sum('tax'))['tax__sum'] or 0
-        delivery_fees = completed_orders.aggregate(Sum('delivery_fee'))['delivery_fee__sum'] or 0
-        discounts_given = completed_orders.aggregate(Sum('discount'))['discount__sum'] or 0
-        
-        net_revenue = gross_revenue - discounts_given
-        
-        # Average order value
-        avg_order_value = completed_orders.aggregate(Avg('total'))['total__avg'] or 0
-        
-        # Customer stats
-        unique_customers = orders.values('user').distinct().count()
-        
-        # Create or update report
-        report, created = DailySalesReport.objects.update_or_create(
-            restaurant=restaurant,
-            date=yesterday,
-            defaults={
-                'total_orders': orders.count(),
-                'completed_orders': completed_orders.count(),
-                'cancelled_orders': cancelled_orders.count(),
-                'gross_revenue': gross_revenue,
-                'net_revenue': net_revenue,
-                'tax_collected': tax_collected,
-                'delivery_fees': delivery_fees,
-                'discounts_given': discounts_given,
-                'average_order_value': avg_order_value,
-                'unique_customers': unique_customers,
-            }
+        .annotate(day=TruncDate('created_at'))
+        .values('restaurant_id', 'day')
+        .annotate(
+            total_orders=Count('id'),
+            completed_orders=Count('id', filter=completed),
+            cancelled_orders=Count('id', filter=Q(status='CANCELLED')),
+            gross_revenue=Sum('total', filter=completed),
+            tax_collected=Sum('tax', filter=completed),
+            delivery_fees=Sum('delivery_fee', filter=completed),
+            discounts_given=Sum('discount', filter=completed),
+            average_order_value=Avg('total', filter=completed),
+            unique_customers=Count('user', distinct=True),
         )
-        
-        reports_generated += 1
-    
-    return f"Generated {reports_generated} daily reports for {yesterday}"
+        .order_by()
+    )
+    stats = {(row['restaurant_id'], row['day']): row for row in rows}
+
+    days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+    reports = []
+    for restaurant_id in Restaurant.objects.filter(status='ACTIVE').values_list('id', flat=True):
+        for day in days:
+            row = stats.get((restaurant_id, day), {})
+            gross_revenue = row.get('gross_revenue') or 0
+            discounts_given = row.get('discounts_given') or 0
+            reports.append(DailySalesReport(
+                restaurant_id=restaurant_id,
+                date=day,
+                total_orders=row.get('total_orders', 0),
+                completed_orders=row.get('completed_orders', 0),
+                cancelled_orders=row.get('cancelled_orders', 0),
+                gross_revenue=gross_revenue,
+                net_revenue=gross_revenue - discounts_given,
+                tax_collected=row.get('tax_collected') or 0,
+                delivery_fees=row.get('delivery_fees') or 0,
+                discounts_given=discounts_given,
+                average_order_value=Decimal(str(row.get('average_order_value') or 0)).quantize(Decimal('0.01')),
+                unique_customers=row.get('unique_customers', 0),
+            ))
+
+    DailySalesReport.objects.bulk_create(
+        reports,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['restaurant', 'date'],
+        update_fields=REPORT_FIELDS + ['updated_at'],
+    )
+    return len(reports)
+
+
+@shared_task
+def generate_daily_reports(report_date=None):
+    """
+    Generate daily sales reports for all restaurants.
+    Runs daily at 00:30 AM via Celery Beat for yesterday;
+    pass report_date (YYYY-MM-DD) to regenerate another day.
+    """
+    if report_date:
+        day = parse_date(report_date)
+    else:
+        day = (timezone.now() - timedelta(days=1)).date()
+
+    reports_generated = build_daily_reports(day, day)
+
+    return f"Generated {reports_generated} daily reports for {day}"
+
+
+@shared_task
+def generate_reports_for_range(start_date, end_date):
+    """
+    Generate daily sales reports for a date range (YYYY-MM-DD, inclusive).
+    """
+    reports_generated = build_daily_reports(parse_date(start_date), parse_date(end_date))
+    return f"Generated {reports_generated} daily reports for {start_date} to {end_date}"
+
+
+@shared_task
+def backfill_daily_reports(start_date, end_date, chunk_days=7):
+    """
+    Backfill daily sales reports for a date range (YYYY-MM-DD, inclusive).
+    The range is split into chunks of chunk_days processed in parallel
+    by the workers.
+    """
+    start, end = parse_date(start_date), parse_date(end_date)
+
+    chunks = []
+    chunk_start = start
+    while chunk_start <= end:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end)
+        chunks.append(generate_reports_for_range.s(chunk_start.isoformat(), chunk_end.isoformat()))
+        chunk_start = chunk_end + timedelta(days=1)
+
+    group(chunks).apply_async()
+
+    return f"Scheduled {len(chunks)} report chunks for {start_date} to {end_date}"
+
+
+@shared_task
+def reconcile_sales_rollups(days=2):
+    """
+    Recompute the incrementally maintained reports of the last `days` days
+    (today included) from orders, correcting any drift.
+    Runs hourly via Celery Beat.
+    """
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    reports_generated = build_daily_reports(start, today)
+    return f"Reconciled {reports_generated} daily reports for {start} to {today}"
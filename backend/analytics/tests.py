@@ -1,3 +1,149 @@
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+
 from django.test import TestCase
+from django.utils import timezone
+
+from analytics.models import DailySalesReport
+from analytics.tasks import build_daily_reports, generate_reports_for_range, reconcile_sales_rollups
+from orders.models import Order
+from restaurants.tests import create_restaurant
+from users.models import User
+
+
+class DailyReportTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user(
+            email='owner@example.com', username='owner', password='pass', role='RESTAURANT_OWNER'
+        )
+        self.customers = [
+            User.objects.create_user(email=f'c{i}@example.com', username=f'c{i}', password='pass')
+            for i in range(2)
+        ]
+        self.restaurant = create_restaurant(owner)
+        self.quiet = create_restaurant(owner, name='Quiet', slug='quiet')
+        self.inactive = create_restaurant(owner, name='Closed', slug='closed', status='INACTIVE')
+        self.day = date(2026, 3, 1)
+
+    def create_order(self, user, status, total, day=None, restaurant=None):
+        order = Order.objects.create(
+            user=user, restaurant=restaurant or self.restaurant, status=status,
+            subtotal=total, tax=Decimal('1.00'), delivery_fee=Decimal('2.00'),
+            discount=Decimal('0.50'), total=total,
+        )
+        created_at = datetime.combine(day or self.day, datetime.min.time(), tzinfo=dt_timezone.utc)
+        Order.objects.filter(pk=order.pk).update(created_at=created_at.replace(hour=12))
+        return order
+
+    def test_reports_aggregate_all_active_restaurants(self):
+        self.create_order(self.customers[0], 'DELIVERED', Decimal('10.00'))
+        self.create_order(self.customers[0], 'DELIVERED', Decimal('20.00'))
+        self.create_order(self.customers[1], 'CANCELLED', Decimal('15.00'))
+        self.create_order(self.customers[1], 'DELIVERED', Decimal('99.00'), day=date(2026, 3, 2))
+        self.create_order(self.customers[1], 'DELIVERED', Decimal('99.00'), restaurant=self.inactive)
+
+        with self.assertNumQueries(3):
+            self.assertEqual(build_daily_reports(self.day, self.day), 2)
+
+        report = DailySalesReport.objects.get(restaurant=self.restaurant, date=self.day)
+        self.assertEqual(report.total_orders, 3)
+        self.assertEqual(report.completed_orders, 2)
+        self.assertEqual(report.cancelled_orders, 1)
+        self.assertEqual(report.gross_revenue, Decimal('30.00'))
+        self.assertEqual(report.tax_collected, Decimal('2.00'))
+        self.assertEqual(report.delivery_fees, Decimal('4.00'))
+        self.assertEqual(report.discounts_given, Decimal('1.00'))
+        self.assertEqual(report.net_revenue, Decimal('29.00'))
+        self.assertEqual(report.average_order_value, Decimal('15.00'))
+        self.assertEqual(report.unique_customers, 2)
+
+        quiet_report = DailySalesReport.objects.get(restaurant=self.quiet, date=self.day)
+        self.assertEqual(quiet_report.total_orders, 0)
+        self.assertFalse(DailySalesReport.objects.filter(restaurant=self.inactive, date=self.day).exists())
+
+    def test_rerun_updates_existing_reports(self):
+        build_daily_reports(self.day, self.day)
+        self.create_order(self.customers[0], 'DELIVERED', Decimal('10.00'))
+        build_daily_reports(self.day, self.day)
+
+        report = DailySalesReport.objects.get(restaurant=self.restaurant, date=self.day)
+        self.assertEqual(report.completed_orders, 1)
+        self.assertEqual(DailySalesReport.objects.filter(date=self.day).count(), 2)
+
+    def test_range_generates_one_report_per_restaurant_day(self):
+        self.create_order(self.customers[0], 'DELIVERED', Decimal('10.00'), day=date(2026, 3, 3))
+        generate_reports_for_range('2026-03-01', '2026-03-07')
+
+        march = DailySalesReport.objects.filter(date__range=(date(2026, 3, 1), date(2026, 3, 7)))
+        self.assertEqual(march.count(), 14)
+        report = DailySalesReport.objects.get(restaurant=self.restaurant, date=date(2026, 3, 3))
+        self.assertEqual(report.gross_revenue, Decimal('10.00'))
+
+
+class SalesRollupTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user(
+            email='owner@example.com', username='owner', password='pass', role='RESTAURANT_OWNER'
+        )
+        self.customer = User.objects.create_user(email='customer@example.com', username='customer', password='pass')
+        self.restaurant = create_restaurant(owner)
+
+    def create_order(self, total='20.00'):
+        return Order.objects.create(
+            user=self.customer, restaurant=self.restaurant, subtotal=Decimal(total),
+            tax=Decimal('2.00'), discount=Decimal('1.00'), total=Decimal(total),
+        )
+
+    def get_report(self):
+        return DailySalesReport.objects.get(restaurant=self.restaurant, date=timezone.localdate())
+
+    def test_counters_follow_status_transitions(self):
+        first = self.create_order('20.00')
+        second = self.create_order('15.00')
+        report = self.get_report()
+        self.assertEqual((report.total_orders, report.unique_customers, report.completed_orders), (2, 1, 0))
+
+        first.status = 'DELIVERED'
+        first.save()
+        second.status = 'DELIVERED'
+        second.save()
+        report = self.get_report()
+        self.assertEqual(report.completed_orders, 2)
+        self.assertEqual(report.gross_revenue, Decimal('35.00'))
+        self.assertEqual(report.net_revenue, Decimal('33.00'))
+        self.assertEqual(report.tax_collected, Decimal('4.00'))
+        self.assertEqual(report.average_order_value, Decimal('17.50'))
+
+        second.status = 'REFUNDED'
+        second.save()
+        report = self.get_report()
+        self.assertEqual(report.completed_orders, 1)
+        self.assertEqual(report.gross_revenue, Decimal('20.00'))
+        self.assertEqual(report.average_order_value, Decimal('20.00'))
+
+        first.status = 'CANCELLED'
+        first.save()
+        report = self.get_report()
+        self.assertEqual((report.completed_orders, report.cancelled_orders), (0, 1))
+        self.assertEqual(report.gross_revenue, Decimal('0.00'))
+        self.assertEqual(report.average_order_value, Decimal('0.00'))
+
+    def test_saves_without_status_change_do_not_count_twice(self):
+        order = self.create_order()
+        order.status = 'DELIVERED'
+        order.save()
+        order.delivery_instructions = 'Ring twice'
+        order.save()
+        self.assertEqual(self.get_report().completed_orders, 1)
+
+    def test_reconciliation_corrects_drift(self):
+        order = self.create_order()
+        order.status = 'DELIVERED'
+        order.save()
+        DailySalesReport.objects.update(completed_orders=7, gross_revenue=Decimal('1.00'))
+
+        reconcile_sales_rollups()
 
-# Create your tests here.
+        report = self.get_report()
+        self.assertEqual(report.completed_orders, 1)
+        self.assertEqual(report.gross_revenue, Decimal('20.00'))
@@ -1,6 +1,9 @@
 """Views for analytics app."""
+from django.utils import timezone
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from analytics.models import DailySalesReport
 from analytics.serializers.analytics_serializers import DailySalesReportSerializer
 
@@ -11,4 +14,14 @@ class DailySalesReportViewSet(viewsets.ModelViewSet):
     serializer_class = DailySalesReportSerializer
     permission_classes = [IsAuthenticated]
 
-
+    @action(detail=False, methods=['get'])
+    def today(self, request):
+        """Live figures for today, maintained incrementally from order updates."""
+        reports = DailySalesReport.objects.filter(date=timezone.localdate()).select_related('restaurant')
+        if request.user.role != 'ADMIN':
+            reports = reports.filter(restaurant__owner=request.user)
+        restaurant_id = request.query_params.get('restaurant')
+        if restaurant_id:
+            reports = reports.filter(restaurant_id=restaurant_id)
+        serializer = self.get_serializer(reports, many=True)
+        return Response(serializer.data)
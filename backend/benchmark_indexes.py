@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+"""
+Benchmark of the hot-query indexes (orders, reservations, notifications,
+inventory, promotions).
+
+Seeds a throwaway SQLite database, then prints the query plan and average
+run time of each hot query without the indexes ("before") and with them
+("after"). The development database is never touched.
+
+    python benchmark_indexes.py [--scale 1.0] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time as timer
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+import django
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument('--scale', type=float, default=1.0, help='Dataset size multiplier (1.0 = 50k orders)')
+parser.add_argument('--repeat', type=int, default=20, help='Executions per query when timing')
+args = parser.parse_args()
+
+db_file = tempfile.NamedTemporaryFile(suffix='.sqlite3', delete=False)
+db_file.close()
+os.environ['DB_ENGINE'] = 'django.db.backends.sqlite3'
+os.environ['DB_NAME'] = db_file.name
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection
+
+from inventory.models import InventoryItem, StockMovement
+from notifications.models import Notification
+from orders.models import Order
+from promotions.models import Promotion
+from reservations.availability import get_reservation_duration, overlapping_reservations
+from reservations.models import Reservation
+from restaurants.models import Restaurant, Table
+from users.models import User
+
+# Indexes under test, by model
+INDEXED_MODELS = [Order, Reservation, Notification, StockMovement, Promotion]
+
+random.seed(42)
+now = datetime(2026, 3, 1, 20, 0, tzinfo=dt_timezone.utc)
+
+
+def scaled(count):
+    return max(1, int(count * args.scale))
+
+
+def seed():
+    users = User.objects.bulk_create([
+        User(username=f'user{i}', email=f'user{i}@example.com', password='!')
+        for i in range(scaled(2000))
+    ], batch_size=1000)
+    restaurants = Restaurant.objects.bulk_create([
+        Restaurant(
+            owner=users[i % len(users)], name=f'Restaurant {i}', slug=f'restaurant-{i}',
+            description='', phone='', email='r@example.com', street_address='', city='Almaty',
+            state='', postal_code='', status='ACTIVE',
+        )
+        for i in range(scaled(200))
+    ], batch_size=1000)
+    tables = Table.objects.bulk_create([
+        Table(restaurant=restaurant, table_number=str(n), capacity=random.choice([2, 4, 6]))
+        for restaurant in restaurants for n in range(10)
+    ], batch_size=1000)
+
+    statuses = [choice for choice, _ in Order.STATUS_CHOICES]
+    Order.objects.bulk_create([
+        Order(
+            user=random.choice(users), restaurant=random.choice(restaurants),
+            order_number=f'ORD-{i}', status=random.choice(statuses), is_paid=random.random() < 0.8,
+            subtotal=Decimal('20.00'), total=Decimal('22.00'),
+        )
+        for i in range(scaled(50000))
+    ], batch_size=2000)
+    # created_at is auto_now_add; spread it over 90 days afterwards
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "UPDATE orders SET created_at = datetime(%s, '-' || (abs(random()) %% 7776000) || ' seconds')",
+            [now.strftime('%Y-%m-%d %H:%M:%S')],
+        )
+
+    reservation_statuses = [choice for choice, _ in Reservation.STATUS_CHOICES]
+    Reservation.objects.bulk_create([
+        Reservation(
+            user=random.choice(users), restaurant_id=table.restaurant_id, table=table,
+            reservation_date=date(2026, 3, 1) + timedelta(days=random.randint(-60, 30)),
+            reservation_time=time(random.randint(11, 22), random.choice([0, 15, 30, 45])),
+            guests_count=2, status=random.choice(reservation_statuses), phone='', email='r@example.com',
+        )
+        for table in random.choices(tables, k=scaled(50000))
+    ], batch_size=2000)
+
+    Notification.objects.bulk_create([
+        Notification(
+            user=random.choice(users), notification_type='ORDER', title='Order update', message='',
+            is_read=random.random() < 0.7,
+        )
+        for _ in range(scaled(100000))
+    ], batch_size=2000)
+
+    items = InventoryItem.objects.bulk_create([
+        InventoryItem(
+            restaurant=restaurant, name=f'Item {n}', category='General', current_quantity=100,
+            minimum_quantity=10, unit_cost=1,
+        )
+        for restaurant in restaurants for n in range(5)
+    ], batch_size=1000)
+    StockMovement.objects.bulk_create([
+        StockMovement(
+            inventory_item=random.choice(items), movement_type='USAGE',
+            quantity=-1, previous_quantity=100, new_quantity=99,
+        )
+        for _ in range(scaled(50000))
+    ], batch_size=2000)
+
+    Promotion.objects.bulk_create([
+        Promotion(
+            code=f'PROMO{i}', name='Promo', description='', promotion_type='FIXED',
+            discount_amount=5, is_active=random.random() < 0.3,
+            start_date=now - timedelta(days=random.randint(0, 365)),
+            end_date=now + timedelta(days=random.randint(-300, 60)),
+        )
+        for i in range(scaled(5000))
+    ], batch_size=2000)
+
+    return users, restaurants, tables, items
+
+
+def hot_queries(users, restaurants, tables, items):
+    user, restaurant, table, item = users[0], restaurants[0], tables[0], items[0]
+    return [
+        ('Restaurant orders page', Order.objects.filter(restaurant=restaurant).order_by('-created_at')[:20]),
+        ('Customer orders page', Order.objects.filter(user=user).order_by('-created_at')[:20]),
+        ('auto_cancel_unpaid_orders', Order.objects.filter(
+            status='PENDING', is_paid=False, created_at__lt=now - timedelta(days=89, hours=23))),
+        ('Table availability', overlapping_reservations(
+            date(2026, 3, 1), time(19, 0), get_reservation_duration()).filter(table=table)),
+        ('Restaurant reservations for a day', Reservation.objects.filter(
+            restaurant=restaurant, reservation_date=date(2026, 3, 1))),
+        ('mark_no_show_reservations', Reservation.objects.filter(
+            status='CONFIRMED', reservation_date__gte=date(2026, 3, 30))),
+        ('Unread notifications', Notification.objects.filter(user=user, is_read=False).order_by()),
+        ('Notifications page', Notification.objects.filter(user=user).order_by('-created_at')[:20]),
+        ('Stock movements page', StockMovement.objects.filter(
+            inventory_item=item).order_by('-created_at')[:20]),
+        ('Active promotions', Promotion.objects.filter(
+            is_active=True, start_date__lte=now, end_date__gte=now)),
+    ]
+
+
+def measure(queries):
+    results = {}
+    for name, queryset in queries:
+        plan = queryset.explain()
+        started = timer.perf_counter()
+        for _ in range(args.repeat):
+            list(queryset.all())
+        results[name] = (plan, (timer.perf_counter() - started) / args.repeat * 1000)
+    return results
+
+
+def set_indexes(enabled):
+    with connection.schema_editor() as schema_editor:
+        for model in INDEXED_MODELS:
+            for index in model._meta.indexes:
+                if enabled:
+                    schema_editor.add_index(model, index)
+                else:
+                    schema_editor.remove_index(model, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def main():
+    print(f"Seeding benchmark database {db_file.name} (scale {args.scale})...")
+    call_command('migrate', verbosity=0)
+    queries = hot_queries(*seed())
+
+    set_indexes(False)
+    before = measure(queries)
+    set_indexes(True)
+    after = measure(queries)
+
+    for name, _ in queries:
+        (plan_before, ms_before), (plan_after, ms_after) = before[name], after[name]
+        print(f"\n=== {name}: {ms_before:.2f} ms -> {ms_after:.2f} ms")
+        print("  before: " + plan_before.replace('\n', '\n          '))
+        print("  after:  " + plan_after.replace('\n', '\n          '))
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    finally:
+        connection.close()
+        os.unlink(db_file.name)
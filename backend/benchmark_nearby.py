@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Benchmark of the nearby-restaurant search (?near=lat,lng&radius=km).
+
+Seeds a throwaway SQLite database with restaurants scattered around a few
+cities, then compares the average run time of a radius search computing the
+haversine distance of every row ("full scan") with restaurants.geo's
+geohash + bounding-box prefiltered search ("indexed"). The development
+database is never touched.
+
+    python benchmark_nearby.py [--restaurants 100000] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time as timer
+from decimal import Decimal
+
+import django
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument('--restaurants', type=int, default=100000, help='Number of restaurants to seed')
+parser.add_argument('--repeat', type=int, default=20, help='Executions per query when timing')
+args = parser.parse_args()
+
+db_file = tempfile.NamedTemporaryFile(suffix='.sqlite3', delete=False)
+db_file.close()
+os.environ['DB_ENGINE'] = 'django.db.backends.sqlite3'
+os.environ['DB_NAME'] = db_file.name
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection
+
+from restaurants.geo import distance_expression, encode_geohash, filter_nearby
+from restaurants.models import Restaurant
+from users.models import User
+
+# (latitude, longitude) of the seeded cities
+CITIES = [(43.2389, 76.8897), (51.1605, 71.4704), (42.3417, 69.5901), (47.1164, 51.8833)]
+SEARCHES = [(43.2389, 76.8897, 1), (43.2389, 76.8897, 5), (51.1605, 71.4704, 20), (42.3417, 69.5901, 50)]
+
+random.seed(42)
+
+
+def seed():
+    owner = User.objects.create(username='owner', email='owner@example.com', password='!')
+    restaurants = []
+    for i in range(args.restaurants):
+        city_lat, city_lng = random.choice(CITIES)
+        latitude = Decimal(f'{city_lat + random.gauss(0, 0.15):.6f}')
+        longitude = Decimal(f'{city_lng + random.gauss(0, 0.2):.6f}')
+        restaurants.append(Restaurant(
+            owner=owner, name=f'Restaurant {i}', slug=f'restaurant-{i}', description='',
+            phone='', email='r@example.com', street_address='', city='', state='', postal_code='',
+            status='ACTIVE', latitude=latitude, longitude=longitude,
+            # bulk_create skips save(), so fill the index column here
+            geohash=encode_geohash(latitude, longitude),
+        ))
+    Restaurant.objects.bulk_create(restaurants, batch_size=2000)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def full_scan(latitude, longitude, radius):
+    return Restaurant.objects.filter(status='ACTIVE').annotate(
+        distance=distance_expression(latitude, longitude)
+    ).filter(distance__lte=radius).order_by('distance')
+
+
+def indexed(latitude, longitude, radius):
+    return filter_nearby(Restaurant.objects.filter(status='ACTIVE'), latitude, longitude, radius).order_by('distance')
+
+
+def measure(queryset):
+    started = timer.perf_counter()
+    for _ in range(args.repeat):
+        rows = list(queryset.all().values_list('id', flat=True))
+    return rows, (timer.perf_counter() - started) / args.repeat * 1000
+
+
+def main():
+    print(f"Seeding benchmark database {db_file.name} ({args.restaurants} restaurants)...")
+    call_command('migrate', verbosity=0)
+    seed()
+
+    for latitude, longitude, radius in SEARCHES:
+        expected, ms_scan = measure(full_scan(latitude, longitude, radius))
+        found, ms_indexed = measure(indexed(latitude, longitude, radius))
+        assert found == expected, 'indexed search returned different restaurants'
+        print(f"\n=== near={latitude},{longitude} radius={radius} km: {len(found)} restaurants")
+        print(f"  full scan: {ms_scan:.2f} ms")
+        print(f"  indexed:   {ms_indexed:.2f} ms")
+        plan = indexed(latitude, longitude, radius).explain()
+        print("  plan:      " + plan.replace('\n', '\n             '))
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    finally:
+        connection.close()
+        os.unlink(db_file.name)
@@ -34,6 +34,18 @@ app.conf.beat_schedule = {
         'task': 'analytics.tasks.generate_daily_reports',
         'schedule': crontab(minute='30', hour='0'),  # 00:30 AM daily
     },
+    'reconcile-sales-rollups': {
+        'task': 'analytics.tasks.reconcile_sales_rollups',
+        'schedule': crontab(minute='45'),  # Every hour
+    },
+    'reconcile-unread-notification-counts': {
+        'task': 'notifications.tasks.reconcile_unread_counts',
+        'schedule': crontab(minute='*/30'),  # Every 30 minutes
+    },
+    'archive-old-notifications': {
+        'task': 'notifications.tasks.archive_old_notifications',
+        'schedule': crontab(minute='15', hour='3'),  # 03:15 AM daily
+    },
 }
 
 @app.task(bind=True)
@@ -50,6 +50,8 @@ INSTALLED_APPS = [
     'promotions.apps.PromotionsConfig',
     'analytics.apps.AnalyticsConfig',
     'developers.apps.DevelopersConfig',
+    'search.apps.SearchConfig',
+    'realtime.apps.RealtimeConfig',
 ]
 
 MIDDLEWARE = [
@@ -197,6 +199,93 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 
+# Cache Configuration
+# Redis when REDIS_HOST is set (docker-compose), in-process memory otherwise.
+REDIS_HOST = config('REDIS_HOST', default='')
+REDIS_PORT = config('REDIS_PORT', default=6379, cast=int)
+REDIS_CACHE_DB = config('REDIS_CACHE_DB', default=1, cast=int)
+
+if REDIS_HOST:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': f'redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_CACHE_DB}',
+            'KEY_PREFIX': 'restaurant',
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                # A cache outage must degrade to database reads, not 500s
+                'IGNORE_EXCEPTIONS': True,
+            },
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'restaurant-platform',
+        }
+    }
+
+# Realtime event streams (api/v1/realtime/stream/, ASGI only): Redis pub/sub
+# across processes when Redis is configured, in-process fan-out otherwise
+REALTIME_BROKER = config(
+    'REALTIME_BROKER',
+    default='realtime.brokers.RedisBroker' if REDIS_HOST else 'realtime.brokers.InProcessBroker',
+)
+REALTIME_REDIS_URL = config('REALTIME_REDIS_URL', default=f'redis://{REDIS_HOST or "localhost"}:{REDIS_PORT}/{REDIS_CACHE_DB}')
+REALTIME_HEARTBEAT_SECONDS = config('REALTIME_HEARTBEAT_SECONDS', default=15, cast=int)
+# Lifetime of the single-use tickets browsers open event streams with
+REALTIME_TICKET_SECONDS = config('REALTIME_TICKET_SECONDS', default=30, cast=int)
+
+# Public restaurant list/detail responses (seconds)
+RESTAURANT_CACHE_TIMEOUT = config('RESTAURANT_CACHE_TIMEOUT', default=300, cast=int)
+# Nearby search (?near=lat,lng&radius=km)
+RESTAURANT_NEARBY_DEFAULT_RADIUS_KM = config('RESTAURANT_NEARBY_DEFAULT_RADIUS_KM', default=5, cast=float)
+RESTAURANT_NEARBY_MAX_RADIUS_KM = config('RESTAURANT_NEARBY_MAX_RADIUS_KM', default=50, cast=float)
+
+# Full-menu documents, invalidated by menu signals (seconds)
+MENU_CACHE_TIMEOUT = config('MENU_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Notification outbox: duplicate events of an object within the window are
+# dropped (seconds); new notifications are dispatched in batches of this size
+NOTIFICATION_COALESCE_SECONDS = config('NOTIFICATION_COALESCE_SECONDS', default=60, cast=int)
+NOTIFICATION_DISPATCH_BATCH_SIZE = config('NOTIFICATION_DISPATCH_BATCH_SIZE', default=500, cast=int)
+
+# Per-user unread notification counters, reconciled every 30 minutes (seconds)
+NOTIFICATION_UNREAD_COUNT_TIMEOUT = config('NOTIFICATION_UNREAD_COUNT_TIMEOUT', default=3600, cast=int)
+
+# Promotional broadcasts: recipients per cursor fetch, bulk insert and checkpoint
+NOTIFICATION_BROADCAST_CHUNK_SIZE = config('NOTIFICATION_BROADCAST_CHUNK_SIZE', default=2000, cast=int)
+
+# Notification retention: read notifications older than this many days leave
+# the hot table daily, into the archive (or deleted when NOTIFICATION_ARCHIVE is
+# off), in batches; archived ones are kept NOTIFICATION_ARCHIVE_RETENTION_DAYS
+# (0 = forever)
+NOTIFICATION_RETENTION_DAYS = config('NOTIFICATION_RETENTION_DAYS', default=90, cast=int)
+NOTIFICATION_ARCHIVE = config('NOTIFICATION_ARCHIVE', default=True, cast=bool)
+NOTIFICATION_ARCHIVE_RETENTION_DAYS = config('NOTIFICATION_ARCHIVE_RETENTION_DAYS', default=0, cast=int)
+NOTIFICATION_RETENTION_BATCH_SIZE = config('NOTIFICATION_RETENTION_BATCH_SIZE', default=5000, cast=int)
+NOTIFICATION_RETENTION_MAX_BATCHES = config('NOTIFICATION_RETENTION_MAX_BATCHES', default=200, cast=int)
+
+# Webhook delivery: request timeout (seconds), attempts with exponential
+# backoff (seconds), requests in flight per endpoint and per worker process,
+# deliveries per task. The per-endpoint cap holds within one deliver_webhooks
+# task: an endpoint can get up to WEBHOOK_ENDPOINT_CONCURRENCY requests from
+# each task running at the same time
+WEBHOOK_TIMEOUT_SECONDS = config('WEBHOOK_TIMEOUT_SECONDS', default=10, cast=float)
+WEBHOOK_MAX_ATTEMPTS = config('WEBHOOK_MAX_ATTEMPTS', default=5, cast=int)
+WEBHOOK_BACKOFF_BASE_SECONDS = config('WEBHOOK_BACKOFF_BASE_SECONDS', default=1, cast=float)
+WEBHOOK_BACKOFF_MAX_SECONDS = config('WEBHOOK_BACKOFF_MAX_SECONDS', default=60, cast=float)
+WEBHOOK_ENDPOINT_CONCURRENCY = config('WEBHOOK_ENDPOINT_CONCURRENCY', default=4, cast=int)
+WEBHOOK_MAX_CONCURRENCY = config('WEBHOOK_MAX_CONCURRENCY', default=32, cast=int)
+WEBHOOK_BATCH_SIZE = config('WEBHOOK_BATCH_SIZE', default=100, cast=int)
+
+# Reservations
+# How long a table stays occupied by one reservation (minutes)
+RESERVATION_DURATION_MINUTES = config('RESERVATION_DURATION_MINUTES', default=120, cast=int)
+# Per restaurant/day occupancy bitmaps, invalidated by reservation signals (seconds)
+RESERVATION_AVAILABILITY_CACHE_TIMEOUT = config('RESERVATION_AVAILABILITY_CACHE_TIMEOUT', default=3600, cast=int)
+
 # Stripe Configuration
 STRIPE_PUBLIC_KEY = config('STRIPE_PUBLIC_KEY', default='')
 STRIPE_SECRET_KEY = config('STRIPE_SECRET_KEY', default='')
@@ -46,6 +46,8 @@ urlpatterns = [
     path('api/v1/promotions/', include('promotions.urls')),
     path('api/v1/analytics/', include('analytics.urls')),
     path('api/v1/developers/', include('developers.urls')),
+    path('api/v1/search/', include('search.urls')),
+    path('api/v1/realtime/', include('realtime.urls')),
 ]
 
 # Serve media files in development
@@ -0,0 +1,91 @@
+"""
+Cache helpers for Restaurant Management Platform.
+
+Cached entries live under a namespace whose version number is part of every
+key. Invalidating a namespace is a single counter bump: old keys are never
+read again and simply expire.
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+
+def _version_key(namespace):
+    return f'{namespace}:version'
+
+
+def get_cache_version(namespace):
+    """Return the current version number of a cache namespace."""
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        # add() so concurrent first readers agree on the initial version
+        cache.add(_version_key(namespace), 1, timeout=None)
+        version = cache.get(_version_key(namespace), 1)
+    return version
+
+
+def bump_cache_version(namespace):
+    """Invalidate every entry of a namespace by moving to a new version."""
+    try:
+        return cache.incr(_version_key(namespace))
+    except ValueError:
+        # Version key missing (first bump or evicted)
+        cache.set(_version_key(namespace), 2, timeout=None)
+        return 2
+
+
+def bump_cache_version_on_commit(namespace):
+    """
+    bump_cache_version once the current transaction commits (right away
+    outside one). Bumping earlier would let a concurrent reader cache the
+    pre-commit rows under the new version.
+    """
+    # robust: a cache outage must not turn a committed write into an error
+    transaction.on_commit(lambda: bump_cache_version(namespace), robust=True)
+
+
+def make_cache_key(namespace, *parts):
+    """Build a versioned cache key from arbitrary string parts."""
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'{namespace}:v{get_cache_version(namespace)}:{digest}'
+
+
+class CachedResponseMixin:
+    """
+    Read-through response cache for the list/retrieve actions of a viewset.
+
+    Responses are keyed by the absolute request URI, so every combination of
+    query parameters (filters, search, ordering, page) gets its own entry.
+    Invalidate with ``bump_cache_version(cache_namespace)``.
+    """
+    cache_namespace = None
+    cache_timeout = 300
+
+    def should_cache_response(self, request):
+        """Only cache responses that are identical for every caller."""
+        return request.method == 'GET'
+
+    def get_response_cache_key(self, request):
+        return make_cache_key(self.cache_namespace, self.action, request.build_absolute_uri())
+
+    def _cached_response(self, handler, request, *args, **kwargs):
+        if not self.should_cache_response(request):
+            return handler(request, *args, **kwargs)
+
+        key = self.get_response_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, self.cache_timeout)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,73 @@
+"""
+Conditional request helpers for Restaurant Management Platform.
+
+List responses carry ETag / Last-Modified validators computed from a single
+aggregate query over the filtered queryset (row count and latest timestamps)
+instead of from the rendered body. A client revalidating with If-None-Match
+or If-Modified-Since gets a 304 before any row is fetched or serialized.
+"""
+import hashlib
+from datetime import datetime
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalListMixin:
+    """
+    ETag / Last-Modified support for the list action of a viewset.
+
+    The validators cover the whole filtered queryset, not just the requested
+    page, together with the request path (filters, page), the caller and the
+    negotiated media type. The row count catches deletions; the latest
+    ``conditional_timestamp_fields`` values catch edits and inserts. Bodies
+    that also depend on the clock add aggregates for that state through
+    ``get_conditional_aggregates``; datetime aggregates feed Last-Modified.
+    The computed pair is kept on ``self.list_validators``, the aggregates on
+    ``self.list_state``, for the handler.
+    """
+    conditional_timestamp_fields = ('updated_at',)
+    # Disable when the body can change without any datetime aggregate moving
+    conditional_last_modified = True
+
+    def get_conditional_aggregates(self):
+        aggregates = {'count': Count('pk')}
+        for field in self.conditional_timestamp_fields:
+            aggregates[f'latest_{field}'] = Max(field)
+        return aggregates
+
+    def get_list_state(self, queryset):
+        """The aggregates the validators are computed from."""
+        return queryset.order_by().aggregate(**self.get_conditional_aggregates())
+
+    def get_list_validators(self, queryset):
+        """(etag, last_modified timestamp or None) of the list response."""
+        state = self.list_state = self.get_list_state(queryset)
+        user = self.request.user
+        parts = [
+            self.request.get_full_path(),
+            self.request.accepted_media_type,
+            user.pk if user.is_authenticated else '',
+            *(f'{name}={value!r}' for name, value in sorted(state.items())),
+        ]
+        etag = quote_etag(hashlib.md5('|'.join(str(part) for part in parts).encode()).hexdigest())
+
+        last_modified = None
+        timestamps = [value for value in state.values() if isinstance(value, datetime)]
+        if self.conditional_last_modified and timestamps:
+            last_modified = int(max(timestamps).timestamp())
+        return etag, last_modified
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = self.list_validators = self.get_list_validators(
+            self.filter_queryset(self.get_queryset())
+        )
+        response = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,45 @@
+"""
+Pagination classes for Restaurant Management Platform.
+"""
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+class TimelineCursorPagination(CursorPagination):
+    """
+    Keyset pagination for time-ordered histories (newest first).
+
+    Pages continue from the last seen created_at instead of an OFFSET, so deep
+    pages cost the same as the first one when a (owner, created_at, id) index
+    matches the view's filter. The response keeps the page-number shape
+    (count/next/previous/results); ``?count=false`` skips the COUNT(*) query.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_query_param = 'count'
+
+    def include_count(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() not in ('0', 'false')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = queryset.count() if self.include_count(request) else None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            payload = {'count': self.count, **payload}
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties'] = {
+            'count': {'type': 'integer', 'example': 123},
+            **response_schema['properties'],
+        }
+        return response_schema
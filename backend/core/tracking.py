@@ -0,0 +1,48 @@
+"""
+Field change tracking for Restaurant Management Platform models.
+"""
+import copy
+
+
+class TrackedFieldsMixin:
+    """
+    Remember the database values of `tracked_fields` so status transitions
+    can be detected without re-fetching the row in a pre_save signal.
+
+    Values are captured when the instance is loaded from the database and
+    refreshed after every save, so post_save receivers still see the values
+    the row had before the save. Instances that were never loaded (new
+    objects, or objects built by hand with a pk) report None as the
+    previous value, as do fields deferred at load time.
+    """
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._reset_tracked_fields()
+        return instance
+
+    def _reset_tracked_fields(self, fields=None):
+        deferred = self.get_deferred_fields()
+        loaded = getattr(self, '_loaded_values', {})
+        for field in fields or self.tracked_fields:
+            if field in self.tracked_fields and field not in deferred:
+                # Copied so in-place edits of JSON values still count as changes
+                loaded[field] = copy.deepcopy(getattr(self, field))
+        self._loaded_values = loaded
+
+    def get_previous_value(self, field):
+        """Value of a tracked field as last loaded from or saved to the database."""
+        return getattr(self, '_loaded_values', {}).get(field)
+
+    def has_field_changed(self, field):
+        return self.get_previous_value(field) != getattr(self, field)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._reset_tracked_fields(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._reset_tracked_fields(fields)
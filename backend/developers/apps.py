@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DevelopersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'developers'
+
+    def ready(self):
+        import developers.signals  # noqa: F401
@@ -0,0 +1,172 @@
+"""
+Webhook delivery engine for developers app.
+
+A batch of deliveries runs on an asyncio event loop, one coroutine per
+delivery, so a single task sends to many endpoints at once while at most
+WEBHOOK_ENDPOINT_CONCURRENCY requests are in flight per endpoint URL. That
+cap is per task, not global: tasks running in parallel on other worker
+processes or threads each get their own allowance for the same endpoint.
+The requests go through one shared requests.Session, whose urllib3 pool
+keeps connections to each endpoint alive across deliveries and tasks, on a
+thread pool of WEBHOOK_MAX_CONCURRENCY workers.
+
+Connection errors, timeouts, 408, 429 and 5xx responses are retried up to
+WEBHOOK_MAX_ATTEMPTS attempts with exponential backoff and jitter (at least
+Retry-After when the endpoint sends one); other responses are final. Outcomes
+are recorded with one UPDATE of the counters of every webhook in the batch.
+"""
+import asyncio
+import logging
+import random
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import requests
+from django.conf import settings
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from developers.webhooks import encode_payload, sign
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {408, 429}
+
+
+class Delivery:
+    """One event sent to one webhook, and the outcome of sending it."""
+
+    def __init__(self, webhook, payload):
+        self.webhook = webhook
+        self.event = payload['event']
+        self.body = encode_payload(payload)
+        self.attempts = 0
+        self.status_code = None
+        self.error = ''
+
+    @property
+    def delivered(self):
+        return self.status_code is not None and 200 <= self.status_code < 300
+
+
+@lru_cache(maxsize=None)
+def get_session():
+    """The process-wide HTTP session; its pool keeps endpoint connections alive."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=100, pool_maxsize=settings.WEBHOOK_MAX_CONCURRENCY)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+@lru_cache(maxsize=None)
+def get_executor():
+    return ThreadPoolExecutor(max_workers=settings.WEBHOOK_MAX_CONCURRENCY, thread_name_prefix='webhooks')
+
+
+def is_retryable(status_code):
+    return status_code is None or status_code in RETRY_STATUSES or status_code >= 500
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Seconds to wait after failed attempt number attempt (1-based)."""
+    delay = min(settings.WEBHOOK_BACKOFF_MAX_SECONDS, settings.WEBHOOK_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+    # Jitter spreads the retries of a batch that failed together
+    delay = random.uniform(delay / 2, delay)
+    if retry_after:
+        delay = max(delay, min(retry_after, settings.WEBHOOK_BACKOFF_MAX_SECONDS))
+    return delay
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get('Retry-After', ''))
+    except ValueError:
+        return None
+
+
+def _post(delivery):
+    """Send one attempt; returns the Retry-After of the response, if any."""
+    timestamp = str(int(time.time()))
+    headers = {
+        'Content-Type': 'application/json',
+        'User-Agent': 'RestaurantPlatform-Webhooks/1.0',
+        'X-Webhook-Event': delivery.event,
+        'X-Webhook-Timestamp': timestamp,
+        'X-Webhook-Signature': f'sha256={sign(delivery.webhook.secret, timestamp, delivery.body)}',
+    }
+    try:
+        response = get_session().post(
+            delivery.webhook.url, data=delivery.body, headers=headers,
+            timeout=settings.WEBHOOK_TIMEOUT_SECONDS, allow_redirects=False,
+        )
+    except requests.RequestException as exc:
+        delivery.status_code, delivery.error = None, str(exc)
+        return None
+    delivery.status_code, delivery.error = response.status_code, ''
+    return _retry_after(response)
+
+
+async def _deliver(delivery, limit):
+    loop = asyncio.get_running_loop()
+    for attempt in range(1, settings.WEBHOOK_MAX_ATTEMPTS + 1):
+        # The endpoint's slot is only held while the request is in flight
+        async with limit:
+            retry_after = await loop.run_in_executor(get_executor(), _post, delivery)
+        delivery.attempts = attempt
+        if delivery.delivered or not is_retryable(delivery.status_code):
+            return
+        if attempt < settings.WEBHOOK_MAX_ATTEMPTS:
+            await asyncio.sleep(backoff_delay(attempt, retry_after))
+
+
+async def _deliver_all(deliveries):
+    limits = defaultdict(lambda: asyncio.Semaphore(settings.WEBHOOK_ENDPOINT_CONCURRENCY))
+    await asyncio.gather(*(_deliver(delivery, limits[delivery.webhook.url]) for delivery in deliveries))
+
+
+def record_outcomes(deliveries):
+    """Add the batch's deliveries and failures to the webhook counters in one UPDATE."""
+    from developers.models import Webhook
+
+    totals = Counter(delivery.webhook.pk for delivery in deliveries)
+    failures = Counter(delivery.webhook.pk for delivery in deliveries if not delivery.delivered)
+    if not totals:
+        return
+
+    def increments(counts):
+        whens = [When(pk=pk, then=Value(count)) for pk, count in counts.items()]
+        return Case(*whens, default=Value(0)) if whens else Value(0)
+
+    Webhook.objects.filter(pk__in=totals).update(
+        total_deliveries=F('total_deliveries') + increments(totals),
+        failed_deliveries=F('failed_deliveries') + increments(failures),
+        last_delivery=timezone.now(),
+    )
+
+
+def deliver_batch(deliveries):
+    """
+    Deliver [webhook_id, payload] pairs to the webhooks that are still active.
+    Returns {'total', 'delivered', 'failed'} counts.
+    """
+    from developers.models import Webhook
+
+    webhooks = Webhook.objects.filter(
+        id__in={webhook_id for webhook_id, _ in deliveries}, is_active=True
+    ).only('id', 'url', 'secret').in_bulk()
+    batch = [Delivery(webhooks[webhook_id], payload) for webhook_id, payload in deliveries if webhook_id in webhooks]
+    if batch:
+        asyncio.run(_deliver_all(batch))
+        record_outcomes(batch)
+    for delivery in batch:
+        if not delivery.delivered:
+            logger.warning(
+                'Webhook %s: %s failed after %s attempts (%s)', delivery.webhook.pk, delivery.event,
+                delivery.attempts, delivery.status_code or delivery.error,
+            )
+    delivered = sum(delivery.delivered for delivery in batch)
+    return {'total': len(batch), 'delivered': delivered, 'failed': len(batch) - delivered}
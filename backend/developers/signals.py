@@ -0,0 +1,72 @@
+"""Signals for developers app: order, payment and reservation webhook events."""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from developers.webhooks import queue_webhook_events
+from orders.models import Order
+from payments.models import Payment
+from reservations.models import Reservation
+
+
+def order_event_data(order, previous_status=None):
+    return {
+        'id': order.pk,
+        'order_number': order.order_number,
+        'restaurant': order.restaurant_id,
+        'status': order.status,
+        'previous_status': previous_status,
+        'total': order.total,
+        'is_paid': order.is_paid,
+    }
+
+
+@receiver(post_save, sender=Order)
+def order_webhook(sender, instance, created, **kwargs):
+    if created:
+        event = 'ORDER_CREATED'
+    elif instance.has_field_changed('status'):
+        event = 'ORDER_UPDATED'
+    else:
+        return
+    previous_status = None if created else instance.get_previous_value('status')
+    queue_webhook_events([(instance.restaurant_id, event, order_event_data(instance, previous_status))])
+
+
+def _payment_restaurant_id(payment):
+    """Restaurant of the payment's order, without loading the order."""
+    if Payment.order.is_cached(payment):
+        return payment.order.restaurant_id
+    return Order.objects.filter(pk=payment.order_id).values_list('restaurant_id', flat=True).first()
+
+
+@receiver(post_save, sender=Payment)
+def payment_webhook(sender, instance, created, **kwargs):
+    if not (created or instance.has_field_changed('status')):
+        return
+    event = {'SUCCEEDED': 'PAYMENT_SUCCEEDED', 'FAILED': 'PAYMENT_FAILED'}.get(instance.status)
+    if event:
+        queue_webhook_events([(_payment_restaurant_id(instance), event, {
+            'id': instance.pk,
+            'order': instance.order_id,
+            'amount': instance.amount,
+            'currency': instance.currency,
+            'payment_method': instance.payment_method,
+            'status': instance.status,
+        })])
+
+
+@receiver(post_save, sender=Reservation)
+def reservation_webhook(sender, instance, created, **kwargs):
+    if created:
+        event = 'RESERVATION_CREATED'
+    elif instance.status == 'CANCELLED' and instance.has_field_changed('status'):
+        event = 'RESERVATION_CANCELLED'
+    else:
+        return
+    queue_webhook_events([(instance.restaurant_id, event, {
+        'id': instance.pk,
+        'restaurant': instance.restaurant_id,
+        'status': instance.status,
+        'reservation_date': instance.reservation_date,
+        'reservation_time': instance.reservation_time,
+        'guests_count': instance.guests_count,
+    })])
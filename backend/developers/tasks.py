@@ -0,0 +1,16 @@
+"""
+Celery tasks for developers app.
+"""
+from celery import shared_task
+
+
+@shared_task
+def deliver_webhooks(deliveries):
+    """
+    Deliver a batch of [webhook_id, payload] pairs concurrently, with retries,
+    and record the outcomes (see developers.delivery).
+    """
+    from developers.delivery import deliver_batch
+    
+    counts = deliver_batch(deliveries)
+    return f"Delivered {counts['delivered']} of {counts['total']} webhooks"
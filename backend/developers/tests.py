@@ -1,3 +1,148 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from collections import defaultdict
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+
+from developers.delivery import deliver_batch
+from developers.models import Webhook
+from developers.webhooks import sign
+from orders.models import Order
+from payments.models import Payment
+from restaurants.tests import create_restaurant
+from users.models import User
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Webhook receiver answering each path with the statuses scripted for it."""
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers), body))
+            server.in_flight[self.path] += 1
+            server.max_in_flight[self.path] = max(server.max_in_flight[self.path], server.in_flight[self.path])
+            statuses = server.statuses.get(self.path, [200])
+            status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+        time.sleep(server.delay)
+        with server.lock:
+            server.in_flight[self.path] -= 1
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(WEBHOOK_BACKOFF_BASE_SECONDS=0.01, WEBHOOK_MAX_ATTEMPTS=3, WEBHOOK_ENDPOINT_CONCURRENCY=2)
+class WebhookDeliveryTests(TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests, self.server.statuses, self.server.delay = [], {}, 0
+        self.server.in_flight, self.server.max_in_flight = defaultdict(int), defaultdict(int)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.owner = User.objects.create_user(email='owner@example.com', username='owner', role='RESTAURANT_OWNER')
+        self.restaurant = create_restaurant(self.owner)
+
+    def webhook(self, path, events=('ORDER_CREATED',)):
+        return Webhook.objects.create(
+            user=self.owner, name=path, url=f'http://127.0.0.1:{self.server.server_port}{path}', events=list(events)
+        )
+
+    def payload(self, number=1):
+        return {'id': f'evt{number}', 'event': 'ORDER_CREATED', 'created_at': '2026-01-01T00:00:00', 'data': {'id': number}}
+
+    def test_signed_delivery_updates_counters(self):
+        webhook = self.webhook('/hook')
+        self.assertEqual(deliver_batch([[webhook.id, self.payload()]]), {'total': 1, 'delivered': 1, 'failed': 0})
+
+        [(path, headers, body)] = self.server.requests
+        self.assertEqual(json.loads(body)['data'], {'id': 1})
+        self.assertEqual(headers['X-Webhook-Event'], 'ORDER_CREATED')
+        expected = sign(webhook.secret, headers['X-Webhook-Timestamp'], body)
+        self.assertEqual(headers['X-Webhook-Signature'], f'sha256={expected}')
+
+        webhook.refresh_from_db()
+        self.assertEqual((webhook.total_deliveries, webhook.failed_deliveries), (1, 0))
+        self.assertIsNotNone(webhook.last_delivery)
+
+    def test_retries_server_errors_but_not_client_errors(self):
+        flaky, gone = self.webhook('/flaky'), self.webhook('/gone')
+        self.server.statuses = {'/flaky': [503, 502, 200], '/gone': [410]}
+        counts = deliver_batch([[flaky.id, self.payload(1)], [gone.id, self.payload(2)]])
+        self.assertEqual(counts, {'total': 2, 'delivered': 1, 'failed': 1})
+        paths = [path for path, _, _ in self.server.requests]
+        self.assertEqual((paths.count('/flaky'), paths.count('/gone')), (3, 1))
+
+        flaky.refresh_from_db()
+        gone.refresh_from_db()
+        self.assertEqual((flaky.total_deliveries, flaky.failed_deliveries), (1, 0))
+        self.assertEqual((gone.total_deliveries, gone.failed_deliveries), (1, 1))
+
+    def test_gives_up_after_max_attempts(self):
+        down = self.webhook('/down')
+        self.server.statuses = {'/down': [500]}
+        self.assertEqual(deliver_batch([[down.id, self.payload()]])['failed'], 1)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_concurrency_is_limited_per_endpoint(self):
+        slow, other = self.webhook('/slow'), self.webhook('/other')
+        self.server.delay = 0.05
+        deliveries = [[webhook.id, self.payload(n)] for n in range(6) for webhook in (slow, other)]
+        self.assertEqual(deliver_batch(deliveries)['delivered'], 12)
+        self.assertEqual(dict(self.server.max_in_flight), {'/slow': 2, '/other': 2})
+
+        slow.refresh_from_db()
+        self.assertEqual(slow.total_deliveries, 6)
+
+    def test_inactive_webhooks_are_skipped(self):
+        webhook = self.webhook('/hook')
+        Webhook.objects.filter(pk=webhook.pk).update(is_active=False)
+        self.assertEqual(deliver_batch([[webhook.id, self.payload()]])['total'], 0)
+        self.assertEqual(self.server.requests, [])
+
+    @mock.patch('notifications.tasks.dispatch_notifications.delay', mock.Mock())
+    @mock.patch('developers.tasks.deliver_webhooks.delay')
+    def test_order_events_are_queued_for_subscribed_webhooks(self, delay):
+        created = self.webhook('/created')
+        self.webhook('/updated', events=['ORDER_UPDATED'])
+        customer = User.objects.create_user(email='customer@example.com', username='customer')
+        order = Order(user=customer, restaurant=self.restaurant, subtotal=Decimal('10'), total=Decimal('10'))
+        with self.captureOnCommitCallbacks(execute=True):
+            order.save()
+
+        [(deliveries,)] = [call.args for call in delay.call_args_list]
+        [(webhook_id, payload)] = deliveries
+        self.assertEqual(webhook_id, created.id)
+        self.assertEqual(payload['event'], 'ORDER_CREATED')
+        self.assertEqual(payload['data']['order_number'], order.order_number)
+
+    @mock.patch('notifications.tasks.dispatch_notifications.delay', mock.Mock())
+    @mock.patch('developers.tasks.deliver_webhooks.delay')
+    def test_payment_events_are_queued_for_the_order_restaurant(self, delay):
+        succeeded = self.webhook('/paid', events=['PAYMENT_SUCCEEDED'])
+        customer = User.objects.create_user(email='customer@example.com', username='customer')
+        order = Order.objects.create(user=customer, restaurant=self.restaurant, subtotal=Decimal('10'), total=Decimal('10'))
+        Payment.objects.create(order=order, user=customer, amount=Decimal('10'), payment_method='CARD')
+
+        payment = Payment.objects.get(order=order)
+        payment.status = 'SUCCEEDED'
+        with self.captureOnCommitCallbacks(execute=True):
+            payment.save()
+
+        [(webhook_id, payload)] = [delivery for call in delay.call_args_list for delivery in call.args[0]]
+        self.assertEqual((webhook_id, payload['event']), (succeeded.id, 'PAYMENT_SUCCEEDED'))
+        self.assertEqual(payload['data']['order'], order.id)
@@ -0,0 +1,93 @@
+"""
+Webhook events for developers app.
+
+Order, payment and reservation signals describe what happened with
+queue_webhook_events(); once the transaction commits, the events are matched
+against the active webhooks of the restaurants' owners (two queries for the
+whole transaction) and handed to the deliver_webhooks task in batches (see
+developers.delivery).
+
+Every request carries the event name, a timestamp and an HMAC-SHA256
+signature of "<timestamp>.<body>" keyed with the webhook secret:
+
+    X-Webhook-Event: ORDER_CREATED
+    X-Webhook-Timestamp: 1767225600
+    X-Webhook-Signature: sha256=<hex digest>
+
+Receivers recompute the digest over the raw body and reject stale
+timestamps to stop replays.
+"""
+import hashlib
+import hmac
+import json
+import logging
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def sign(secret, timestamp, body):
+    """Hex HMAC-SHA256 of "<timestamp>.<body>" keyed with the webhook secret."""
+    return hmac.new(secret.encode(), f'{timestamp}.'.encode() + body, hashlib.sha256).hexdigest()
+
+
+def encode_payload(payload):
+    return json.dumps(payload, cls=DjangoJSONEncoder, separators=(',', ':'), sort_keys=True).encode()
+
+
+def queue_webhook_events(events):
+    """
+    Send events, (restaurant_id, event, data) tuples, to the webhooks of the
+    restaurants' owners that subscribe to them, once the transaction commits.
+    """
+    events = list(events)
+    if events:
+        # robust: a failing enqueue must not turn a committed request into an error
+        transaction.on_commit(lambda: enqueue_deliveries(events), robust=True)
+
+
+def enqueue_deliveries(events):
+    """Match events to subscribed webhooks and queue their delivery."""
+    from developers.models import Webhook
+    from developers.tasks import deliver_webhooks
+    from restaurants.models import Restaurant
+
+    owners = dict(
+        Restaurant.objects.filter(id__in={restaurant_id for restaurant_id, _, _ in events})
+        .values_list('id', 'owner_id')
+    )
+    subscriptions = defaultdict(list)
+    for webhook_id, user_id, subscribed in (
+        Webhook.objects.filter(user_id__in=set(owners.values()), is_active=True)
+        .values_list('id', 'user_id', 'events')
+    ):
+        subscriptions[user_id].append((webhook_id, subscribed or []))
+
+    deliveries = []
+    for restaurant_id, event, data in events:
+        payload = None
+        for webhook_id, subscribed in subscriptions[owners.get(restaurant_id)]:
+            if event not in subscribed:
+                continue
+            # One id per event, shared by its webhooks, so receivers can dedupe retries
+            payload = payload or {
+                'id': uuid.uuid4().hex,
+                'event': event,
+                'created_at': timezone.now().isoformat(),
+                'data': data,
+            }
+            deliveries.append([webhook_id, payload])
+
+    batch_size = settings.WEBHOOK_BATCH_SIZE
+    for start in range(0, len(deliveries), batch_size):
+        try:
+            deliver_webhooks.delay(deliveries[start:start + batch_size])
+        except Exception as exc:
+            logger.warning('Could not enqueue webhook delivery: %s', exc)
+    return deliveries
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.14 on 2026-10-18 19:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_add_hot_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='stockmovement',
+            name='stock_mov_item_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['inventory_item', '-created_at', '-id'], name='stock_mov_item_created_idx'),
+        ),
+    ]
@@ -78,6 +78,9 @@ class StockMovement(models.Model):
     class Meta:
         db_table = 'stock_movements'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['inventory_item', '-created_at', '-id'], name='stock_mov_item_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.inventory_item.name} - {self.movement_type} ({self.quantity})"
@@ -1,8 +1,12 @@
 """
 Celery tasks for inventory app.
 """
+from collections import defaultdict
+from decimal import Decimal
+
 from celery import shared_task
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 
 @shared_task
@@ -26,48 +30,73 @@ def check_low_stock_alerts():
     return f"Sent {alerts_sent} low stock alerts"
 
 
+def aggregate_ingredient_requirements(order):
+    """
+    Total quantity of each inventory item needed for an order.
+
+    Returns {inventory_item_id: Decimal} summed over every order item's
+    menu item recipe ({"ingredient_id": quantity} per portion).
+    """
+    requirements = defaultdict(Decimal)
+    for order_item in order.items.select_related('menu_item'):
+        for ingredient_id, quantity_needed in (order_item.menu_item.recipe or {}).items():
+            requirements[int(ingredient_id)] += Decimal(str(quantity_needed)) * order_item.quantity
+    return requirements
+
+
 @shared_task
 def track_stock_usage(order_id):
     """
     Track stock usage for an order.
+
+    All ingredient requirements are aggregated first and applied in one
+    transaction: the affected rows are locked in primary key order (so two
+    concurrent orders sharing ingredients cannot deadlock), decremented with
+    a single F() UPDATE and their movements are written with one bulk insert.
     """
     from orders.models import Order
     from inventory.models import InventoryItem, StockMovement
     
     try:
-        order = Order.objects.get(id=order_id)
-        
-        for order_item in order.items.all():
-            menu_item = order_item.menu_item
-            
-            # If menu item has recipe, deduct ingredients
-            if menu_item.recipe:
-                for ingredient_id, quantity_needed in menu_item.recipe.items():
-                    try:
-                        inventory_item = InventoryItem.objects.get(
-                            id=ingredient_id,
-                            restaurant=order.restaurant
-                        )
-                        
-                        # Deduct stock
-                        previous_qty = inventory_item.current_quantity
-                        inventory_item.current_quantity -= (quantity_needed * order_item.quantity)
-                        inventory_item.save()
-                        
-                        # Create movement record
-                        StockMovement.objects.create(
-                            inventory_item=inventory_item,
-                            movement_type='USAGE',
-                            quantity=-(quantity_needed * order_item.quantity),
-                            previous_quantity=previous_qty,
-                            new_quantity=inventory_item.current_quantity,
-                            notes=f"Used for order {order.order_number}",
-                            performed_by=order.user
-                        )
-                        
-                    except InventoryItem.DoesNotExist:
-                        print(f"Inventory item {ingredient_id} not found")
-        
-        return f"Stock tracked for order {order.order_number}"
+        order = Order.objects.select_related('restaurant', 'user').get(id=order_id)
     except Order.DoesNotExist:
         return f"Order {order_id} not found"
+    
+    requirements = aggregate_ingredient_requirements(order)
+    if not requirements:
+        return f"Stock tracked for order {order.order_number}"
+    
+    with transaction.atomic():
+        inventory_items = list(
+            InventoryItem.objects.select_for_update()
+            .filter(id__in=list(requirements), restaurant=order.restaurant)
+            .order_by('id')
+        )
+        
+        for ingredient_id in requirements.keys() - {item.id for item in inventory_items}:
+            print(f"Inventory item {ingredient_id} not found")
+        
+        if inventory_items:
+            InventoryItem.objects.filter(id__in=[item.id for item in inventory_items]).update(
+                current_quantity=models.F('current_quantity') - models.Case(
+                    *[models.When(id=item.id, then=models.Value(requirements[item.id])) for item in inventory_items],
+                    output_field=models.DecimalField(max_digits=10, decimal_places=2),
+                ),
+                updated_at=timezone.now(),
+            )
+            
+            # Rows are locked, so the values read above are the ones updated
+            StockMovement.objects.bulk_create([
+                StockMovement(
+                    inventory_item=item,
+                    movement_type='USAGE',
+                    quantity=-requirements[item.id],
+                    previous_quantity=item.current_quantity,
+                    new_quantity=item.current_quantity - requirements[item.id],
+                    notes=f"Used for order {order.order_number}",
+                    performed_by=order.user
+                )
+                for item in inventory_items
+            ])
+    
+    return f"Stock tracked for order {order.order_number}"
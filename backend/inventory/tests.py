@@ -1,3 +1,64 @@
+from decimal import Decimal
+
 from django.test import TestCase
 
-# Create your tests here.
+from inventory.models import InventoryItem, StockMovement
+from inventory.tasks import track_stock_usage
+from menu.models import MenuCategory, MenuItem
+from orders.models import Order, OrderItem
+from restaurants.tests import create_restaurant
+from users.models import User
+
+
+class TrackStockUsageTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user(
+            email='owner@example.com', username='owner', password='pass', role='RESTAURANT_OWNER'
+        )
+        customer = User.objects.create_user(email='customer@example.com', username='customer', password='pass')
+        restaurant = create_restaurant(owner)
+        category = MenuCategory.objects.create(restaurant=restaurant, name='Mains')
+        self.flour = self.create_item(restaurant, 'Flour', '10.00')
+        self.meat = self.create_item(restaurant, 'Meat', '5.00')
+        beshbarmak = MenuItem.objects.create(
+            restaurant=restaurant, category=category, name='Beshbarmak', description='Classic',
+            price=Decimal('12.00'), recipe={str(self.flour.id): 0.2, str(self.meat.id): '0.5'},
+        )
+        baursak = MenuItem.objects.create(
+            restaurant=restaurant, category=category, name='Baursak', description='Fried dough',
+            price=Decimal('3.00'), recipe={str(self.flour.id): 0.1, '999999': 1},
+        )
+        self.order = Order.objects.create(
+            user=customer, restaurant=restaurant, subtotal=Decimal('27.00'), total=Decimal('27.00')
+        )
+        OrderItem.objects.create(order=self.order, menu_item=beshbarmak, quantity=2, unit_price=beshbarmak.price)
+        OrderItem.objects.create(order=self.order, menu_item=baursak, quantity=1, unit_price=baursak.price)
+
+    def create_item(self, restaurant, name, quantity):
+        return InventoryItem.objects.create(
+            restaurant=restaurant, name=name, category='Dry goods',
+            current_quantity=Decimal(quantity), minimum_quantity=Decimal('1.00'), unit='KG',
+            unit_cost=Decimal('1.00'),
+        )
+
+    def test_deducts_aggregated_requirements(self):
+        track_stock_usage(self.order.id)
+
+        self.flour.refresh_from_db()
+        self.meat.refresh_from_db()
+        self.assertEqual(self.flour.current_quantity, Decimal('9.50'))
+        self.assertEqual(self.meat.current_quantity, Decimal('4.00'))
+
+        movement = StockMovement.objects.get(inventory_item=self.flour)
+        self.assertEqual(movement.quantity, Decimal('-0.50'))
+        self.assertEqual(movement.previous_quantity, Decimal('10.00'))
+        self.assertEqual(movement.new_quantity, Decimal('9.50'))
+        self.assertEqual(StockMovement.objects.count(), 2)
+
+    def test_query_count_does_not_depend_on_ingredients(self):
+        # order, order items, lock, update, bulk insert (+ savepoint pair)
+        with self.assertNumQueries(7):
+            track_stock_usage(self.order.id)
+
+    def test_missing_order(self):
+        self.assertEqual(track_stock_usage(0), "Order 0 not found")
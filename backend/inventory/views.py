@@ -1,6 +1,7 @@
 """Views for inventory app."""
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from core.pagination import TimelineCursorPagination
 from inventory.models import InventoryItem, StockMovement
 from inventory.serializers.inventory_serializers import InventoryItemSerializer, StockMovementSerializer
 
@@ -17,5 +18,14 @@ class StockMovementViewSet(viewsets.ModelViewSet):
     queryset = StockMovement.objects.all()
     serializer_class = StockMovementSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TimelineCursorPagination
+
+    def get_queryset(self):
+        queryset = StockMovement.objects.all()
+        # ?inventory_item=<id> pages through one item's history by its index
+        inventory_item_id = self.request.query_params.get('inventory_item')
+        if inventory_item_id:
+            queryset = queryset.filter(inventory_item_id=inventory_item_id)
+        return queryset
 
 
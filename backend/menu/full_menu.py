@@ -0,0 +1,65 @@
+"""
+Full-menu documents for menu app.
+
+A restaurant's active categories with their available items are rendered
+into one document and cached under a per-restaurant version number, bumped
+by menu.signals on any category or item change. The document's ETag is a
+hash of its content, so it stays correct even if the version counter is
+evicted from the cache. Media URLs are absolute, like the menu item API's,
+so the document is cached per host the menu is requested on.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+from core.cache import bump_cache_version, make_cache_key
+from menu.models import MenuCategory, MenuItem
+from menu.serializers.menu_serializers import MenuItemSerializer
+from restaurants.models import Restaurant
+
+
+def _menu_namespace(restaurant_id):
+    return f'menu:{restaurant_id}'
+
+
+def build_full_menu(restaurant_id, request=None):
+    """The menu document of a restaurant, in two queries."""
+    categories = MenuCategory.objects.filter(restaurant_id=restaurant_id, is_active=True).prefetch_related(
+        Prefetch('items', queryset=MenuItem.objects.filter(is_available=True).order_by('name'))
+    )
+    return {
+        'restaurant': restaurant_id,
+        'categories': [
+            {
+                'id': category.id,
+                'name': category.name,
+                'description': category.description,
+                'order': category.order,
+                'items': MenuItemSerializer(category.items.all(), many=True, context={'request': request}).data,
+            }
+            for category in categories
+        ],
+    }
+
+
+def get_full_menu(restaurant_id, request):
+    """Cached (etag, document) of a restaurant's menu, None for unknown restaurants."""
+    key = make_cache_key(_menu_namespace(restaurant_id), 'full', request.build_absolute_uri('/'))
+    cached = cache.get(key)
+    if cached is None:
+        if not Restaurant.objects.filter(pk=restaurant_id).exists():
+            return None
+        document = build_full_menu(restaurant_id, request)
+        # Serialize once so the hash and the cached copy are plain JSON
+        body = json.dumps(document, cls=DjangoJSONEncoder, sort_keys=True)
+        cached = (f'"{hashlib.md5(body.encode()).hexdigest()}"', json.loads(body))
+        cache.set(key, cached, settings.MENU_CACHE_TIMEOUT)
+    return cached
+
+
+def invalidate_menu(restaurant_id):
+    bump_cache_version(_menu_namespace(restaurant_id))
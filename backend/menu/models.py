@@ -1,11 +1,14 @@
 from django.db import models
 from django.core.validators import MinValueValidator
 from restaurants.models import Restaurant
+from core.tracking import TrackedFieldsMixin
 
 
-class MenuCategory(models.Model):
+class MenuCategory(TrackedFieldsMixin, models.Model):
     """Menu category model."""
     
+    tracked_fields = ('name',)
+    
     restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE, related_name='menu_categories')
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
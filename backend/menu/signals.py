@@ -0,0 +1,14 @@
+"""Signals for menu app."""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from menu.full_menu import invalidate_menu
+from menu.models import MenuCategory, MenuItem
+
+
+@receiver(post_save, sender=MenuCategory)
+@receiver(post_delete, sender=MenuCategory)
+@receiver(post_save, sender=MenuItem)
+@receiver(post_delete, sender=MenuItem)
+def invalidate_full_menu(sender, instance, **kwargs):
+    """Any category/item change moves the restaurant's menu to a new version."""
+    invalidate_menu(instance.restaurant_id)
@@ -1,3 +1,72 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from menu.models import MenuCategory, MenuItem
+from restaurants.tests import create_restaurant
+from users.models import User
+
+
+class FullMenuTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        owner = User.objects.create_user(
+            email='owner@example.com', username='owner', password='pass', role='RESTAURANT_OWNER'
+        )
+        self.restaurant = create_restaurant(owner)
+        self.url = f'/api/v1/menu/restaurants/{self.restaurant.id}/full/'
+        mains = MenuCategory.objects.create(restaurant=self.restaurant, name='Mains', order=1)
+        drinks = MenuCategory.objects.create(restaurant=self.restaurant, name='Drinks', order=2)
+        MenuCategory.objects.create(restaurant=self.restaurant, name='Hidden', is_active=False)
+        for i in range(25):
+            MenuItem.objects.create(
+                restaurant=self.restaurant, category=mains, name=f'Dish {i:02d}', description='', price='9.99'
+            )
+        self.tea = MenuItem.objects.create(
+            restaurant=self.restaurant, category=drinks, name='Tea', description='', price='1.50'
+        )
+        MenuItem.objects.create(
+            restaurant=self.restaurant, category=drinks, name='Sold out', description='', price='2.00',
+            is_available=False,
+        )
+
+    def test_whole_menu_in_one_document(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        categories = response.data['categories']
+        self.assertEqual([category['name'] for category in categories], ['Mains', 'Drinks'])
+        self.assertEqual(len(categories[0]['items']), 25)
+        self.assertEqual([item['name'] for item in categories[1]['items']], ['Tea'])
+
+    def test_cached_and_conditional(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_item_change_bumps_version(self):
+        etag = self.client.get(self.url)['ETag']
+        self.tea.price = '1.75'
+        self.tea.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['categories'][1]['items'][0]['price'], '1.75')
+
+    @override_settings(ALLOWED_HOSTS=['testserver', 'api.example.com'])
+    def test_image_urls_match_the_item_api(self):
+        MenuItem.objects.filter(pk=self.tea.pk).update(image='menu/items/tea.jpg')
+        document = self.client.get(self.url).data
+        item = self.client.get(f'/api/v1/menu/items/{self.tea.pk}/').data
+        self.assertEqual(document['categories'][1]['items'][0]['image'], 'http://testserver/media/menu/items/tea.jpg')
+        self.assertEqual(document['categories'][1]['items'][0]['image'], item['image'])
+
+        other_host = self.client.get(self.url, HTTP_HOST='api.example.com').data
+        self.assertEqual(
+            other_host['categories'][1]['items'][0]['image'], 'http://api.example.com/media/menu/items/tea.jpg'
+        )
+
+    def test_unknown_restaurant(self):
+        self.assertEqual(self.client.get('/api/v1/menu/restaurants/999/full/').status_code, 404)
@@ -8,5 +8,6 @@ router.register(r'categories', views.MenuCategoryViewSet, basename='menu-categor
 router.register(r'items', views.MenuItemViewSet, basename='menu-item')
 
 urlpatterns = [
+    path('restaurants/<int:restaurant_id>/full/', views.FullMenuView.as_view(), name='menu-full'),
     path('', include(router.urls)),
 ]
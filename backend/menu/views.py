@@ -1,6 +1,12 @@
 """Views for menu app."""
+from django.http import Http404
+from django.utils.cache import get_conditional_response
 from rest_framework import viewsets
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from core.conditional import ConditionalListMixin
+from menu.full_menu import get_full_menu
 from menu.models import MenuCategory, MenuItem
 from menu.serializers.menu_serializers import MenuCategorySerializer, MenuItemSerializer
 
@@ -12,7 +18,7 @@ class MenuCategoryViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
 
-class MenuItemViewSet(viewsets.ModelViewSet):
+class MenuItemViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     """API endpoint for menu items."""
     queryset = MenuItem.objects.all()
     serializer_class = MenuItemSerializer
@@ -29,3 +35,19 @@ class MenuItemViewSet(viewsets.ModelViewSet):
         return queryset
 
 
+class FullMenuView(APIView):
+    """
+    A restaurant's whole menu in one document: active categories with their
+    available items. Served from cache, with ETag / If-None-Match support.
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request, restaurant_id):
+        menu = get_full_menu(restaurant_id, request)
+        if menu is None:
+            raise Http404
+        etag, document = menu
+        
+        response = get_conditional_response(request._request, etag=etag) or Response(document)
+        response['ETag'] = etag
+        return response
@@ -1,6 +1,7 @@
 """Admin configuration for notifications app."""
 from django.contrib import admin
-from notifications.models import Notification, NotificationSettings
+from notifications.broadcast import pause_broadcast, start_broadcast
+from notifications.models import Broadcast, Notification, NotificationArchive, NotificationSettings
 
 
 @admin.register(Notification)
@@ -11,8 +12,47 @@ class NotificationAdmin(admin.ModelAdmin):
     ordering = ['-created_at']
 
 
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ['user', 'notification_type', 'title', 'created_at', 'archived_at']
+    list_filter = ['notification_type']
+    search_fields = ['user__email', 'title']
+    ordering = ['-created_at']
+
+
 @admin.register(NotificationSettings)
 class NotificationSettingsAdmin(admin.ModelAdmin):
     list_display = ['user', 'email_order_updates', 'email_promotions', 'push_enabled']
     search_fields = ['user__email']
 
+
+@admin.register(Broadcast)
+class BroadcastAdmin(admin.ModelAdmin):
+    list_display = ['title', 'promotion', 'status', 'recipients_count', 'throughput', 'created_at', 'finished_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['title', 'message']
+    ordering = ['-created_at']
+    readonly_fields = [
+        'status', 'last_user_id', 'run_id', 'recipients_count', 'elapsed_seconds',
+        'created_by', 'started_at', 'finished_at',
+    ]
+    actions = ['start', 'pause']
+
+    @admin.display(description='Recipients/s')
+    def throughput(self, obj):
+        return f'{obj.throughput:.0f}'
+
+    @admin.action(description='Start or resume selected broadcasts')
+    def start(self, request, queryset):
+        started = sum(start_broadcast(pk) is not None for pk in queryset.values_list('pk', flat=True))
+        self.message_user(request, f'Started {started} broadcasts')
+
+    @admin.action(description='Pause selected broadcasts')
+    def pause(self, request, queryset):
+        paused = sum(pause_broadcast(pk) for pk in queryset.values_list('pk', flat=True))
+        self.message_user(request, f'Paused {paused} broadcasts')
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            obj.created_by = request.user
+        super().save_model(request, obj, form, change)
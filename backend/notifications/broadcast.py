@@ -0,0 +1,154 @@
+"""
+Promotional broadcasts for notifications app.
+
+A Broadcast sends one PROMOTION notification to every active user who accepts
+promotions by email or push (users without NotificationSettings have the
+defaults, which do). Recipient ids are streamed in id order through a
+server-side cursor and handled in chunks of NOTIFICATION_BROADCAST_CHUNK_SIZE:
+a chunk's notifications are inserted with one bulk_create in the transaction
+that advances the broadcast's checkpoint and, once it commits, handed to
+dispatch_notifications, which spreads channel delivery over the workers.
+
+Pausing only flips the status; the running task stops before its next chunk.
+Starting or resuming claims a new run_id and continues after the checkpoint.
+A chunk only commits while its run is the current one, so no user is notified
+twice, even by a run that was superseded while still going.
+"""
+import logging
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def eligible_user_ids(after_id=0):
+    """Ids of the users a broadcast reaches, in id order after after_id."""
+    from notifications.models import NotificationSettings
+    from users.models import User
+
+    preferences = NotificationSettings.objects.filter(user=OuterRef('pk'))
+    opted_in = preferences.filter(Q(email_promotions=True) | Q(push_enabled=True, push_promotions=True))
+    return (
+        User.objects.filter(is_active=True, id__gt=after_id)
+        .filter(Exists(opted_in) | ~Exists(preferences))
+        .order_by('id')
+        .values_list('id', flat=True)
+    )
+
+
+def claim_broadcast(broadcast_id):
+    """
+    Mark a broadcast running under a new run id and return it, or None when
+    the broadcast is completed. Runs holding an older id stop.
+    """
+    from notifications.models import Broadcast
+
+    with transaction.atomic():
+        claimed = Broadcast.objects.filter(pk=broadcast_id).exclude(status='COMPLETED').update(
+            status='RUNNING',
+            run_id=F('run_id') + 1,
+            started_at=Coalesce('started_at', timezone.now()),
+            updated_at=timezone.now(),
+        )
+        if not claimed:
+            return None
+        return Broadcast.objects.filter(pk=broadcast_id).values_list('run_id', flat=True).get()
+
+
+def start_broadcast(broadcast_id):
+    """Start or resume a broadcast on a worker. Returns the claimed run id."""
+    from notifications.tasks import send_promotion_broadcast
+
+    run_id = claim_broadcast(broadcast_id)
+    if run_id is not None:
+        transaction.on_commit(lambda: send_promotion_broadcast.delay(broadcast_id, run_id))
+    return run_id
+
+
+def pause_broadcast(broadcast_id):
+    """Stop a broadcast after its current chunk. Returns whether it was active."""
+    from notifications.models import Broadcast
+
+    return bool(
+        Broadcast.objects.filter(pk=broadcast_id, status__in=['PENDING', 'RUNNING'])
+        .update(status='PAUSED', updated_at=timezone.now())
+    )
+
+
+def _publish(notifications):
+    from notifications.serializers.notification_serializers import NotificationSerializer
+    from realtime.brokers import publish
+
+    for notification in notifications:
+        publish([notification.user_id], 'notification', NotificationSerializer(notification).data)
+
+
+def run_broadcast(broadcast_id, run_id, chunk_size=None):
+    """
+    Notify the remaining recipients of a broadcast for as long as run_id is
+    its current run. Returns the broadcast as this run left it.
+    """
+    from notifications.models import Broadcast, Notification
+    from notifications.outbox import enqueue_dispatch
+    from notifications.unread import forget_unread_counts
+
+    chunk_size = chunk_size or settings.NOTIFICATION_BROADCAST_CHUNK_SIZE
+    current = Broadcast.objects.filter(pk=broadcast_id, run_id=run_id, status='RUNNING')
+    broadcast = current.first()
+    if broadcast is None:
+        return Broadcast.objects.get(pk=broadcast_id)
+
+    data = {**broadcast.data, 'broadcast_id': broadcast.pk}
+    # Server-side cursor on PostgreSQL: ids arrive chunk_size rows at a time
+    user_ids = eligible_user_ids(broadcast.last_user_id).iterator(chunk_size=chunk_size)
+    tick = time.monotonic()
+    while chunk := list(islice(user_ids, chunk_size)):
+        with transaction.atomic():
+            now = time.monotonic()
+            # The UPDATE locks the row until commit, so a concurrent claim
+            # waits for this chunk and its run reads the advanced checkpoint
+            advanced = current.update(
+                last_user_id=chunk[-1],
+                recipients_count=F('recipients_count') + len(chunk),
+                elapsed_seconds=F('elapsed_seconds') + (now - tick),
+                updated_at=timezone.now(),
+            )
+            if not advanced:
+                # Paused, or superseded by a newer run
+                break
+            notifications = Notification.objects.bulk_create([
+                Notification(
+                    user_id=user_id,
+                    notification_type='PROMOTION',
+                    title=broadcast.title,
+                    message=broadcast.message,
+                    data=data,
+                )
+                for user_id in chunk
+            ])
+            forget_unread_counts(chunk)
+            ids = [notification.pk for notification in notifications]
+            transaction.on_commit(lambda notifications=notifications: _publish(notifications))
+            transaction.on_commit(lambda ids=ids: enqueue_dispatch(ids))
+        tick = now
+    else:
+        current.update(
+            status='COMPLETED',
+            elapsed_seconds=F('elapsed_seconds') + (time.monotonic() - tick),
+            finished_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+
+    broadcast.refresh_from_db()
+    logger.info(
+        'Broadcast %s %s: %s recipients in %.1fs (%.0f/s)',
+        broadcast.pk, broadcast.status.lower(), broadcast.recipients_count,
+        broadcast.elapsed_seconds, broadcast.throughput,
+    )
+    return broadcast
@@ -0,0 +1,46 @@
+"""
+Delivery channel preferences for notifications app.
+"""
+from notifications.models import NotificationSettings
+
+# Channels notifications are dispatched to. SMS and push preferences are
+# kept, but nothing is sent on them until their integrations exist
+CHANNELS = ['email']
+
+# NotificationSettings flag per (channel, notification type)
+CHANNEL_PREFERENCES = {
+    'email': {
+        'ORDER': 'email_order_updates',
+        'RESERVATION': 'email_reservation_updates',
+        'PROMOTION': 'email_promotions',
+    },
+    'sms': {
+        'ORDER': 'sms_order_updates',
+        'RESERVATION': 'sms_reservation_reminders',
+    },
+    'push': {
+        'ORDER': 'push_order_updates',
+        'PROMOTION': 'push_promotions',
+    },
+}
+
+
+def user_settings(user):
+    """The user's NotificationSettings, or the defaults when none were saved."""
+    try:
+        return user.notification_settings
+    except NotificationSettings.DoesNotExist:
+        return NotificationSettings(user=user)
+
+
+def wants_channel(preferences, channel, notification_type):
+    """
+    Whether a notification type goes out on channel. Email and push cover
+    every type without a flag of its own; SMS only the opted-in types.
+    """
+    flag = CHANNEL_PREFERENCES[channel].get(notification_type)
+    if channel == 'sms':
+        return bool(flag and getattr(preferences, flag))
+    if channel == 'push' and not preferences.push_enabled:
+        return False
+    return flag is None or getattr(preferences, flag)
@@ -0,0 +1,61 @@
+"""
+Batched channel delivery for notifications app.
+
+A batch of notifications is loaded in one query together with its users and
+their NotificationSettings, sent over a single email backend connection and
+marked sent with one UPDATE, instead of a query, a connection and a full-row
+save per notification.
+"""
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+from notifications.channels import user_settings, wants_channel
+
+logger = logging.getLogger(__name__)
+
+
+def send_email_batch(notification_ids, connection=None):
+    """
+    Email the unsent notifications among notification_ids whose users accept
+    email for their type. Returns {'sent', 'skipped', 'failed'} counts.
+    """
+    from notifications.models import Notification
+
+    notifications = (
+        Notification.objects.filter(id__in=notification_ids, sent_email=False)
+        .select_related('user__notification_settings')
+        .order_by('id')
+    )
+    messages, skipped = [], 0
+    for notification in notifications:
+        user = notification.user
+        if not user.email or not wants_channel(user_settings(user), 'email', notification.notification_type):
+            skipped += 1
+            continue
+        message = EmailMessage(
+            subject=notification.title,
+            body=notification.message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[user.email],
+        )
+        messages.append((notification.id, message))
+
+    sent_ids, failed = [], 0
+    if messages:
+        connection = connection or get_connection(fail_silently=False)
+        # One connection for the batch; messages go one by one so a bad
+        # recipient only fails its own notification
+        with connection:
+            for notification_id, message in messages:
+                try:
+                    if connection.send_messages([message]):
+                        sent_ids.append(notification_id)
+                except Exception as exc:
+                    failed += 1
+                    logger.warning('Email for notification %s failed: %s', notification_id, exc)
+
+    if sent_ids:
+        Notification.objects.filter(id__in=sent_ids).update(sent_email=True)
+    return {'sent': len(sent_ids), 'skipped': skipped, 'failed': failed}
@@ -0,0 +1,55 @@
+"""Send, pause or resume a promotional broadcast to all opted-in users."""
+from django.core.management.base import BaseCommand, CommandError
+from notifications.broadcast import claim_broadcast, pause_broadcast, run_broadcast, start_broadcast
+from notifications.models import Broadcast
+from promotions.models import Promotion
+
+
+class Command(BaseCommand):
+    help = 'Broadcast a PROMOTION notification to every user who accepts promotions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--promotion', help='Promotion code; its name and description are the defaults')
+        parser.add_argument('--title')
+        parser.add_argument('--message')
+        parser.add_argument('--resume', type=int, metavar='BROADCAST_ID', help='Continue a paused broadcast')
+        parser.add_argument('--pause', type=int, metavar='BROADCAST_ID', help='Pause a running broadcast')
+        parser.add_argument('--sync', action='store_true', help='Run in this process instead of on a worker')
+        parser.add_argument('--chunk-size', type=int, help='Recipients per chunk (sync runs only)')
+
+    def handle(self, *args, **options):
+        if options['pause']:
+            if not pause_broadcast(options['pause']):
+                raise CommandError(f"Broadcast {options['pause']} is not running")
+            self.stdout.write(self.style.SUCCESS(f"Broadcast {options['pause']} pauses after its current chunk"))
+            return
+
+        broadcast_id = options['resume'] or self.create_broadcast(options).pk
+        if not options['sync']:
+            if start_broadcast(broadcast_id) is None:
+                raise CommandError(f'Broadcast {broadcast_id} is already completed')
+            self.stdout.write(self.style.SUCCESS(f'Broadcast {broadcast_id} queued'))
+            return
+
+        run_id = claim_broadcast(broadcast_id)
+        if run_id is None:
+            raise CommandError(f'Broadcast {broadcast_id} is already completed')
+        broadcast = run_broadcast(broadcast_id, run_id, chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Broadcast {broadcast_id} {broadcast.status.lower()}: {broadcast.recipients_count} recipients '
+            f'in {broadcast.elapsed_seconds:.1f}s ({broadcast.throughput:.0f}/s)'
+        ))
+
+    def create_broadcast(self, options):
+        promotion = None
+        if options['promotion']:
+            try:
+                promotion = Promotion.objects.get(code=options['promotion'])
+            except Promotion.DoesNotExist:
+                raise CommandError(f"Promotion {options['promotion']} not found")
+        title = options['title'] or (promotion and promotion.name)
+        message = options['message'] or (promotion and promotion.description)
+        if not title or not message:
+            raise CommandError('A title and a message (or a --promotion) are required')
+        data = {'promotion_id': promotion.id, 'code': promotion.code} if promotion else {}
+        return Broadcast.objects.create(promotion=promotion, title=title, message=message, data=data)
@@ -0,0 +1,54 @@
+# Generated by Django 5.1.14 on 2026-10-18 20:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from notifications.retention import partition_archive
+
+
+def partition_archive_table(apps, schema_editor):
+    partition_archive(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0005_broadcasts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('notification_type', models.CharField(choices=[('ORDER', 'Order Update'), ('RESERVATION', 'Reservation Update'), ('PAYMENT', 'Payment Update'), ('PROMOTION', 'Promotion'), ('REVIEW', 'Review'), ('SYSTEM', 'System'), ('ALERT', 'Alert')], max_length=20)),
+                ('title', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField()),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'notifications_archive',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', True)), fields=['created_at'], name='notifications_read_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationarchive',
+            name='user',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='notificationarchive',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='notif_archive_user_created_idx'),
+        ),
+        # Dropping the model drops the partitioned table with its partitions
+        migrations.RunPython(partition_archive_table, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,13 @@
 from django.db import models
 from users.models import User
+from core.tracking import TrackedFieldsMixin
 
 
-class Notification(models.Model):
+class Notification(TrackedFieldsMixin, models.Model):
     """Notification model for user notifications."""
     
+    tracked_fields = ('is_read',)
+    
     TYPE_CHOICES = [
         ('ORDER', 'Order Update'),
         ('RESERVATION', 'Reservation Update'),
@@ -35,11 +38,49 @@ class Notification(models.Model):
     class Meta:
         db_table = 'notifications'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'is_read'], name='notifications_user_read_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='notifications_user_created_idx'),
+            # Retention sweep: oldest read notifications first
+            models.Index(
+                fields=['created_at'], name='notifications_read_created_idx', condition=models.Q(is_read=True)
+            ),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.title}"
 
 
+class NotificationArchive(models.Model):
+    """
+    Read notification past NOTIFICATION_RETENTION_DAYS, moved out of the hot
+    notifications table (see notifications.retention). Partitioned by month of
+    created_at on PostgreSQL.
+    """
+    
+    id = models.BigIntegerField(primary_key=True)  # The original notification id
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', db_constraint=False)
+    notification_type = models.CharField(max_length=20, choices=Notification.TYPE_CHOICES)
+    
+    title = models.CharField(max_length=200)
+    message = models.TextField()
+    data = models.JSONField(default=dict, blank=True)
+    
+    created_at = models.DateTimeField()
+    read_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'notifications_archive'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='notif_archive_user_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} - {self.title}"
+
+
 class NotificationSettings(models.Model):
     """User notification preferences."""
     
@@ -69,3 +110,55 @@ class NotificationSettings(models.Model):
     def __str__(self):
         return f"Notification settings for {self.user.email}"
 
+
+class Broadcast(models.Model):
+    """Promotional notification sent to every opted-in user, in resumable chunks."""
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('PAUSED', 'Paused'),
+        ('COMPLETED', 'Completed'),
+    ]
+    
+    promotion = models.ForeignKey(
+        'promotions.Promotion',
+        on_delete=models.SET_NULL,
+        related_name='broadcasts',
+        null=True,
+        blank=True
+    )
+    title = models.CharField(max_length=200)
+    message = models.TextField()
+    data = models.JSONField(default=dict, blank=True)  # Copied into every notification
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    # Checkpoint: recipients are notified in user id order, a resumed run
+    # continues after the last user notified
+    last_user_id = models.PositiveBigIntegerField(default=0)
+    # Incremented by every start/resume; an older run stops at its next chunk
+    run_id = models.PositiveIntegerField(default=0)
+    
+    # Progress
+    recipients_count = models.PositiveIntegerField(default=0)
+    elapsed_seconds = models.FloatField(default=0)
+    
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, related_name='+', null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'notification_broadcasts'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.title} ({self.get_status_display()})"
+    
+    @property
+    def throughput(self):
+        """Recipients notified per second of running time."""
+        if not self.elapsed_seconds:
+            return 0.0
+        return self.recipients_count / self.elapsed_seconds
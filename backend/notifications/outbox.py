@@ -0,0 +1,144 @@
+"""
+Notification outbox for notifications app.
+
+Signals and tasks call notify() instead of creating Notification rows in
+their save path. Events are buffered per transaction and flushed once it
+commits: duplicates are coalesced, the rows of the whole transaction are
+inserted with one bulk_create, and channel delivery is handed to the
+dispatch_notifications task in batches. Outside a transaction notify()
+flushes immediately.
+
+Only public on_commit behaviour is relied on: callbacks run in registration
+order and are discarded by a rollback. The first event of a transaction
+registers the flush; every event also registers a no-op marker, and events
+whose marker was discarded with a rolled-back savepoint are dropped.
+
+Events carrying a coalesce_key are dropped when an event with the same user,
+key and title was already flushed within NOTIFICATION_COALESCE_SECONDS, so
+repeated saves of an object do not repeat the same notification.
+"""
+import hashlib
+import logging
+import threading
+import weakref
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class _Outbox:
+    """
+    Events of the current transaction. Only the pending on_commit flush holds
+    it: a rollback discards that callback and so the outbox with it.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def flush(self):
+        if _current_outbox() is self:
+            _local.outbox = None
+        # Events whose marker a rolled-back savepoint discarded are dropped
+        events = [event for marker, event in self.events if marker() is not None]
+        self.events = []
+        deliver(events)
+
+
+class _Marker:
+    """on_commit callback kept alive by Django until commit, unless rolled back."""
+
+    def __call__(self):
+        pass
+
+
+def _current_outbox():
+    ref = getattr(_local, 'outbox', None)
+    return ref() if ref is not None else None
+
+
+def notify(user_id, notification_type, title, message, data=None, coalesce_key=None):
+    """Queue a notification for user_id, created when the transaction commits."""
+    event = {
+        'user_id': user_id,
+        'notification_type': notification_type,
+        'title': title,
+        'message': message,
+        'data': data or {},
+        'coalesce_key': coalesce_key,
+    }
+    if transaction.get_autocommit():
+        deliver([event])
+        return
+    outbox = _current_outbox()
+    if outbox is None:
+        outbox = _Outbox()
+        _local.outbox = weakref.ref(outbox)
+        # robust: a failing flush must not turn a committed request into an error
+        transaction.on_commit(outbox.flush, robust=True)
+    # Registered after the flush, so still pending (alive) when it runs
+    marker = _Marker()
+    transaction.on_commit(marker)
+    outbox.events.append((weakref.ref(marker), event))
+
+
+def _coalesce(events):
+    """Events without duplicates within the batch or the coalescing window."""
+    unique, seen = [], set()
+    for event in events:
+        key = event['coalesce_key']
+        if key is None:
+            unique.append(event)
+            continue
+        digest = hashlib.md5(f"{event['user_id']}|{key}|{event['title']}".encode()).hexdigest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        # add() only succeeds for the first event of the window; a cache
+        # outage (None from IGNORE_EXCEPTIONS) must not drop notifications
+        if cache.add(f'notifications:coalesce:{digest}', 1, settings.NOTIFICATION_COALESCE_SECONDS) is not False:
+            unique.append(event)
+    return unique
+
+
+def deliver(events):
+    """Create the notifications of events in bulk and dispatch them."""
+    from notifications.models import Notification
+    from notifications.serializers.notification_serializers import NotificationSerializer
+    from notifications.unread import adjust_unread_count
+    from realtime.brokers import publish_on_commit
+
+    events = _coalesce(events)
+    if not events:
+        return []
+    notifications = Notification.objects.bulk_create([
+        Notification(**{field: value for field, value in event.items() if field != 'coalesce_key'})
+        for event in events
+    ])
+
+    # bulk_create skips the post_save receivers, so do their work here
+    for user_id, count in Counter(notification.user_id for notification in notifications).items():
+        adjust_unread_count(user_id, count)
+    for notification in notifications:
+        publish_on_commit([notification.user_id], 'notification', NotificationSerializer(notification).data)
+
+    enqueue_dispatch([notification.pk for notification in notifications])
+    return notifications
+
+
+def enqueue_dispatch(notification_ids):
+    """Hand committed notifications to dispatch_notifications in batches."""
+    from notifications.tasks import dispatch_notifications
+
+    batch_size = settings.NOTIFICATION_DISPATCH_BATCH_SIZE
+    for start in range(0, len(notification_ids), batch_size):
+        try:
+            dispatch_notifications.delay(notification_ids[start:start + batch_size])
+        except Exception as exc:
+            # Rows are committed; only delivery is skipped while the broker is down
+            logger.warning('Could not enqueue notification dispatch: %s', exc)
@@ -0,0 +1,175 @@
+"""
+Notification retention for notifications app.
+
+Read notifications older than NOTIFICATION_RETENTION_DAYS leave the hot
+notifications table, which the API, the unread counters and the signals work
+on. With NOTIFICATION_ARCHIVE they are copied to NotificationArchive first,
+otherwise they are deleted. Either way the sweep works in bounded batches
+(NOTIFICATION_RETENTION_BATCH_SIZE rows, one short transaction each, at most
+NOTIFICATION_RETENTION_MAX_BATCHES per run), so it never holds long locks.
+Unread notifications stay until they are read.
+
+On PostgreSQL the archive is range-partitioned by month of created_at:
+partitions are created before a batch is moved into them, queries filtered or
+paginated by created_at only scan the months they need, and archived months
+past NOTIFICATION_ARCHIVE_RETENTION_DAYS are dropped whole instead of
+deleted row by row. Other databases keep a plain archive table and expire it
+in batches.
+"""
+import logging
+import re
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_FIELDS = ['id', 'user_id', 'notification_type', 'title', 'message', 'data', 'created_at', 'read_at']
+
+POSTGRES_PARTITION_SQL = [
+    # Same columns as the table Django created, partitioned by created_at;
+    # the primary key of a partitioned table must include the partition key
+    "CREATE TABLE notifications_archive_partitioned (LIKE notifications_archive INCLUDING DEFAULTS) "
+    "PARTITION BY RANGE (created_at)",
+    "ALTER TABLE notifications_archive_partitioned ADD PRIMARY KEY (id, created_at)",
+    "DROP TABLE notifications_archive",
+    "ALTER TABLE notifications_archive_partitioned RENAME TO notifications_archive",
+    "CREATE INDEX notif_archive_user_created_idx ON notifications_archive (user_id, created_at DESC, id DESC)",
+]
+
+PARTITION_NAME = re.compile(r'^notifications_archive_p(\d{4})(\d{2})$')
+
+
+def partition_archive(schema_editor):
+    """Turn the archive table into a partitioned one, on PostgreSQL only."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in POSTGRES_PARTITION_SQL:
+        schema_editor.execute(statement)
+
+
+def _month_start(value):
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def _next_month(month):
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def archive_months(first, last):
+    """Starts of the months from first's to last's, as partition bounds."""
+    month, end = _month_start(first), _month_start(last)
+    months = []
+    while month <= end:
+        months.append(month)
+        month = _next_month(month)
+    return months
+
+
+def ensure_archive_partitions(first, last):
+    """Create the monthly archive partitions covering first..last (PostgreSQL)."""
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        for month in archive_months(first, last):
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS notifications_archive_p{month:%Y%m} "
+                "PARTITION OF notifications_archive FOR VALUES FROM (%s) TO (%s)",
+                [month, _next_month(month)],
+            )
+
+
+def archive_notifications(batch_size=None, max_batches=None):
+    """
+    Move (or delete) read notifications past the retention age, oldest first.
+    Returns the number of notifications removed from the hot table.
+    """
+    from notifications.models import Notification, NotificationArchive
+
+    batch_size = batch_size or settings.NOTIFICATION_RETENTION_BATCH_SIZE
+    max_batches = max_batches or settings.NOTIFICATION_RETENTION_MAX_BATCHES
+    cutoff = timezone.now() - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+    expired = Notification.objects.filter(is_read=True, created_at__lt=cutoff).order_by('created_at')
+
+    removed = 0
+    for _ in range(max_batches):
+        with transaction.atomic():
+            # Locked, so a row can't be marked unread between its copy and its delete
+            rows = list(expired.select_for_update().values(*ARCHIVED_FIELDS)[:batch_size])
+            if not rows:
+                break
+            if settings.NOTIFICATION_ARCHIVE:
+                ensure_archive_partitions(rows[0]['created_at'], rows[-1]['created_at'])
+                # ignore_conflicts: rows archived by an earlier, interrupted sweep
+                NotificationArchive.objects.bulk_create(
+                    [NotificationArchive(**row) for row in rows], ignore_conflicts=True
+                )
+            # A plain DELETE: QuerySet.delete() would load every row for the
+            # post_delete receiver, which only discounts unread notifications,
+            # and is_read keeps it to read rows even where the lock above is a
+            # no-op (SQLite). No table references notifications, so nothing
+            # cascades.
+            ids = [row['id'] for row in rows]
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {Notification._meta.db_table} "
+                    f"WHERE id IN ({', '.join(['%s'] * len(ids))}) AND is_read",
+                    ids,
+                )
+                removed += cursor.rowcount
+        if len(rows) < batch_size:
+            break
+    return removed
+
+
+def _drop_expired_partitions(cutoff):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'notifications_archive'"
+        )
+        partitions = [name for (name,) in cursor.fetchall()]
+        dropped = 0
+        for name in partitions:
+            match = PARTITION_NAME.match(name)
+            if not match:
+                continue
+            month = datetime(int(match[1]), int(match[2]), 1, tzinfo=dt_timezone.utc)
+            if _next_month(month) <= cutoff:
+                cursor.execute(f'DROP TABLE {name}')
+                dropped += 1
+    return dropped
+
+
+def expire_archive(batch_size=None, max_batches=None):
+    """
+    Remove archived notifications past NOTIFICATION_ARCHIVE_RETENTION_DAYS
+    (0 keeps them forever). PostgreSQL drops whole monthly partitions; other
+    databases delete in batches.
+    """
+    from notifications.models import NotificationArchive
+
+    if not settings.NOTIFICATION_ARCHIVE_RETENTION_DAYS:
+        return
+    cutoff = timezone.now() - timedelta(days=settings.NOTIFICATION_ARCHIVE_RETENTION_DAYS)
+    if connection.vendor == 'postgresql':
+        dropped = _drop_expired_partitions(cutoff)
+        logger.info('Dropped %s expired notification archive partitions', dropped)
+        return
+
+    batch_size = batch_size or settings.NOTIFICATION_RETENTION_BATCH_SIZE
+    max_batches = max_batches or settings.NOTIFICATION_RETENTION_MAX_BATCHES
+    expired = NotificationArchive.objects.filter(created_at__lt=cutoff).order_by('created_at')
+    deleted = 0
+    for _ in range(max_batches):
+        ids = list(expired.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        deleted += NotificationArchive.objects.filter(id__in=ids).delete()[0]
+        if len(ids) < batch_size:
+            break
+    logger.info('Deleted %s expired archived notifications', deleted)
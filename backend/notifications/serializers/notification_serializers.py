@@ -1,13 +1,30 @@
 """Serializers for notifications app."""
+from django.utils import timezone
 from rest_framework import serializers
-from notifications.models import Notification, NotificationSettings
+from notifications.models import Notification, NotificationArchive, NotificationSettings
 
 
 class NotificationSerializer(serializers.ModelSerializer):
+    """Notifications are written by the platform; clients only mark them read or unread."""
+
     class Meta:
         model = Notification
         fields = '__all__'
-        read_only_fields = ['user']
+        read_only_fields = [
+            'user', 'notification_type', 'title', 'message', 'data',
+            'sent_email', 'sent_sms', 'sent_push', 'read_at',
+        ]
+
+    def update(self, instance, validated_data):
+        if 'is_read' in validated_data and validated_data['is_read'] != instance.is_read:
+            validated_data['read_at'] = timezone.now() if validated_data['is_read'] else None
+        return super().update(instance, validated_data)
+
+
+class NotificationArchiveSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = NotificationArchive
+        exclude = ['user']
 
 
 class NotificationSettingsSerializer(serializers.ModelSerializer):
@@ -0,0 +1,18 @@
+"""Signals for notifications app."""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from notifications.models import Notification
+from notifications.unread import adjust_unread_count
+
+
+@receiver(post_save, sender=Notification)
+def update_unread_count(sender, instance, created, **kwargs):
+    """Keep the owner's unread counter in step with created/read notifications."""
+    was_unread = not created and not instance.get_previous_value('is_read')
+    adjust_unread_count(instance.user_id, int(not instance.is_read) - int(was_unread))
+
+
+@receiver(post_delete, sender=Notification)
+def discount_deleted_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        adjust_unread_count(instance.user_id, -1)
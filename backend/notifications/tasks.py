@@ -2,8 +2,6 @@
 Celery tasks for notifications app.
 """
 from celery import shared_task
-from django.core.mail import send_mail
-from django.conf import settings
 
 
 @shared_task
@@ -11,43 +9,14 @@ def send_email_notification(notification_id):
     """
     Send email notification to user.
     """
-    from notifications.models import Notification
+    from notifications.delivery import send_email_batch
     
-    try:
-        notification = Notification.objects.get(id=notification_id)
-        user = notification.user
-        
-        # Check user preferences
-        if hasattr(user, 'notification_settings'):
-            settings_obj = user.notification_settings
-            
-            # Check if email notifications are enabled for this type
-            if notification.notification_type == 'ORDER' and not settings_obj.email_order_updates:
-                return "Email notifications disabled for orders"
-            elif notification.notification_type == 'RESERVATION' and not settings_obj.email_reservation_updates:
-                return "Email notifications disabled for reservations"
-            elif notification.notification_type == 'PROMOTION' and not settings_obj.email_promotions:
-                return "Email notifications disabled for promotions"
-        
-        # Send email
-        try:
-            send_mail(
-                subject=notification.title,
-                message=notification.message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                fail_silently=False,
-            )
-            
-            notification.sent_email = True
-            notification.save()
-            
-            return f"Email sent to {user.email}"
-        except Exception as e:
-            return f"Failed to send email: {str(e)}"
-            
-    except Notification.DoesNotExist:
-        return f"Notification {notification_id} not found"
+    counts = send_email_batch([notification_id])
+    if counts['sent']:
+        return f"Email sent for notification {notification_id}"
+    if counts['failed']:
+        return f"Failed to send email for notification {notification_id}"
+    return f"Email not sent for notification {notification_id} (disabled, already sent or not found)"
 
 
 @shared_task
@@ -88,3 +57,86 @@ def send_push_notification(notification_id):
         return f"Push notification sent for notification {notification_id}"
     except Notification.DoesNotExist:
         return f"Notification {notification_id} not found"
+
+
+@shared_task
+def dispatch_notifications(notification_ids):
+    """
+    Fan a batch of new notifications out to the channels their users opted
+    into: one query for the batch and its settings, one task per channel.
+    """
+    from notifications.channels import CHANNELS, user_settings, wants_channel
+    from notifications.models import Notification
+    
+    notifications = Notification.objects.filter(id__in=notification_ids).select_related(
+        'user__notification_settings'
+    ).order_by('id')
+    per_channel = {channel: [] for channel in CHANNELS}
+    for notification in notifications:
+        preferences = user_settings(notification.user)
+        for channel in CHANNELS:
+            if wants_channel(preferences, channel, notification.notification_type):
+                per_channel[channel].append(notification.id)
+    
+    senders = {
+        'email': send_email_notifications,
+    }
+    for channel, ids in per_channel.items():
+        if ids:
+            senders[channel].delay(ids)
+    return {channel: len(ids) for channel, ids in per_channel.items()}
+
+
+@shared_task
+def send_email_notifications(notification_ids):
+    """
+    Send a batch of email notifications over one backend connection,
+    honouring the users' NotificationSettings (see notifications.delivery).
+    """
+    from notifications.delivery import send_email_batch
+    
+    counts = send_email_batch(notification_ids)
+    return f"Sent {counts['sent']} of {len(notification_ids)} emails"
+
+
+@shared_task
+def reconcile_unread_counts():
+    """
+    Correct drifted unread notification counters.
+    Runs every 30 minutes via Celery Beat.
+    """
+    from notifications.unread import reconcile_counters
+    
+    corrected = reconcile_counters()
+    return f"Corrected {corrected} unread notification counters"
+
+
+@shared_task
+def send_promotion_broadcast(broadcast_id, run_id):
+    """
+    Notify the remaining recipients of a promotional broadcast from its
+    checkpoint (see notifications.broadcast).
+    """
+    from notifications.broadcast import run_broadcast
+    
+    broadcast = run_broadcast(broadcast_id, run_id)
+    return (
+        f"Broadcast {broadcast_id} {broadcast.status.lower()}: "
+        f"{broadcast.recipients_count} recipients, {broadcast.throughput:.0f}/s"
+    )
+
+
+@shared_task
+def archive_old_notifications():
+    """
+    Move read notifications past the retention age out of the hot table and
+    expire old archived ones (see notifications.retention).
+    Runs daily via Celery Beat.
+    """
+    from django.conf import settings
+    from notifications.retention import archive_notifications, expire_archive
+    
+    removed = archive_notifications()
+    expire_archive()
+    action = 'Archived' if settings.NOTIFICATION_ARCHIVE else 'Deleted'
+    return f"{action} {removed} read notifications"
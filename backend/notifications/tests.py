@@ -1,3 +1,374 @@
-from django.test import TestCase
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from notifications.broadcast import claim_broadcast, eligible_user_ids, pause_broadcast, run_broadcast, start_broadcast
+from notifications.delivery import send_email_batch
+from notifications.models import Broadcast, Notification, NotificationArchive, NotificationSettings
+from notifications.outbox import notify
+from notifications.retention import archive_months, archive_notifications, expire_archive
+from notifications.tasks import dispatch_notifications
+from notifications.unread import reconcile_counters, unread_count
+from users.models import User
+
+
+class NotificationConditionalListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='customer@example.com', username='customer', password='pass')
+        self.other = User.objects.create_user(email='other@example.com', username='other', password='pass')
+        Notification.objects.create(user=self.user, notification_type='SYSTEM', title='Hi', message='Welcome')
+
+    def test_etag_follows_reads_and_caller(self):
+        self.client.force_authenticate(self.user)
+        etag = self.client.get('/api/v1/notifications/')['ETag']
+        self.assertEqual(self.client.get('/api/v1/notifications/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.client.post('/api/v1/notifications/mark_all_as_read/')
+        self.assertEqual(self.client.get('/api/v1/notifications/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get('/api/v1/notifications/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_etag_follows_marking_unread(self):
+        self.client.force_authenticate(self.user)
+        older = Notification.objects.create(user=self.user, notification_type='SYSTEM', title='Old', message='Hi')
+        self.client.post('/api/v1/notifications/mark_all_as_read/')
+        Notification.objects.create(user=self.user, notification_type='SYSTEM', title='New', message='Hi')
+        etag = self.client.get('/api/v1/notifications/')['ETag']
+
+        response = self.client.patch(f'/api/v1/notifications/{older.pk}/', {'is_read': False, 'title': 'Edited'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['is_read'], response.data['read_at'], response.data['title']), (False, None, 'Old'))
+        response = self.client.get('/api/v1/notifications/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+
+    def test_notifications_are_not_created_through_the_api(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post('/api/v1/notifications/', {'notification_type': 'SYSTEM', 'title': 'x', 'message': 'y'})
+        self.assertEqual(response.status_code, 405)
+
+
+class UnreadCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='customer@example.com', username='customer', password='pass')
+        self.client.force_authenticate(self.user)
+
+    def notify(self, title='Hi'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Notification.objects.create(
+                user=self.user, notification_type='SYSTEM', title=title, message='Welcome'
+            )
+
+    def unread_count(self, queries=0):
+        with self.assertNumQueries(queries):
+            response = self.client.get('/api/v1/notifications/unread-count/')
+        return response.data['count']
+
+    def test_counter_follows_creates_and_reads(self):
+        first = self.notify()
+        self.assertEqual(self.unread_count(queries=1), 1)
+        self.notify('Again')
+        self.assertEqual(self.unread_count(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/v1/notifications/{first.id}/mark-as-read/')
+            self.client.post(f'/api/v1/notifications/{first.id}/mark-as-read/')
+        self.assertEqual(self.unread_count(), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/v1/notifications/mark_all_as_read/')
+        self.assertEqual(self.unread_count(queries=1), 0)
+
+        later = self.notify('Later')
+        self.assertEqual(self.unread_count(), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            later.delete()
+        self.assertEqual(self.unread_count(), 0)
+
+    def test_reconcile_corrects_drift(self):
+        self.notify()
+        self.assertEqual(self.unread_count(queries=1), 1)
+        # An update() that bypassed the signals
+        Notification.objects.create(user=self.user, notification_type='SYSTEM', title='Lost', message='')
+        self.assertEqual(reconcile_counters(), 1)
+        self.assertEqual(self.unread_count(), 2)
+
+
+@mock.patch('notifications.tasks.dispatch_notifications.delay')
+class OutboxTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='customer@example.com', username='customer', password='pass')
+
+    def test_transaction_is_flushed_in_one_batch(self, dispatch_delay):
+        with self.captureOnCommitCallbacks() as callbacks:
+            for i in range(3):
+                notify(self.user.id, 'SYSTEM', f'Hi {i}', 'Welcome')
+            self.assertFalse(Notification.objects.exists())
+
+        with self.assertNumQueries(1), self.captureOnCommitCallbacks(execute=True):
+            for callback in callbacks:
+                callback()
+        ids = list(Notification.objects.order_by('id').values_list('id', flat=True))
+        self.assertEqual(len(ids), 3)
+        dispatch_delay.assert_called_once_with(ids)
+        self.assertEqual(unread_count(self.user.id), 3)
+
+    def test_rolled_back_savepoint_drops_its_events(self, dispatch_delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            notify(self.user.id, 'SYSTEM', 'Kept', 'Welcome')
+            try:
+                with transaction.atomic():
+                    notify(self.user.id, 'SYSTEM', 'Dropped', 'Welcome')
+                    raise ValueError
+            except ValueError:
+                pass
+            notify(self.user.id, 'SYSTEM', 'Also kept', 'Welcome')
+        titles = set(Notification.objects.values_list('title', flat=True))
+        self.assertEqual(titles, {'Kept', 'Also kept'})
+
+    def test_outbox_of_rolled_back_savepoint_is_not_reused(self, dispatch_delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    notify(self.user.id, 'SYSTEM', 'Dropped', 'Welcome')
+                    raise ValueError
+            except ValueError:
+                pass
+            notify(self.user.id, 'SYSTEM', 'Kept', 'Welcome')
+        self.assertEqual(list(Notification.objects.values_list('title', flat=True)), ['Kept'])
+
+    def test_duplicates_are_coalesced(self, dispatch_delay):
+        for _ in range(2):
+            with self.captureOnCommitCallbacks(execute=True):
+                notify(self.user.id, 'ORDER', 'Order Confirmed', 'Confirmed', coalesce_key='order:1')
+                notify(self.user.id, 'ORDER', 'Order Confirmed', 'Confirmed', coalesce_key='order:1')
+        with self.captureOnCommitCallbacks(execute=True):
+            notify(self.user.id, 'ORDER', 'Order Confirmed', 'Confirmed', coalesce_key='order:2')
+        self.assertEqual(Notification.objects.count(), 2)
+
+
+class DispatchTests(TestCase):
+    def test_channels_follow_preferences(self):
+        users = [
+            User.objects.create_user(email=f'user{i}@example.com', username=f'user{i}', password='pass')
+            for i in range(3)
+        ]
+        NotificationSettings.objects.create(user=users[1], sms_order_updates=True)
+        NotificationSettings.objects.create(user=users[2], email_order_updates=False, push_enabled=False)
+        ids = [
+            Notification.objects.create(user=user, notification_type='ORDER', title='Order Confirmed', message='').id
+            for user in users
+        ]
+
+        with mock.patch('notifications.tasks.send_email_notifications.delay') as send_email:
+            with self.assertNumQueries(1):
+                result = dispatch_notifications(ids)
+
+        # SMS and push have no sender yet, so nothing is dispatched to them
+        self.assertEqual(result, {'email': 2})
+        send_email.assert_called_once_with(ids[:2])
+
+
+class FlakyEmailBackend(EmailBackend):
+    def send_messages(self, messages):
+        if any('bounce@example.com' in message.to for message in messages):
+            raise ConnectionError('Recipient refused')
+        return super().send_messages(messages)
+
+
+class EmailBatchTests(TestCase):
+    def setUp(self):
+        self.customer = User.objects.create_user(email='customer@example.com', username='customer', password='pass')
+        self.opted_out = User.objects.create_user(email='quiet@example.com', username='quiet', password='pass')
+        NotificationSettings.objects.create(user=self.opted_out, email_order_updates=False)
+
+    def notification(self, user, notification_type='ORDER', **kwargs):
+        return Notification.objects.create(
+            user=user, notification_type=notification_type, title='Order Confirmed', message='On its way', **kwargs
+        ).id
+
+    def test_one_connection_one_update(self):
+        ids = [
+            self.notification(self.customer),
+            self.notification(self.customer, 'SYSTEM'),
+            self.notification(self.opted_out),
+            self.notification(self.opted_out, 'SYSTEM'),
+            self.notification(self.customer, sent_email=True),
+        ]
+        with mock.patch('notifications.delivery.get_connection', wraps=mail.get_connection) as get_connection:
+            # SELECT with settings + UPDATE of sent_email
+            with self.assertNumQueries(2):
+                counts = send_email_batch(ids)
+        get_connection.assert_called_once()
+        self.assertEqual(counts, {'sent': 3, 'skipped': 1, 'failed': 0})
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].to, ['customer@example.com'])
+        self.assertEqual(
+            set(Notification.objects.filter(sent_email=True).values_list('id', flat=True)),
+            {ids[0], ids[1], ids[3], ids[4]},
+        )
+
+    def test_failed_recipient_stays_unsent(self):
+        bouncing = User.objects.create_user(email='bounce@example.com', username='bounce', password='pass')
+        ids = [self.notification(bouncing), self.notification(self.customer)]
+        counts = send_email_batch(ids, connection=FlakyEmailBackend())
+        self.assertEqual(counts, {'sent': 1, 'skipped': 0, 'failed': 1})
+        self.assertEqual(list(Notification.objects.filter(sent_email=True).values_list('id', flat=True)), [ids[1]])
+
+
+class BroadcastTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [User.objects.create_user(email=f'user{i}@example.com', username=f'user{i}') for i in range(5)]
+        # Push only, no promotions at all, promotions push with push disabled
+        NotificationSettings.objects.create(user=cls.users[1], email_promotions=False)
+        NotificationSettings.objects.create(user=cls.users[2], email_promotions=False, push_promotions=False)
+        NotificationSettings.objects.create(user=cls.users[3], email_promotions=False, push_enabled=False)
+        User.objects.create_user(email='inactive@example.com', username='inactive', is_active=False)
+        cls.eligible = [cls.users[0].id, cls.users[1].id, cls.users[4].id]
+
+    def setUp(self):
+        cache.clear()
+        dispatch = mock.patch('notifications.tasks.dispatch_notifications.delay')
+        self.dispatch = dispatch.start()
+        self.addCleanup(dispatch.stop)
+        self.broadcast = Broadcast.objects.create(title='Weekend deal', message='20% off', data={'code': 'WKND'})
+
+    def run_chunks(self, run_id, chunk_size=2):
+        with self.captureOnCommitCallbacks(execute=True):
+            return run_broadcast(self.broadcast.pk, run_id, chunk_size=chunk_size)
+
+    def recipients(self):
+        return list(Notification.objects.filter(notification_type='PROMOTION').order_by('user_id').values_list('user_id', flat=True))
+
+    def test_eligible_users(self):
+        self.assertEqual(list(eligible_user_ids()), self.eligible)
+        self.assertEqual(list(eligible_user_ids(after_id=self.users[1].id)), self.eligible[2:])
+
+    def test_run_notifies_every_eligible_user_in_chunks(self):
+        self.assertEqual(unread_count(self.users[0].id), 0)
+        broadcast = self.run_chunks(claim_broadcast(self.broadcast.pk))
+
+        self.assertEqual(broadcast.status, 'COMPLETED')
+        self.assertEqual(broadcast.recipients_count, 3)
+        self.assertEqual(broadcast.last_user_id, self.eligible[-1])
+        self.assertIsNotNone(broadcast.finished_at)
+        self.assertGreater(broadcast.throughput, 0)
+        self.assertEqual(self.recipients(), self.eligible)
+        notification = Notification.objects.get(user=self.users[0])
+        self.assertEqual(notification.data, {'code': 'WKND', 'broadcast_id': self.broadcast.pk})
+        # One dispatch per chunk, and the bulk insert dropped the stale counter
+        self.assertEqual(self.dispatch.call_count, 2)
+        self.assertEqual(unread_count(self.users[0].id), 1)
+
+    def test_pause_and_resume_from_checkpoint(self):
+        run_id = claim_broadcast(self.broadcast.pk)
+        # Paused while the first chunk is being written
+        pause = lambda user_ids: pause_broadcast(self.broadcast.pk)
+        with mock.patch('notifications.unread.forget_unread_counts', side_effect=pause):
+            broadcast = self.run_chunks(run_id)
+        self.assertEqual(broadcast.status, 'PAUSED')
+        self.assertEqual(broadcast.recipients_count, 2)
+        self.assertEqual(broadcast.last_user_id, self.eligible[1])
+        self.assertEqual(self.dispatch.call_count, 1)
+
+        broadcast = self.run_chunks(claim_broadcast(self.broadcast.pk))
+        self.assertEqual(broadcast.status, 'COMPLETED')
+        self.assertEqual(broadcast.recipients_count, 3)
+        self.assertEqual(self.recipients(), self.eligible)
+        self.assertIsNone(claim_broadcast(self.broadcast.pk))
+
+    def test_superseded_run_notifies_nobody(self):
+        stale = claim_broadcast(self.broadcast.pk)
+        current = claim_broadcast(self.broadcast.pk)
+        self.assertEqual(self.run_chunks(stale).recipients_count, 0)
+        self.assertEqual(self.recipients(), [])
+        self.run_chunks(current)
+        self.assertEqual(self.recipients(), self.eligible)
+
+    @mock.patch('notifications.tasks.send_promotion_broadcast.delay')
+    def test_start_enqueues_run_on_commit(self, delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            run_id = start_broadcast(self.broadcast.pk)
+        delay.assert_called_once_with(self.broadcast.pk, run_id)
+        self.broadcast.refresh_from_db()
+        self.assertEqual(self.broadcast.status, 'RUNNING')
+        self.assertIsNotNone(self.broadcast.started_at)
+
+
+@override_settings(NOTIFICATION_RETENTION_DAYS=30, NOTIFICATION_ARCHIVE_RETENTION_DAYS=0)
+class RetentionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='customer@example.com', username='customer')
+        self.old_read = [self.create(days=40 + i, is_read=True) for i in range(3)]
+        self.old_unread = self.create(days=40, is_read=False)
+        self.recent_read = self.create(days=5, is_read=True)
+
+    def create(self, days, is_read):
+        notification = Notification.objects.create(
+            user=self.user, notification_type='ORDER', title=f'{days} days', message='Delivered',
+            is_read=is_read, data={'order': days},
+        )
+        Notification.objects.filter(pk=notification.pk).update(created_at=timezone.now() - timedelta(days=days))
+        return notification.pk
+
+    def test_moves_old_read_notifications_to_archive_in_batches(self):
+        self.assertEqual(unread_count(self.user.id), 1)
+        self.assertEqual(archive_notifications(batch_size=2), 3)
+
+        remaining = set(Notification.objects.values_list('id', flat=True))
+        self.assertEqual(remaining, {self.old_unread, self.recent_read})
+        archived = NotificationArchive.objects.get(pk=self.old_read[0])
+        self.assertEqual((archived.user_id, archived.title, archived.data), (self.user.id, '40 days', {'order': 40}))
+        self.assertEqual(unread_count(self.user.id), 1)
+
+        self.client.force_authenticate(self.user)
+        response = self.client.get('/api/v1/notifications/archived/')
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual([item['id'] for item in response.data['results']], self.old_read)
+        self.assertEqual(self.client.get('/api/v1/notifications/').data['count'], 2)
+
+    def test_batches_per_run_are_bounded(self):
+        self.assertEqual(archive_notifications(batch_size=1, max_batches=2), 2)
+        self.assertEqual(archive_notifications(batch_size=1, max_batches=2), 1)
+
+    def test_rows_marked_unread_mid_batch_are_kept(self):
+        def mark_unread(first, last):
+            notification = Notification.objects.get(pk=self.old_read[0])
+            notification.is_read = False
+            notification.save()
+
+        with mock.patch('notifications.retention.ensure_archive_partitions', side_effect=mark_unread):
+            self.assertEqual(archive_notifications(), 2)
+        self.assertTrue(Notification.objects.filter(pk=self.old_read[0], is_read=False).exists())
+        self.assertEqual(unread_count(self.user.id), 2)
+
+    @override_settings(NOTIFICATION_ARCHIVE=False)
+    def test_deletes_without_archive(self):
+        self.assertEqual(archive_notifications(), 3)
+        self.assertFalse(NotificationArchive.objects.exists())
+
+    @override_settings(NOTIFICATION_ARCHIVE_RETENTION_DAYS=41)
+    def test_expires_old_archived_notifications(self):
+        archive_notifications()
+        expire_archive(batch_size=1)
+        self.assertEqual(list(NotificationArchive.objects.values_list('id', flat=True)), [self.old_read[0]])
+
+    def test_archive_months(self):
+        utc = dt_timezone.utc
+        months = archive_months(datetime(2025, 11, 30, 23, tzinfo=utc), datetime(2026, 1, 2, tzinfo=utc))
+        self.assertEqual([month.date().isoformat() for month in months], ['2025-11-01', '2025-12-01', '2026-01-01'])
@@ -0,0 +1,92 @@
+"""
+Unread notification counters for notifications app.
+
+Each user's unread count is kept in the cache (Redis in production) and
+adjusted with atomic incr/decr once a notification is created, read or
+deleted, so polling it never touches the database. A missing counter (first
+read, eviction, cache outage) falls back to a COUNT over the (user, is_read)
+index and is seeded again. Counters expire after
+NOTIFICATION_UNREAD_COUNT_TIMEOUT and reconcile_counters corrects the
+cached ones periodically, which bounds any drift from racing updates.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+
+def _counter_key(user_id):
+    return f'notifications:unread:{user_id}'
+
+
+def count_unread(user_id):
+    from notifications.models import Notification
+
+    return Notification.objects.filter(user_id=user_id, is_read=False).count()
+
+
+def unread_count(user_id):
+    """The user's unread notification count, from the counter when cached."""
+    count = cache.get(_counter_key(user_id))
+    if count is None:
+        count = count_unread(user_id)
+        # add() so an adjustment that landed meanwhile is not overwritten
+        cache.add(_counter_key(user_id), count, settings.NOTIFICATION_UNREAD_COUNT_TIMEOUT)
+    return count
+
+
+def _adjust(user_id, delta):
+    key = _counter_key(user_id)
+    try:
+        count = cache.incr(key, delta)
+    except ValueError:
+        # No counter yet; the next read seeds it from the database
+        return
+    if count is not None and count < 0:
+        cache.delete(key)
+
+
+def adjust_unread_count(user_id, delta):
+    """Add delta to the user's counter once the current transaction commits."""
+    if delta:
+        transaction.on_commit(lambda: _adjust(user_id, delta))
+
+
+def forget_unread_count(user_id):
+    """Drop the user's counter after a bulk change; the next read recounts."""
+    transaction.on_commit(lambda: cache.delete(_counter_key(user_id)))
+
+
+def forget_unread_counts(user_ids):
+    """forget_unread_count() for many users, in one cache round trip."""
+    keys = [_counter_key(user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def reconcile_counters(batch_size=1000):
+    """
+    Correct the cached counters of users with unread notifications that
+    drifted from the database, in one grouped count over the (user, is_read)
+    index. Counters of users left with none unread are only fixed by expiry.
+    Returns the number of counters corrected.
+    """
+    from notifications.models import Notification
+
+    unread = (
+        Notification.objects.filter(is_read=False)
+        .values_list('user_id')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    counts = dict(unread.iterator(chunk_size=batch_size))
+
+    corrected = 0
+    user_ids = list(counts)
+    for start in range(0, len(user_ids), batch_size):
+        keys = {_counter_key(user_id): user_id for user_id in user_ids[start:start + batch_size]}
+        cached = cache.get_many(list(keys))
+        stale = {key: counts[keys[key]] for key, value in cached.items() if value != counts[keys[key]]}
+        cache.set_many(stale, settings.NOTIFICATION_UNREAD_COUNT_TIMEOUT)
+        corrected += len(stale)
+    return corrected
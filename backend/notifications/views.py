@@ -1,19 +1,46 @@
 """Views for notifications app."""
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
-from rest_framework import viewsets
+from rest_framework import mixins, viewsets
 from rest_framework.decorators import action, api_view, permission_classes  # ← ДОБАВЬ
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from notifications.models import Notification, NotificationSettings
-from notifications.serializers.notification_serializers import NotificationSerializer, NotificationSettingsSerializer
+from core.conditional import ConditionalListMixin
+from core.pagination import TimelineCursorPagination
+from notifications.unread import forget_unread_count, unread_count
+from realtime.brokers import publish_on_commit
+from notifications.models import Notification, NotificationArchive, NotificationSettings
+from notifications.serializers.notification_serializers import (
+    NotificationArchiveSerializer, NotificationSerializer, NotificationSettingsSerializer
+)
 
 
-class NotificationViewSet(viewsets.ModelViewSet):
-    """API endpoint for notifications."""
+class NotificationViewSet(
+    ConditionalListMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.UpdateModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """API endpoint for notifications; they are created by the platform, not through the API."""
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TimelineCursorPagination
+    # Only is_read is writable (see NotificationSerializer), and marking a
+    # notification read sets read_at, so the timestamps catch inserts and
+    # reads; marking one unread again only shows in the unread aggregates and
+    # moves no timestamp, so only ETags are emitted
+    conditional_timestamp_fields = ('created_at', 'read_at')
+    conditional_last_modified = False
+    
+    def get_conditional_aggregates(self):
+        aggregates = super().get_conditional_aggregates()
+        aggregates['unread_count'] = Count('pk', filter=Q(is_read=False))
+        aggregates['unread_ids'] = Sum('pk', filter=Q(is_read=False))
+        return aggregates
     
     def get_queryset(self):
         return Notification.objects.filter(user=self.request.user)
@@ -24,7 +51,11 @@ class NotificationViewSet(viewsets.ModelViewSet):
         updated_count = Notification.objects.filter(
             user=request.user,
             is_read=False
-        ).update(is_read=True)
+        ).update(is_read=True, read_at=timezone.now())
+        # update() skips the signals that maintain the counter
+        forget_unread_count(request.user.id)
+        if updated_count:
+            publish_on_commit([request.user.id], 'notification_read', {'all': True})
 
         return Response({'success': True, 'marked_count': updated_count})
 
@@ -39,6 +70,16 @@ class NotificationViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(notification)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def archived(self, request):
+        """
+        Read notifications moved out of the hot table by the retention task
+        (see notifications.retention), newest first.
+        """
+        page = self.paginate_queryset(NotificationArchive.objects.filter(user=request.user))
+        serializer = NotificationArchiveSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
 
 class NotificationSettingsView(APIView):
     """API endpoint for notification settings."""
@@ -64,13 +105,9 @@ class NotificationSettingsView(APIView):
 def get_unread_count(request):
     """
     Get count of unread notifications for current user.
+    Served from the maintained counter (see notifications.unread).
     
     Returns:
         {"count": <number_of_unread_notifications>}
     """
-    count = Notification.objects.filter(
-        user=request.user,
-        is_read=False
-    ).count()
-    
-    return Response({'count': count})
\ No newline at end of file
+    return Response({'count': unread_count(request.user.id)})
\ No newline at end of file
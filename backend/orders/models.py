@@ -4,9 +4,10 @@ from django.core.exceptions import ValidationError
 from users.models import User, Address
 from restaurants.models import Restaurant
 from menu.models import MenuItem
+from core.tracking import TrackedFieldsMixin
 
 
-class Order(models.Model):
+class Order(TrackedFieldsMixin, models.Model):
     """Order model."""
     
     STATUS_CHOICES = [
@@ -31,6 +32,8 @@ class Order(models.Model):
         ('WALLET', 'Digital Wallet'),
     ]
     
+    tracked_fields = ('status',)
+    
     # Core fields
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='orders')
     restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE, related_name='orders')
@@ -71,6 +74,18 @@ class Order(models.Model):
     class Meta:
         db_table = 'orders'
         ordering = ['-created_at']
+        indexes = [
+            # (owner, created_at, id) keys serve the keyset-paginated order histories
+            models.Index(fields=['restaurant', '-created_at', '-id'], name='orders_restaurant_created_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='orders_user_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='orders_created_idx'),
+            # auto_cancel_unpaid_orders only scans unpaid pending orders
+            models.Index(
+                fields=['created_at'],
+                name='orders_unpaid_pending_idx',
+                condition=models.Q(status='PENDING', is_paid=False),
+            ),
+        ]
     
     def __str__(self):
         return f"Order {self.order_number} - {self.user.email}"
@@ -1,4 +1,5 @@
 """Serializers for orders app."""
+from django.db.models import Prefetch
 from rest_framework import serializers
 from orders.models import Order, OrderItem
 from promotions.models import Promotion
@@ -20,6 +21,15 @@ class OrderSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['order_number', 'user']
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load everything this serializer touches in a constant number of queries."""
+        return queryset.select_related(
+            'restaurant', 'user', 'delivery_address'
+        ).prefetch_related(
+            Prefetch('items', queryset=OrderItem.objects.select_related('menu_item'))
+        )
+
     def create(self, validated_data):
         promo_code = validated_data.pop('promo_code', None)
         if promo_code:
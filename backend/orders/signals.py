@@ -3,41 +3,39 @@ from django.dispatch import receiver
 from django.utils import timezone
 
 from .models import Order
+from analytics.rollups import record_order_created, record_order_status_change
 from payments.models import Payment
-from notifications.models import Notification
+from notifications.outbox import notify
+
+
+def notify_order(order, title, message):
+    """Queue an order notification; repeats for the same order are coalesced."""
+    notify(
+        order.user_id, 'ORDER', title, message,
+        data={'order_id': order.pk}, coalesce_key=f'order:{order.pk}',
+    )
 
 
 @receiver(post_save, sender=Order)
 def create_order_notification(sender, instance, created, **kwargs):
     """Create notification when order is created or updated."""
     if created:
-        Notification.objects.create(
-            user=instance.user,
-            notification_type='ORDER',
-            title='Order Placed Successfully',
-            message=f'Your order #{instance.order_number} has been placed at {instance.restaurant.name}. Total: ${instance.total}',
+        notify_order(
+            instance, 'Order Placed Successfully',
+            f'Your order #{instance.order_number} has been placed at {instance.restaurant.name}. Total: ${instance.total}',
         )
-    else:
+    elif instance.has_field_changed('status'):
         if instance.status == 'CONFIRMED':
-            Notification.objects.create(
-                user=instance.user,
-                notification_type='ORDER',
-                title='Order Confirmed',
-                message=f'Your order #{instance.order_number} has been confirmed by {instance.restaurant.name}.',
+            notify_order(
+                instance, 'Order Confirmed',
+                f'Your order #{instance.order_number} has been confirmed by {instance.restaurant.name}.',
             )
         elif instance.status == 'OUT_FOR_DELIVERY':
-            Notification.objects.create(
-                user=instance.user,
-                notification_type='ORDER',
-                title='Order Out for Delivery',
-                message=f'Your order #{instance.order_number} is on its way!',
-            )
+            notify_order(instance, 'Order Out for Delivery', f'Your order #{instance.order_number} is on its way!')
         elif instance.status == 'DELIVERED':
-            Notification.objects.create(
-                user=instance.user,
-                notification_type='ORDER',
-                title='Order Delivered',
-                message=f'Your order #{instance.order_number} has been delivered. Enjoy your meal!',
+            notify_order(
+                instance, 'Order Delivered',
+                f'Your order #{instance.order_number} has been delivered. Enjoy your meal!',
             )
 
 
@@ -47,49 +45,53 @@ def auto_confirm_cash_payment_on_delivery(sender, instance, **kwargs):
     Автоматически подтверждает оплату наличными
     когда статус заказа меняется на DELIVERED
     """
-    # Проверяем что это не новый объект
-    if instance.pk:
-        try:
-            # Получаем старый объект из БД
-            old_order = Order.objects.get(pk=instance.pk)
+    # Статус, загруженный из БД (None для нового заказа)
+    previous_status = instance.get_previous_value('status')
+    if previous_status is None:
+        return
+    
+    # Проверяем что статус изменился на DELIVERED
+    if previous_status != 'DELIVERED' and instance.status == 'DELIVERED':
+        
+        # Проверяем что заказ ещё не оплачен
+        if not instance.is_paid:
             
-            # Проверяем что статус изменился на DELIVERED
-            if old_order.status != 'DELIVERED' and instance.status == 'DELIVERED':
+            # Ищем платёж наличными
+            try:
+                payment = Payment.objects.get(
+                    order=instance,
+                    payment_method='CASH',
+                    status='PENDING'
+                )
+                
+                # Подтверждаем оплату
+                payment.status = 'SUCCEEDED'
+                payment.paid_at = timezone.now()
+                payment.save()
+                
+                # Отмечаем заказ как оплаченный
+                instance.is_paid = True
+                instance.delivered_at = timezone.now()
+                
+                # Отправляем уведомление клиенту
+                notify_order(
+                    instance, 'Заказ доставлен',
+                    f'Ваш заказ {instance.order_number} успешно доставлен и оплачен. Приятного аппетита!',
+                )
                 
-                # Проверяем что заказ ещё не оплачен
-                if not instance.is_paid:
-                    
-                    # Ищем платёж наличными
-                    try:
-                        payment = Payment.objects.get(
-                            order=instance,
-                            payment_method='CASH',
-                            status='PENDING'
-                        )
-                        
-                        # Подтверждаем оплату
-                        payment.status = 'SUCCEEDED'
-                        payment.paid_at = timezone.now()
-                        payment.save()
-                        
-                        # Отмечаем заказ как оплаченный
-                        instance.is_paid = True
-                        instance.delivered_at = timezone.now()
-                        
-                        # Отправляем уведомление клиенту
-                        Notification.objects.create(
-                            user=instance.user,
-                            title='Заказ доставлен',
-                            message=f'Ваш заказ {instance.order_number} успешно доставлен и оплачен. Приятного аппетита!',
-                            is_read=False
-                        )
-                        
-                        print(f"✅ Автоподтверждение оплаты наличными для заказа {instance.order_number}")
-                        
-                    except Payment.DoesNotExist:
-                        # Если платёж не наличными или уже подтверждён - ничего не делаем
-                        pass
-                        
-        except Order.DoesNotExist:
-            # Новый заказ, ничего не делаем
-            pass
\ No newline at end of file
+                print(f"✅ Автоподтверждение оплаты наличными для заказа {instance.order_number}")
+                
+            except Payment.DoesNotExist:
+                # Если платёж не наличными или уже подтверждён - ничего не делаем
+                pass
+
+
+@receiver(post_save, sender=Order)
+def update_sales_rollups(sender, instance, created, **kwargs):
+    """Keep today's DailySalesReport counters current."""
+    if created:
+        record_order_created(instance)
+    else:
+        previous_status = instance.get_previous_value('status')
+        if previous_status != instance.status:
+            record_order_status_change(instance, previous_status)
@@ -2,6 +2,7 @@
 Celery tasks for orders app.
 """
 from celery import shared_task
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 
@@ -51,30 +52,83 @@ def notify_restaurant_new_order(order_id):
         return f"Order {order_id} not found"
 
 
+AUTO_CANCEL_BATCH_SIZE = 1000
+
+
 @shared_task
 def auto_cancel_unpaid_orders():
     """
     Auto-cancel unpaid orders after 30 minutes.
     Runs every 15 minutes via Celery Beat.
+
+    Stale orders are cancelled in batches: each batch is locked, cancelled
+    with one UPDATE and gets its notifications with one bulk insert inside
+    a single transaction. The customers' notifications go out through the
+    notification outbox, which emails each committed batch together.
     """
     from orders.models import Order
+    from restaurants.models import Restaurant
+    from notifications.outbox import notify
+    from realtime.brokers import publish_on_commit
+    from analytics.rollups import record_orders_cancelled
+    from developers.webhooks import queue_webhook_events
     
     cutoff_time = timezone.now() - timedelta(minutes=30)
-    unpaid_orders = Order.objects.filter(
-        status='PENDING',
-        is_paid=False,
-        created_at__lt=cutoff_time
-    )
+    cancelled_ids = []
     
-    count = 0
-    for order in unpaid_orders:
-        order.status = 'CANCELLED'
-        order.cancellation_reason = 'Automatically cancelled due to non-payment'
-        order.cancelled_at = timezone.now()
-        order.save()
-        count += 1
+    while True:
+        with transaction.atomic():
+            # skip_locked: orders being paid right now are left for the next run
+            batch = list(
+                Order.objects.select_for_update(skip_locked=True)
+                .filter(status='PENDING', is_paid=False, created_at__lt=cutoff_time)
+                .order_by('id')
+                .values('id', 'user_id', 'restaurant_id', 'order_number', 'total', 'created_at')[:AUTO_CANCEL_BATCH_SIZE]
+            )
+            if not batch:
+                break
+            
+            now = timezone.now()
+            Order.objects.filter(id__in=[order['id'] for order in batch]).update(
+                status='CANCELLED',
+                cancellation_reason='Automatically cancelled due to non-payment',
+                cancelled_at=now,
+                updated_at=now,
+            )
+            
+            # Order signals are bypassed by update(), so do their work here;
+            # the batch's notifications are bulk-created when it commits
+            owners = dict(
+                Restaurant.objects.filter(id__in={order['restaurant_id'] for order in batch})
+                .values_list('id', 'owner_id')
+            )
+            for order in batch:
+                notify(
+                    order['user_id'], 'ORDER', 'Order Cancelled',
+                    f'Your order #{order["order_number"]} has been automatically cancelled due to non-payment.',
+                    data={'order_id': order['id']},
+                )
+                publish_on_commit([order['user_id'], owners.get(order['restaurant_id'])], 'order_status', {
+                    'id': order['id'],
+                    'restaurant': order['restaurant_id'],
+                    'status': 'CANCELLED',
+                    'previous_status': 'PENDING',
+                    'order_number': order['order_number'],
+                })
+            queue_webhook_events(
+                (order['restaurant_id'], 'ORDER_UPDATED', {
+                    'id': order['id'],
+                    'order_number': order['order_number'],
+                    'restaurant': order['restaurant_id'],
+                    'status': 'CANCELLED',
+                    'previous_status': 'PENDING',
+                    'total': order['total'],
+                    'is_paid': False,
+                })
+                for order in batch
+            )
+            record_orders_cancelled(batch)
         
-        # Send notification to customer
-        send_order_status_update.delay(order.id)
+        cancelled_ids.extend(order['id'] for order in batch)
     
-    return f"Auto-cancelled {count} unpaid orders"
+    return f"Auto-cancelled {len(cancelled_ids)} unpaid orders"
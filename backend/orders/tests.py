@@ -1,3 +1,138 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
+from django.db.models import Sum
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from analytics.models import DailySalesReport
+from menu.models import MenuCategory, MenuItem
+from notifications.models import Notification
+from orders.models import Order, OrderItem
+from orders.tasks import auto_cancel_unpaid_orders
+from restaurants.tests import create_restaurant
+from users.models import User
+
+
+class OrderListQueryCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = User.objects.create_user(
+            email='owner@example.com', username='owner', password='pass', role='RESTAURANT_OWNER'
+        )
+        self.customer = User.objects.create_user(
+            email='customer@example.com', username='customer', password='pass'
+        )
+        self.restaurant = create_restaurant(self.owner)
+        category = MenuCategory.objects.create(restaurant=self.restaurant, name='Mains')
+        self.menu_items = [
+            MenuItem.objects.create(
+                restaurant=self.restaurant, category=category, name=f'Dish {i}',
+                description='Tasty', price=Decimal('10.00'),
+            )
+            for i in range(3)
+        ]
+
+    def create_orders(self, count):
+        for _ in range(count):
+            order = Order.objects.create(
+                user=self.customer, restaurant=self.restaurant,
+                subtotal=Decimal('30.00'), total=Decimal('30.00'),
+            )
+            for menu_item in self.menu_items:
+                OrderItem.objects.create(order=order, menu_item=menu_item, quantity=1, unit_price=menu_item.price)
+
+    def count_list_queries(self, user):
+        self.client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/orders/')
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response
+
+    def test_customer_list_query_count_is_constant(self):
+        self.create_orders(1)
+        few_queries, _ = self.count_list_queries(self.customer)
+        self.create_orders(9)
+        many_queries, response = self.count_list_queries(self.customer)
+        self.assertEqual(response.data['count'], 10)
+        self.assertEqual(len(response.data['results'][0]['items']), 3)
+        self.assertEqual(few_queries, many_queries)
+
+    def test_owner_list_query_count_is_constant(self):
+        self.create_orders(1)
+        few_queries, _ = self.count_list_queries(self.owner)
+        self.create_orders(9)
+        many_queries, _ = self.count_list_queries(self.owner)
+        self.assertEqual(few_queries, many_queries)
+
+    def test_cursor_pages_walk_history(self):
+        self.create_orders(25)
+        self.client.force_authenticate(self.customer)
+        response = self.client.get('/api/v1/orders/', {'page_size': 10})
+        seen = [row['id'] for row in response.data['results']]
+        self.assertEqual(response.data['count'], 25)
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            seen += [row['id'] for row in response.data['results']]
+        self.assertEqual(seen, list(Order.objects.order_by('-created_at', '-id').values_list('id', flat=True)))
+
+    def test_count_opt_out(self):
+        self.create_orders(2)
+        self.client.force_authenticate(self.customer)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/orders/', {'count': 'false'})
+        self.assertNotIn('count', response.data)
+        self.assertFalse(any('COUNT(' in query['sql'] for query in context.captured_queries))
+
+
+class AutoCancelUnpaidOrdersTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user(
+            email='owner@example.com', username='owner', password='pass', role='RESTAURANT_OWNER'
+        )
+        self.customer = User.objects.create_user(
+            email='customer@example.com', username='customer', password='pass'
+        )
+        self.restaurant = create_restaurant(owner)
+
+    def create_order(self, age_minutes, **kwargs):
+        order = Order.objects.create(
+            user=self.customer, restaurant=self.restaurant,
+            subtotal=Decimal('10.00'), total=Decimal('10.00'), **kwargs
+        )
+        Order.objects.filter(pk=order.pk).update(created_at=timezone.now() - timedelta(minutes=age_minutes))
+        return order
+
+    @mock.patch('notifications.tasks.dispatch_notifications.delay')
+    def test_cancels_stale_unpaid_orders_in_bulk(self, dispatch_delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            stale = [self.create_order(45) for _ in range(5)]
+            paid = self.create_order(45, is_paid=True)
+            fresh = self.create_order(5)
+        Notification.objects.all().delete()
+
+        with CaptureQueriesContext(connection) as context, self.captureOnCommitCallbacks(execute=True):
+            result = auto_cancel_unpaid_orders()
+
+        self.assertEqual(result, 'Auto-cancelled 5 unpaid orders')
+        self.assertEqual(
+            set(Order.objects.filter(status='CANCELLED').values_list('id', flat=True)),
+            {order.id for order in stale},
+        )
+        self.assertEqual(Order.objects.get(pk=paid.pk).status, 'PENDING')
+        self.assertEqual(Order.objects.get(pk=fresh.pk).status, 'PENDING')
+        self.assertEqual(Notification.objects.filter(title='Order Cancelled').count(), 5)
+        # One batch of notifications, dispatched together
+        self.assertEqual(len(dispatch_delay.call_args.args[0]), 5)
+        self.assertLess(len(context.captured_queries), 15)
+
+        cancelled = DailySalesReport.objects.filter(restaurant=self.restaurant).aggregate(Sum('cancelled_orders'))
+        self.assertEqual(cancelled['cancelled_orders__sum'], 5)
 
-# Create your tests here.
+    def test_nothing_to_cancel(self):
+        self.create_order(5)
+        self.assertEqual(auto_cancel_unpaid_orders(), 'Auto-cancelled 0 unpaid orders')
@@ -3,6 +3,7 @@ from decimal import Decimal
 from rest_framework import viewsets
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from core.pagination import TimelineCursorPagination
 from orders.models import Order
 from orders.serializers.order_serializers import OrderSerializer
 from promotions.models import Promotion
@@ -13,6 +14,7 @@ class OrderViewSet(viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TimelineCursorPagination
     
     def get_queryset(self):
         user = self.request.user
@@ -20,12 +22,14 @@ class OrderViewSet(viewsets.ModelViewSet):
             return Order.objects.none()
         
         if user.role == 'CUSTOMER':
-            return Order.objects.filter(user=user)
+            queryset = Order.objects.filter(user=user)
         elif user.role == 'RESTAURANT_OWNER':
-            return Order.objects.filter(restaurant__owner=user)
+            queryset = Order.objects.filter(restaurant__owner=user)
         elif user.role == 'ADMIN':
-            return Order.objects.all()
-        return Order.objects.none()
+            queryset = Order.objects.all()
+        else:
+            return Order.objects.none()
+        return OrderSerializer.setup_eager_loading(queryset)
 
     def perform_create(self, serializer):
         validated_data = serializer.validated_data
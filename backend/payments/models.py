@@ -2,11 +2,14 @@ from django.db import models
 from django.core.validators import MinValueValidator
 from users.models import User
 from orders.models import Order
+from core.tracking import TrackedFieldsMixin
 
 
-class Payment(models.Model):
+class Payment(TrackedFieldsMixin, models.Model):
     """Payment model for tracking transactions."""
     
+    tracked_fields = ('status',)
+    
     STATUS_CHOICES = [
         ('PENDING', 'Pending'),
         ('PROCESSING', 'Processing'),
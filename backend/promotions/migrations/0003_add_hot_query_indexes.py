@@ -0,0 +1,18 @@
+# Generated by Django 5.1.14 on 2026-10-18 19:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('promotions', '0002_initial'),
+        ('restaurants', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='promotion',
+            index=models.Index(fields=['is_active', 'start_date', 'end_date'], name='promotions_active_window_idx'),
+        ),
+    ]
@@ -74,6 +74,9 @@ class Promotion(models.Model):
     class Meta:
         db_table = 'promotions'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_active', 'start_date', 'end_date'], name='promotions_active_window_idx'),
+        ]
     
     def __str__(self):
         return f"{self.code} - {self.name}"
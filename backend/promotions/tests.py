@@ -1,3 +1,35 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from promotions.models import Promotion
+
+
+class PromotionConditionalListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        now = timezone.now()
+        self.promotion = Promotion.objects.create(
+            code='SPRING', name='Spring', description='10% off', promotion_type='PERCENTAGE',
+            discount_percentage=10, start_date=now - timedelta(days=1), end_date=now + timedelta(days=1),
+        )
+        # Last-Modified has one-second resolution
+        Promotion.objects.filter(pk=self.promotion.pk).update(updated_at=now - timedelta(hours=1))
+        self.promotion.refresh_from_db()
+
+    def test_if_modified_since(self):
+        response = self.client.get('/api/v1/promotions/')
+        last_modified = response['Last-Modified']
+        self.assertEqual(last_modified, http_date(int(self.promotion.updated_at.timestamp())))
+
+        response = self.client.get('/api/v1/promotions/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
 
-# Create your tests here.
+        # Expiry changes is_valid, so it counts as a modification
+        Promotion.objects.filter(pk=self.promotion.pk).update(end_date=timezone.now() - timedelta(seconds=1))
+        response = self.client.get('/api/v1/promotions/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data['results'][0]['is_valid'])
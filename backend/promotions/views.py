@@ -3,17 +3,28 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
+from django.db.models import Max, Q
 from django.utils import timezone
+from core.conditional import ConditionalListMixin
 from promotions.models import Promotion
 from promotions.serializers.promotion_serializers import PromotionSerializer
 
 
-class PromotionViewSet(viewsets.ModelViewSet):
+class PromotionViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     """API endpoint for promotions."""
     queryset = Promotion.objects.all()
     serializer_class = PromotionSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
+    def get_conditional_aggregates(self):
+        # is_valid flips when a promotion starts or ends, so the latest
+        # start/end already passed count as modification times too
+        now = timezone.now()
+        aggregates = super().get_conditional_aggregates()
+        aggregates['latest_start'] = Max('start_date', filter=Q(start_date__lte=now))
+        aggregates['latest_end'] = Max('end_date', filter=Q(end_date__lt=now))
+        return aggregates
+
     @action(detail=False, methods=['post'])
     def validate(self, request):
         """Validate a promo code."""
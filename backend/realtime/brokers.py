@@ -0,0 +1,148 @@
+"""
+Pub/sub backplanes for realtime app.
+
+Events are published from synchronous code (signals, Celery tasks) and read
+by the asynchronous event streams. InProcessBroker only reaches streams of
+the same process, which is enough for development and tests; RedisBroker
+fans out across web workers and from Celery workers. The broker in use is
+settings.REALTIME_BROKER, so tests and local setups can swap in a stand-in.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class InProcessBroker:
+    """Per-process fan-out to the asyncio queues of local subscribers."""
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _deliver(queue, message):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Slow consumer; it resyncs through the REST endpoints
+            pass
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, message)
+            except RuntimeError:
+                # Loop already closed; its stream is gone
+                pass
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers[channel].add(subscriber)
+        try:
+            yield Subscription(self._receive(queue))
+        finally:
+            with self._lock:
+                self._subscribers[channel].discard(subscriber)
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+    @staticmethod
+    def _receive(queue):
+        async def receive(timeout):
+            try:
+                return await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return receive
+
+
+class RedisBroker:
+    """Redis PUBLISH/SUBSCRIBE; channels are shared by every process."""
+
+    def __init__(self, url=None, prefix='realtime:'):
+        self.url = url or settings.REALTIME_REDIS_URL
+        self.prefix = prefix
+        self._client = None
+
+    def publish(self, channel, message):
+        import redis
+
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.url)
+        try:
+            self._client.publish(self.prefix + channel, message)
+        except redis.RedisError as exc:
+            # Streams are best effort; clients resync through the REST endpoints
+            logger.warning('Realtime publish to %s failed: %s', channel, exc)
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self.prefix + channel)
+        try:
+            yield Subscription(self._receive(pubsub))
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+    @staticmethod
+    def _receive(pubsub):
+        async def receive(timeout):
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+            if message is None:
+                return None
+            return message['data'].decode()
+        return receive
+
+
+class Subscription:
+    """Messages of one subscribed channel; get() returns None on timeout."""
+
+    def __init__(self, receive):
+        self._receive = receive
+
+    async def get(self, timeout):
+        return await self._receive(timeout)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(settings.REALTIME_BROKER)()
+
+
+def user_channel(user_id):
+    return f'user:{user_id}'
+
+
+def publish(user_ids, event, data):
+    """Send an event to the streams of every user in user_ids."""
+    message = json.dumps({'event': event, 'data': data}, cls=DjangoJSONEncoder)
+    broker = get_broker()
+    for user_id in set(user_ids):
+        if user_id is not None:
+            broker.publish(user_channel(user_id), message)
+
+
+def publish_on_commit(user_ids, event, data):
+    """publish() once the current transaction commits."""
+    transaction.on_commit(lambda: publish(user_ids, event, data))
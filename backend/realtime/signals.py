@@ -0,0 +1,61 @@
+"""
+Signals for realtime app.
+
+Publish new notifications and order/reservation status changes to the
+event streams of the users concerned, once the change is committed.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from notifications.models import Notification
+from notifications.serializers.notification_serializers import NotificationSerializer
+from orders.models import Order
+from realtime.brokers import publish_on_commit
+from reservations.models import Reservation
+from restaurants.models import Restaurant
+
+
+@receiver(post_save, sender=Notification)
+def push_notification(sender, instance, created, **kwargs):
+    if created:
+        publish_on_commit([instance.user_id], 'notification', NotificationSerializer(instance).data)
+    elif instance.is_read and instance.has_field_changed('is_read'):
+        publish_on_commit([instance.user_id], 'notification_read', {'ids': [instance.pk]})
+
+
+def _status_change(instance, created, **fields):
+    """Event data of a created object or a status transition, None otherwise."""
+    previous_status = None if created else instance.get_previous_value('status')
+    if not created and previous_status == instance.status:
+        return None
+    return {
+        'id': instance.pk,
+        'restaurant': instance.restaurant_id,
+        'status': instance.status,
+        'previous_status': previous_status,
+        **fields,
+    }
+
+
+def _owner_id(instance):
+    """Owner of the instance's restaurant, without loading the restaurant."""
+    if instance._meta.get_field('restaurant').is_cached(instance):
+        return instance.restaurant.owner_id
+    return Restaurant.objects.filter(pk=instance.restaurant_id).values_list('owner_id', flat=True).first()
+
+
+@receiver(post_save, sender=Order)
+def push_order_status(sender, instance, created, **kwargs):
+    """The customer and the restaurant owner both follow an order's status."""
+    data = _status_change(instance, created, order_number=instance.order_number)
+    if data:
+        publish_on_commit([instance.user_id, _owner_id(instance)], 'order_status', data)
+
+
+@receiver(post_save, sender=Reservation)
+def push_reservation_status(sender, instance, created, **kwargs):
+    data = _status_change(
+        instance, created,
+        reservation_date=instance.reservation_date, reservation_time=instance.reservation_time,
+    )
+    if data:
+        publish_on_commit([instance.user_id, _owner_id(instance)], 'reservation_status', data)
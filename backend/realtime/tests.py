@@ -0,0 +1,134 @@
+import asyncio
+import json
+import threading
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from orders.models import Order
+from realtime.brokers import InProcessBroker, get_broker, publish
+from realtime.tickets import issue_ticket, redeem_ticket
+from restaurants.tests import create_restaurant
+from users.models import User
+
+
+class InProcessBrokerTests(TestCase):
+    def test_publish_from_another_thread(self):
+        broker = InProcessBroker()
+
+        async def receive():
+            async with broker.subscribe('user:1') as subscription:
+                self.assertIsNone(await subscription.get(timeout=0.01))
+                thread = threading.Thread(target=broker.publish, args=('user:1', 'hello'))
+                thread.start()
+                thread.join()
+                return await subscription.get(timeout=1)
+
+        self.assertEqual(asyncio.run(receive()), 'hello')
+        self.assertEqual(broker._subscribers, {})
+
+
+@mock.patch('notifications.tasks.dispatch_notifications.delay', mock.Mock())
+class StatusEventTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(
+            email='owner@example.com', username='owner', password='pass', role='RESTAURANT_OWNER'
+        )
+        self.customer = User.objects.create_user(email='customer@example.com', username='customer', password='pass')
+        self.restaurant = create_restaurant(self.owner)
+
+    def events(self, action):
+        with mock.patch('realtime.brokers.publish') as publish_mock:
+            with self.captureOnCommitCallbacks(execute=True):
+                action()
+        return [(sorted(call.args[0]), call.args[1], call.args[2]) for call in publish_mock.call_args_list]
+
+    def test_order_events_reach_customer_and_owner(self):
+        order = Order(user=self.customer, restaurant=self.restaurant, subtotal=Decimal('10'), total=Decimal('10'))
+        events = self.events(order.save)
+        both = sorted([self.customer.id, self.owner.id])
+        self.assertIn((both, 'order_status', {
+            'id': order.id, 'restaurant': self.restaurant.id, 'status': 'PENDING',
+            'previous_status': None, 'order_number': order.order_number,
+        }), events)
+        self.assertIn('notification', [event for _, event, _ in events])
+
+        order.status = 'CONFIRMED'
+        status_events = [data for users, event, data in self.events(order.save) if event == 'order_status']
+        self.assertEqual(len(status_events), 1)
+        self.assertEqual(status_events[0]['previous_status'], 'PENDING')
+
+        # Saves that keep the status publish no status event
+        order.delivery_instructions = 'Ring twice'
+        self.assertNotIn('order_status', [event for _, event, _ in self.events(order.save)])
+
+        # Without the restaurant loaded, its owner is still notified
+        order = Order.objects.get(pk=order.pk)
+        order.status = 'OUT_FOR_DELIVERY'
+        [users] = [users for users, event, _ in self.events(order.save) if event == 'order_status']
+        self.assertEqual(users, both)
+
+
+class EventStreamTests(TestCase):
+    def setUp(self):
+        get_broker.cache_clear()
+        self.user = User.objects.create_user(email='customer@example.com', username='customer', password='pass')
+        self.url = '/api/v1/realtime/stream/'
+
+    def tearDown(self):
+        get_broker.cache_clear()
+
+    async def test_stream_delivers_published_events(self):
+        response = await self.async_client.get(self.url, {'ticket': issue_ticket(self.user.id)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        chunks = asyncio.Queue()
+
+        async def consume():
+            async for chunk in response.streaming_content:
+                await chunks.put(chunk)
+
+        consumer = asyncio.create_task(consume())
+        self.assertEqual(await asyncio.wait_for(chunks.get(), 1), b'retry: 5000\n\n')
+        publish([self.user.id], 'notification', {'title': 'Hi'})
+        chunk = await asyncio.wait_for(chunks.get(), 1)
+        self.assertEqual(json.loads(chunk.decode().removeprefix('data: ')), {'event': 'notification', 'data': {'title': 'Hi'}})
+
+        # A client disconnect cancels the stream, which unsubscribes
+        consumer.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await consumer
+        self.assertEqual(get_broker()._subscribers, {})
+
+    async def test_header_token_opens_the_stream(self):
+        token = str(AccessToken.for_user(self.user))
+        response = await self.async_client.get(self.url, headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200)
+        await response.streaming_content.aclose()
+
+    async def test_requires_ticket_or_header(self):
+        response = await self.async_client.get(self.url, {'ticket': 'invalid'})
+        self.assertEqual(response.status_code, 401)
+        # Access tokens are not accepted in the URL, where they would be logged
+        response = await self.async_client.get(self.url, {'token': str(AccessToken.for_user(self.user))})
+        self.assertEqual(response.status_code, 401)
+
+    def test_tickets_are_single_use(self):
+        client = APIClient()
+        self.assertEqual(client.post('/api/v1/realtime/ticket/').status_code, 401)
+        client.force_authenticate(self.user)
+        response = client.post('/api/v1/realtime/ticket/')
+        self.assertEqual(response.data['expires_in'], 30)
+        ticket = response.data['ticket']
+        self.assertEqual(async_to_sync(redeem_ticket)(ticket), self.user.id)
+        self.assertIsNone(async_to_sync(redeem_ticket)(ticket))
+
+    def test_wsgi_is_refused(self):
+        self.assertEqual(self.client.get(self.url).status_code, 501)
@@ -0,0 +1,33 @@
+"""
+Stream tickets for realtime app.
+
+EventSource cannot send an Authorization header, and a JWT access token in
+the stream URL would end up in proxy and server access logs. Browsers
+instead exchange their access token for a ticket: a random string, valid
+for REALTIME_TICKET_SECONDS, that opens one event stream and is then
+spent.
+"""
+import secrets
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def _ticket_key(ticket):
+    return f'realtime:ticket:{ticket}'
+
+
+def issue_ticket(user_id):
+    ticket = secrets.token_urlsafe(32)
+    cache.set(_ticket_key(ticket), user_id, settings.REALTIME_TICKET_SECONDS)
+    return ticket
+
+
+async def redeem_ticket(ticket):
+    """Id of the user a ticket was issued to, None if it is unknown, expired or spent."""
+    key = _ticket_key(ticket)
+    user_id = await cache.aget(key)
+    # Only the request that deletes the ticket gets to use it
+    if user_id is None or not await cache.adelete(key):
+        return None
+    return user_id
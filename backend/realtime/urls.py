@@ -0,0 +1,8 @@
+"""URLs for realtime app."""
+from django.urls import path
+from realtime import views
+
+urlpatterns = [
+    path('stream/', views.event_stream, name='realtime-stream'),
+    path('ticket/', views.StreamTicketView.as_view(), name='realtime-ticket'),
+]
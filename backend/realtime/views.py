@@ -0,0 +1,80 @@
+"""Views for realtime app."""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from realtime.brokers import get_broker, user_channel
+from realtime.tickets import issue_ticket, redeem_ticket
+from users.models import User
+
+
+async def _authenticate(request):
+    """
+    User of the request's JWT access token or, for EventSource, which cannot
+    send headers, of its ?ticket= (see realtime.tickets).
+    """
+    authenticator = JWTAuthentication()
+    header = authenticator.get_header(request)
+    if header is None:
+        ticket = request.GET.get('ticket')
+        user_id = ticket and await redeem_ticket(ticket)
+        if not user_id:
+            return None
+        return await User.objects.filter(pk=user_id, is_active=True).afirst()
+    raw_token = authenticator.get_raw_token(header)
+    if not raw_token:
+        return None
+    try:
+        validated_token = authenticator.get_validated_token(raw_token)
+        return await sync_to_async(authenticator.get_user)(validated_token)
+    except AuthenticationFailed:
+        return None
+
+
+class StreamTicketView(APIView):
+    """A single-use ticket for opening the event stream from a browser."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        return Response({
+            'ticket': issue_ticket(request.user.pk),
+            'expires_in': settings.REALTIME_TICKET_SECONDS,
+        })
+
+
+async def _events(user_id):
+    async with get_broker().subscribe(user_channel(user_id)) as subscription:
+        yield 'retry: 5000\n\n'
+        while True:
+            message = await subscription.get(timeout=settings.REALTIME_HEARTBEAT_SECONDS)
+            if message is None:
+                # Keeps proxies from closing an idle connection
+                yield ': keep-alive\n\n'
+            else:
+                yield f'data: {message}\n\n'
+
+
+@require_GET
+async def event_stream(request):
+    """
+    Server-sent events of the current user: new notifications, notifications
+    read elsewhere and status changes of their orders and reservations (as
+    customer or restaurant owner). Each event is a JSON {"event", "data"}.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'detail': 'Event streams are served by the ASGI application (config.asgi).'}, status=501)
+    user = await _authenticate(request)
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+
+    response = StreamingHttpResponse(_events(user.pk), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
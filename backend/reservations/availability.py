@@ -0,0 +1,215 @@
+"""
+Table availability engine for reservations.
+
+A reservation occupies its table for ``RESERVATION_DURATION_MINUTES`` from its
+start time, so two reservations on the same table conflict when their start
+times are less than one duration apart. Conflicts are only considered within
+the same calendar day.
+"""
+import math
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
+
+from core.cache import bump_cache_version, make_cache_key
+from reservations.models import Reservation
+from restaurants.models import Table
+
+
+def get_reservation_duration(minutes=None):
+    """Return the table occupancy duration as a timedelta."""
+    if minutes is None:
+        minutes = settings.RESERVATION_DURATION_MINUTES
+    return timedelta(minutes=minutes)
+
+
+def build_time_slots(start_time, end_time, interval_minutes):
+    """Return the slot start times from start_time to end_time inclusive."""
+    slots = []
+    moment = datetime.combine(datetime.min.date(), start_time)
+    last = datetime.combine(datetime.min.date(), end_time)
+    step = timedelta(minutes=interval_minutes)
+    while moment <= last:
+        slots.append(moment.time())
+        moment += step
+    return slots
+
+
+def overlapping_reservations(reservation_date, reservation_time, duration):
+    """
+    Active reservations on the date whose occupancy overlaps a booking
+    starting at reservation_time.
+    """
+    moment = datetime.combine(reservation_date, reservation_time)
+    earliest = moment - duration
+    latest = moment + duration
+
+    lookups = {
+        'reservation_date': reservation_date,
+        'status__in': Reservation.ACTIVE_STATUSES,
+    }
+    # Window bounds are exclusive; when the window spills past midnight
+    # the whole start/end of the day is covered instead.
+    if earliest.date() < reservation_date:
+        lookups['reservation_time__gte'] = time.min
+    else:
+        lookups['reservation_time__gt'] = earliest.time()
+    if latest.date() > reservation_date:
+        lookups['reservation_time__lte'] = time.max
+    else:
+        lookups['reservation_time__lt'] = latest.time()
+
+    return Reservation.objects.filter(**lookups)
+
+
+def candidate_tables(restaurant, guests):
+    """Bookable tables of a restaurant that seat at least `guests`."""
+    return Table.objects.filter(
+        restaurant=restaurant,
+        capacity__gte=guests,
+        is_available=True,
+    ).order_by('table_number')
+
+
+def get_available_tables(restaurant, reservation_date, reservation_time, guests, duration=None):
+    """Tables free for a booking at the given time, in a single query."""
+    if duration is None:
+        duration = get_reservation_duration()
+    conflicts = overlapping_reservations(reservation_date, reservation_time, duration).filter(
+        table=OuterRef('pk')
+    )
+    return candidate_tables(restaurant, guests).filter(~Exists(conflicts))
+
+
+def get_available_tables_by_slot(restaurant, reservation_date, slots, guests, duration=None):
+    """
+    Map each slot start time to the list of tables free at that time.
+
+    Runs two queries regardless of the number of slots or tables: one for the
+    candidate tables and one for their active reservations on the date.
+    """
+    if duration is None:
+        duration = get_reservation_duration()
+
+    tables = list(candidate_tables(restaurant, guests))
+    booked = {table.pk: [] for table in tables}
+    reservations = Reservation.objects.filter(
+        table__in=tables,
+        reservation_date=reservation_date,
+        status__in=Reservation.ACTIVE_STATUSES,
+    ).values_list('table_id', 'reservation_time')
+    for table_id, booked_time in reservations:
+        booked[table_id].append(datetime.combine(reservation_date, booked_time))
+
+    availability = {}
+    for slot in slots:
+        moment = datetime.combine(reservation_date, slot)
+        availability[slot] = [
+            table for table in tables
+            if all(abs(moment - start) >= duration for start in booked[table.pk])
+        ]
+    return availability
+
+
+# Availability grid
+#
+# A day is split into SLOTS_PER_DAY slots of SLOT_MINUTES. Each table's
+# occupancy is an integer bitmask with bit i set when slot i is taken, so
+# "is this table free for a booking starting at slot i" is a single AND
+# against the mask of the slots that booking would cover.
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+
+def _slot_span(duration):
+    """Number of slots a booking of `duration` covers."""
+    return max(1, math.ceil(duration / timedelta(minutes=SLOT_MINUTES)))
+
+
+def _occupancy_namespace(restaurant_id):
+    return f'reservation-occupancy:{restaurant_id}'
+
+
+def build_occupancy(restaurant_id, reservation_date, duration):
+    """Return [(table_id, capacity, occupancy_mask)] for a restaurant's day."""
+    tables = list(Table.objects.filter(
+        restaurant_id=restaurant_id, is_available=True
+    ).order_by('table_number').values_list('id', 'capacity'))
+    masks = {table_id: 0 for table_id, _ in tables}
+
+    reservations = Reservation.objects.filter(
+        table_id__in=list(masks),
+        reservation_date=reservation_date,
+        status__in=Reservation.ACTIVE_STATUSES,
+    ).values_list('table_id', 'reservation_time')
+    for table_id, booked_time in reservations:
+        start_minute = booked_time.hour * 60 + booked_time.minute
+        first = start_minute // SLOT_MINUTES
+        last = min(
+            math.ceil((start_minute + duration / timedelta(minutes=1)) / SLOT_MINUTES),
+            SLOTS_PER_DAY,
+        )
+        masks[table_id] |= ((1 << (last - first)) - 1) << first
+
+    return [(table_id, capacity, masks[table_id]) for table_id, capacity in tables]
+
+
+def get_occupancy(restaurant_id, reservation_date, duration=None):
+    """Cached build_occupancy; see invalidate_occupancy."""
+    if duration is None:
+        duration = get_reservation_duration()
+    key = make_cache_key(_occupancy_namespace(restaurant_id), str(reservation_date), duration)
+    occupancy = cache.get(key)
+    if occupancy is None:
+        occupancy = build_occupancy(restaurant_id, reservation_date, duration)
+        cache.set(key, occupancy, settings.RESERVATION_AVAILABILITY_CACHE_TIMEOUT)
+    return occupancy
+
+
+def invalidate_occupancy(restaurant_id, reservation_date=None):
+    """Drop cached occupancy for one day, or for every day when no date is given."""
+    namespace = _occupancy_namespace(restaurant_id)
+    if reservation_date is None:
+        bump_cache_version(namespace)
+    else:
+        cache.delete(make_cache_key(namespace, str(reservation_date), get_reservation_duration()))
+
+
+def get_availability_grid(restaurant_id, reservation_date, duration=None):
+    """
+    Availability of every slot of the day for every party size.
+
+    Returns (max_party_size, slots) where each slot is a dict with the slot
+    start `time` and `available_tables`, a list whose element p - 1 is the
+    number of free tables seating at least p guests.
+    """
+    if duration is None:
+        duration = get_reservation_duration()
+    occupancy = get_occupancy(restaurant_id, reservation_date, duration)
+    span = _slot_span(duration)
+    max_party_size = max((capacity for _, capacity, _ in occupancy), default=0)
+
+    slots = []
+    for index in range(SLOTS_PER_DAY):
+        window = ((1 << min(span, SLOTS_PER_DAY - index)) - 1) << index
+        free_by_capacity = [0] * max_party_size
+        for _, capacity, mask in occupancy:
+            if not mask & window:
+                free_by_capacity[capacity - 1] += 1
+
+        # Tables seating at least p guests = suffix sum over capacities >= p
+        available_tables = [0] * max_party_size
+        running = 0
+        for size in range(max_party_size - 1, -1, -1):
+            running += free_by_capacity[size]
+            available_tables[size] = running
+
+        minute = index * SLOT_MINUTES
+        slots.append({
+            'time': f'{minute // 60:02d}:{minute % 60:02d}',
+            'available_tables': available_tables,
+        })
+    return max_party_size, slots
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.14 on 2026-10-18 19:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0003_initial'),
+        ('restaurants', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['table', 'reservation_date', 'reservation_time', 'status'], name='reservations_table_slot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['restaurant', 'reservation_date'], name='reserv_restaurant_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['status', 'reservation_date'], name='reservations_status_date_idx'),
+        ),
+    ]
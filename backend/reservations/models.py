@@ -4,9 +4,10 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from users.models import User
 from restaurants.models import Restaurant, Table
+from core.tracking import TrackedFieldsMixin
 
 
-class Reservation(models.Model):
+class Reservation(TrackedFieldsMixin, models.Model):
     """Restaurant reservation model."""
     
     STATUS_CHOICES = [
@@ -18,6 +19,10 @@ class Reservation(models.Model):
         ('NO_SHOW', 'No Show'),
     ]
     
+    # Statuses that keep a table occupied
+    ACTIVE_STATUSES = ['PENDING', 'CONFIRMED', 'SEATED']
+    tracked_fields = ('status', 'reservation_date')
+    
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reservations')
     restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE, related_name='reservations')
     table = models.ForeignKey(Table, on_delete=models.CASCADE, related_name='reservations')
@@ -45,6 +50,14 @@ class Reservation(models.Model):
     class Meta:
         db_table = 'reservations'
         ordering = ['-reservation_date', '-reservation_time']
+        indexes = [
+            models.Index(
+                fields=['table', 'reservation_date', 'reservation_time', 'status'],
+                name='reservations_table_slot_idx',
+            ),
+            models.Index(fields=['restaurant', 'reservation_date'], name='reserv_restaurant_date_idx'),
+            models.Index(fields=['status', 'reservation_date'], name='reservations_status_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.restaurant.name} on {self.reservation_date} at {self.reservation_time}"
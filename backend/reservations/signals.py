@@ -1,20 +1,34 @@
 """Signals for reservations app."""
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from reservations.availability import invalidate_occupancy
 from reservations.models import Reservation
-from notifications.models import Notification
+from restaurants.models import Table
+from notifications.outbox import notify
 
 
-@receiver(pre_save, sender=Reservation)
-def store_previous_status(sender, instance, **kwargs):
-    """Store previous status on instance to detect actual status changes."""
-    if instance.pk:
-        try:
-            instance._previous_status = Reservation.objects.get(pk=instance.pk).status
-        except Reservation.DoesNotExist:
-            instance._previous_status = None
-    else:
-        instance._previous_status = None
+@receiver(post_save, sender=Reservation)
+@receiver(post_delete, sender=Reservation)
+def invalidate_reservation_occupancy(sender, instance, **kwargs):
+    """Drop the cached occupancy bitmaps of the affected day(s)."""
+    invalidate_occupancy(instance.restaurant_id, instance.reservation_date)
+    previous_date = instance.get_previous_value('reservation_date')
+    if previous_date and previous_date != instance.reservation_date:
+        invalidate_occupancy(instance.restaurant_id, previous_date)
+
+
+@receiver(post_save, sender=Table)
+@receiver(post_delete, sender=Table)
+def invalidate_table_occupancy(sender, instance, **kwargs):
+    """Table capacity/availability changes affect every cached day."""
+    invalidate_occupancy(instance.restaurant_id)
+
+
+def notify_reservation(reservation, title, message):
+    notify(
+        reservation.user_id, 'RESERVATION', title, message,
+        data={'reservation_id': reservation.pk}, coalesce_key=f'reservation:{reservation.pk}',
+    )
 
 
 @receiver(post_save, sender=Reservation)
@@ -22,42 +36,34 @@ def create_reservation_notification(sender, instance, created, **kwargs):
     """Create notification when reservation is created or status changes."""
 
     if created:
-        Notification.objects.create(
-            user=instance.user,
-            notification_type='RESERVATION',
-            title='Reservation Submitted',
-            message=(
+        notify_reservation(
+            instance, 'Reservation Submitted',
+            (
                 f'Your table reservation at {instance.restaurant.name} for '
                 f'{instance.guests_count} guests on {instance.reservation_date} '
                 f'at {instance.reservation_time} has been submitted.'
             ),
         )
     else:
-        previous_status = getattr(instance, '_previous_status', None)
+        previous_status = instance.get_previous_value('status')
         if previous_status == instance.status:
             return
 
         if instance.status == 'CONFIRMED':
-            Notification.objects.create(
-                user=instance.user,
-                notification_type='RESERVATION',
-                title='Reservation Confirmed',
-                message=f'Your reservation at {instance.restaurant.name} has been confirmed.',
+            notify_reservation(
+                instance, 'Reservation Confirmed',
+                f'Your reservation at {instance.restaurant.name} has been confirmed.',
             )
         elif instance.status == 'CANCELLED':
-            Notification.objects.create(
-                user=instance.user,
-                notification_type='RESERVATION',
-                title='Reservation Cancelled',
-                message=(
+            notify_reservation(
+                instance, 'Reservation Cancelled',
+                (
                     f'Your reservation at {instance.restaurant.name} on '
                     f'{instance.reservation_date} has been cancelled.'
                 ),
             )
         elif instance.status == 'NO_SHOW':
-            Notification.objects.create(
-                user=instance.user,
-                notification_type='RESERVATION',
-                title='Reservation No-Show',
-                message=f'You did not show up for your reservation at {instance.restaurant.name}.',
+            notify_reservation(
+                instance, 'Reservation No-Show',
+                f'You did not show up for your reservation at {instance.restaurant.name}.',
             )
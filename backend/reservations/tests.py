@@ -1,3 +1,151 @@
+from datetime import date, time, timedelta
+
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from reservations.availability import get_available_tables, get_reservation_duration
+from reservations.models import Reservation
+from restaurants.models import Table
+from restaurants.tests import create_restaurant
+from users.models import User
+
+
+class AvailableTablesTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        owner = User.objects.create_user(
+            email='owner@example.com', username='owner', password='pass', role='RESTAURANT_OWNER'
+        )
+        self.customer = User.objects.create_user(
+            email='customer@example.com', username='customer', password='pass'
+        )
+        self.client.force_authenticate(self.customer)
+        self.restaurant = create_restaurant(owner)
+        self.tables = [
+            Table.objects.create(restaurant=self.restaurant, table_number=str(i), capacity=4)
+            for i in range(1, 31)
+        ]
+        self.date = date.today() + timedelta(days=1)
+
+    def reserve(self, table, reservation_time, status='CONFIRMED'):
+        return Reservation.objects.create(
+            user=self.customer, restaurant=self.restaurant, table=table,
+            reservation_date=self.date, reservation_time=reservation_time,
+            guests_count=2, status=status, phone='+77001234567', email='customer@example.com',
+        )
+
+    def test_overlapping_reservation_blocks_table(self):
+        self.reserve(self.tables[0], time(19, 0))
+        duration = get_reservation_duration(120)
+        free_at_20 = get_available_tables(self.restaurant, self.date, time(20, 0), 2, duration)
+        free_at_21 = get_available_tables(self.restaurant, self.date, time(21, 0), 2, duration)
+        self.assertNotIn(self.tables[0], free_at_20)
+        self.assertIn(self.tables[0], free_at_21)
+
+    def test_inactive_reservations_do_not_block(self):
+        self.reserve(self.tables[0], time(19, 0), status='CANCELLED')
+        free = get_available_tables(self.restaurant, self.date, time(19, 0), 2)
+        self.assertIn(self.tables[0], free)
+
+    def test_window_spilling_past_midnight(self):
+        self.reserve(self.tables[0], time(0, 0))
+        self.reserve(self.tables[1], time(23, 45))
+        free_early = get_available_tables(self.restaurant, self.date, time(0, 30), 2)
+        free_late = get_available_tables(self.restaurant, self.date, time(23, 0), 2)
+        self.assertNotIn(self.tables[0], free_early)
+        self.assertNotIn(self.tables[1], free_late)
+
+    def test_single_slot_query_count_is_constant(self):
+        self.reserve(self.tables[0], time(19, 0))
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/v1/reservations/available-tables/', {
+                'restaurant': self.restaurant.id, 'date': self.date.isoformat(),
+                'time': '19:30', 'guests': 2,
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 29)
+
+    def test_slot_grid(self):
+        self.reserve(self.tables[0], time(19, 0))
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/v1/reservations/available-tables/', {
+                'restaurant': self.restaurant.id, 'date': self.date.isoformat(),
+                'start': '17:00', 'end': '21:00', 'interval': 60, 'guests': 2,
+            })
+        self.assertEqual(response.status_code, 200)
+        counts = {slot['time']: slot['count'] for slot in response.data['slots']}
+        self.assertEqual(counts, {'17:00': 30, '18:00': 29, '19:00': 29, '20:00': 29, '21:00': 30})
+
+    def test_missing_time_parameters(self):
+        response = self.client.get('/api/v1/reservations/available-tables/', {
+            'restaurant': self.restaurant.id, 'date': self.date.isoformat(), 'guests': 2,
+        })
+        self.assertEqual(response.status_code, 400)
+
+
+class AvailabilityGridTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        owner = User.objects.create_user(
+            email='owner@example.com', username='owner', password='pass', role='RESTAURANT_OWNER'
+        )
+        self.customer = User.objects.create_user(
+            email='customer@example.com', username='customer', password='pass'
+        )
+        self.client.force_authenticate(self.customer)
+        self.restaurant = create_restaurant(owner)
+        self.small = Table.objects.create(restaurant=self.restaurant, table_number='1', capacity=2)
+        self.large = Table.objects.create(restaurant=self.restaurant, table_number='2', capacity=6)
+        self.date = date.today() + timedelta(days=1)
+
+    def get_grid(self):
+        response = self.client.get('/api/v1/reservations/availability-grid/', {
+            'restaurant': self.restaurant.id, 'date': self.date.isoformat(),
+        })
+        self.assertEqual(response.status_code, 200)
+        return {slot['time']: slot['available_tables'] for slot in response.data['slots']}
+
+    def reserve(self, table, reservation_time):
+        return Reservation.objects.create(
+            user=self.customer, restaurant=self.restaurant, table=table,
+            reservation_date=self.date, reservation_time=reservation_time,
+            guests_count=2, status='CONFIRMED', phone='+77001234567', email='customer@example.com',
+        )
+
+    def test_grid_counts_tables_per_party_size(self):
+        self.reserve(self.large, time(19, 0))
+        grid = self.get_grid()
+        self.assertEqual(len(grid), 96)
+        self.assertEqual(grid['17:00'], [2, 2, 1, 1, 1, 1])
+        self.assertEqual(grid['17:15'], [1, 1, 0, 0, 0, 0])
+        self.assertEqual(grid['20:45'], [1, 1, 0, 0, 0, 0])
+        self.assertEqual(grid['21:00'], [2, 2, 1, 1, 1, 1])
+
+    def test_occupancy_is_cached(self):
+        self.get_grid()
+        with self.assertNumQueries(1):
+            self.get_grid()
+
+    def test_reservation_changes_invalidate_cache(self):
+        self.get_grid()
+        reservation = self.reserve(self.small, time(12, 0))
+        self.assertEqual(self.get_grid()['12:00'], [1, 1, 1, 1, 1, 1])
+        reservation.status = 'CANCELLED'
+        reservation.save()
+        self.assertEqual(self.get_grid()['12:00'], [2, 2, 1, 1, 1, 1])
+
+    def test_table_changes_invalidate_cache(self):
+        self.get_grid()
+        self.large.is_available = False
+        self.large.save()
+        self.assertEqual(self.get_grid()['12:00'], [1, 1])
 
-# Create your tests here.
+    def test_moving_reservation_invalidates_previous_day(self):
+        reservation = self.reserve(self.small, time(12, 0))
+        self.assertEqual(self.get_grid()['12:00'], [1, 1, 1, 1, 1, 1])
+        reservation = Reservation.objects.get(pk=reservation.pk)
+        reservation.reservation_date = self.date + timedelta(days=1)
+        reservation.save()
+        self.assertEqual(self.get_grid()['12:00'], [2, 2, 1, 1, 1, 1])
@@ -3,12 +3,38 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.conf import settings
 from django.utils.dateparse import parse_date
 from django.utils import timezone
 from datetime import datetime
+from reservations.availability import (
+    SLOT_MINUTES,
+    build_time_slots,
+    get_availability_grid,
+    get_available_tables,
+    get_available_tables_by_slot,
+    get_reservation_duration,
+)
 from reservations.models import Reservation
 from reservations.serializers.reservation_serializers import ReservationSerializer
-from restaurants.models import Restaurant, Table
+from restaurants.models import Restaurant
+
+
+def parse_time_param(value):
+    """Parse an HH:MM or HH:MM:SS query parameter."""
+    try:
+        return datetime.strptime(value, '%H:%M').time()
+    except ValueError:
+        return datetime.strptime(value, '%H:%M:%S').time()
+
+
+def serialize_table(table):
+    return {
+        'id': table.id,
+        'table_number': table.table_number,
+        'capacity': table.capacity,
+        'location': table.location or 'Indoor',
+    }
 
 
 class ReservationViewSet(viewsets.ModelViewSet):
@@ -32,15 +58,23 @@ class ReservationViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'], url_path='available-tables')
     def available_tables(self, request):
-        """Get available tables for a restaurant on a specific date/time."""
+        """
+        Get available tables for a restaurant on a specific date.
+
+        Pass `time` for a single slot, or `start`/`end` (and optionally
+        `interval` in minutes, default 30) for a grid of slots. `duration`
+        overrides how long a reservation occupies its table (minutes).
+        """
         restaurant_id = request.query_params.get('restaurant')
         date_str = request.query_params.get('date')
         time_str = request.query_params.get('time')
+        start_str = request.query_params.get('start')
+        end_str = request.query_params.get('end')
         guests_str = request.query_params.get('guests')
 
-        if not all([restaurant_id, date_str, time_str, guests_str]):
+        if not all([restaurant_id, date_str, guests_str]) or not (time_str or (start_str and end_str)):
             return Response(
-                {'error': 'restaurant, date, time, and guests parameters are required'},
+                {'error': 'restaurant, date, guests and either time or start/end parameters are required'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
@@ -49,10 +83,17 @@ class ReservationViewSet(viewsets.ModelViewSet):
             reservation_date = parse_date(date_str)
             if not reservation_date:
                 raise ValueError("Invalid date format")
-            try:
-                reservation_time = datetime.strptime(time_str, '%H:%M').time()
-            except ValueError:
-                reservation_time = datetime.strptime(time_str, '%H:%M:%S').time()
+            duration_minutes = int(request.query_params.get('duration', settings.RESERVATION_DURATION_MINUTES))
+            if duration_minutes < 1:
+                raise ValueError("duration must be a positive number of minutes")
+            if time_str:
+                reservation_time = parse_time_param(time_str)
+            else:
+                slot_start = parse_time_param(start_str)
+                slot_end = parse_time_param(end_str)
+                interval = int(request.query_params.get('interval', 30))
+                if interval < 1:
+                    raise ValueError("interval must be a positive number of minutes")
         except (ValueError, TypeError) as e:
             return Response(
                 {'error': f'Invalid parameters: {str(e)}'},
@@ -67,31 +108,70 @@ class ReservationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        tables = Table.objects.filter(
-            restaurant=restaurant,
-            capacity__gte=guests,
-            is_available=True
-        ).order_by('table_number')
-
-        available_tables = []
-        for table in tables:
-            conflicting = Reservation.objects.filter(
-                table=table,
-                reservation_date=reservation_date,
-                reservation_time=reservation_time,
-                status__in=['PENDING', 'CONFIRMED', 'SEATED']
-            ).exists()
-            if not conflicting:
-                available_tables.append({
-                    'id': table.id,
-                    'table_number': table.table_number,
-                    'capacity': table.capacity,
-                    'location': table.location or 'Indoor',
-                })
+        duration = get_reservation_duration(duration_minutes)
+
+        if time_str:
+            tables = get_available_tables(restaurant, reservation_date, reservation_time, guests, duration)
+            available_tables = [serialize_table(table) for table in tables]
+            return Response({
+                'results': available_tables,
+                'count': len(available_tables)
+            })
+
+        slots = build_time_slots(slot_start, slot_end, interval)
+        availability = get_available_tables_by_slot(restaurant, reservation_date, slots, guests, duration)
+        return Response({
+            'slots': [
+                {
+                    'time': slot.strftime('%H:%M'),
+                    'results': [serialize_table(table) for table in tables],
+                    'count': len(tables),
+                }
+                for slot, tables in availability.items()
+            ]
+        })
+
+    @action(detail=False, methods=['get'], url_path='availability-grid')
+    def availability_grid(self, request):
+        """
+        Availability of every 15-minute slot of a day for every party size.
+
+        `available_tables[p - 1]` of a slot is the number of tables that can
+        seat p guests for a reservation starting at that slot.
+        """
+        restaurant_id = request.query_params.get('restaurant')
+        date_str = request.query_params.get('date')
+
+        if not all([restaurant_id, date_str]):
+            return Response(
+                {'error': 'restaurant and date parameters are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            restaurant_id = int(restaurant_id)
+            reservation_date = parse_date(date_str)
+            if not reservation_date:
+                raise ValueError("Invalid date format")
+        except (ValueError, TypeError) as e:
+            return Response(
+                {'error': f'Invalid parameters: {str(e)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not Restaurant.objects.filter(id=restaurant_id).exists():
+            return Response(
+                {'error': 'Restaurant not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
 
+        max_party_size, slots = get_availability_grid(restaurant_id, reservation_date)
         return Response({
-            'results': available_tables,
-            'count': len(available_tables)
+            'restaurant': restaurant_id,
+            'date': reservation_date,
+            'slot_minutes': SLOT_MINUTES,
+            'max_party_size': max_party_size,
+            'slots': slots,
         })
 
     @action(detail=True, methods=['post'])
@@ -0,0 +1,160 @@
+"""
+Nearby-restaurant search for restaurants app.
+
+Each restaurant stores the geohash of its coordinates in an indexed column.
+A radius search first narrows candidates to the geohash cells covering the
+search circle (prefix range scans on that index), then to the circle's
+bounding box, and finally computes the exact haversine distance in the
+database so results can be filtered and sorted by it. Only standard
+functions are used, so the same queries run on SQLite and Postgres.
+"""
+import math
+
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import ASin, Cast, Cos, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+GEOHASH_PRECISION = 9
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+# Upper bound on index range scans per search
+MAX_COVERING_CELLS = 32
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Return the geohash of a point."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+    geohash = []
+    bits = 0
+    value = 0
+    even = True
+    while len(geohash) < precision:
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            geohash.append(GEOHASH_ALPHABET[value])
+            bits = value = 0
+    return ''.join(geohash)
+
+
+def _cell_size(precision):
+    """(height, width) in degrees of a geohash cell of the given length."""
+    total_bits = 5 * precision
+    lat_bits = total_bits // 2
+    lng_bits = total_bits - lat_bits
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def _box_extent(latitude, radius_km):
+    """(min_lat, max_lat, lng_delta) of the circle's bounding box; lng_delta is None around the poles."""
+    lat_delta = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = max(-90.0, latitude - lat_delta), min(90.0, latitude + lat_delta)
+    if min_lat == -90.0 or max_lat == 90.0:
+        return min_lat, max_lat, None
+    lng_delta = radius_km / (KM_PER_DEGREE * math.cos(math.radians(max(abs(min_lat), abs(max_lat)))))
+    return min_lat, max_lat, lng_delta if lng_delta < 180.0 else None
+
+
+def covering_cells(latitude, longitude, radius_km):
+    """
+    Geohash prefixes whose cells together cover the circle around a point.
+
+    Uses the longest prefix for which at most MAX_COVERING_CELLS cells cover
+    the circle's bounding box. Returns an empty list when no prefix does
+    (circles spanning the poles or the whole globe).
+    """
+    latitude, longitude = float(latitude), float(longitude)
+    min_lat, max_lat, lng_delta = _box_extent(latitude, radius_km)
+    if lng_delta is None:
+        return []
+    min_lng, max_lng = longitude - lng_delta, longitude + lng_delta
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = _cell_size(precision)
+        rows = int((max_lat - min_lat) // height) + 2
+        columns = int((max_lng - min_lng) // width) + 2
+        if rows * columns > MAX_COVERING_CELLS:
+            continue
+        # Sample the box every cell height/width, edges included, so every
+        # cell it touches is hit at least once
+        cells = set()
+        for row in range(rows):
+            cell_latitude = min(max_lat, min_lat + row * height)
+            for column in range(columns):
+                cell_longitude = min(max_lng, min_lng + column * width)
+                cell_longitude = (cell_longitude + 180.0) % 360.0 - 180.0
+                cells.add(encode_geohash(cell_latitude, cell_longitude, precision))
+        return sorted(cells)
+    return []
+
+
+def _prefix_upper_bound(prefix):
+    """Smallest geohash greater than every geohash starting with prefix."""
+    while prefix:
+        position = GEOHASH_ALPHABET.index(prefix[-1])
+        if position + 1 < len(GEOHASH_ALPHABET):
+            return prefix[:-1] + GEOHASH_ALPHABET[position + 1]
+        prefix = prefix[:-1]
+    return None
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    (min_lat, max_lat, min_lng, max_lng) of the circle; the longitude bounds
+    are None when the box spans the poles or the antimeridian.
+    """
+    latitude, longitude = float(latitude), float(longitude)
+    min_lat, max_lat, lng_delta = _box_extent(latitude, radius_km)
+    if lng_delta is None or not -180.0 <= longitude - lng_delta < longitude + lng_delta <= 180.0:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, longitude - lng_delta, longitude + lng_delta
+
+
+def distance_expression(latitude, longitude):
+    """Haversine distance in km from a point to the row's coordinates."""
+    lat1 = math.radians(float(latitude))
+    lng1 = math.radians(float(longitude))
+    lat2 = Radians(Cast(F('latitude'), FloatField()))
+    lng2 = Radians(Cast(F('longitude'), FloatField()))
+    half_chord = (
+        Power(Sin((lat2 - lat1) / 2), 2)
+        + math.cos(lat1) * Cos(lat2) * Power(Sin((lng2 - lng1) / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(half_chord), output_field=FloatField())
+
+
+def filter_nearby(queryset, latitude, longitude, radius_km):
+    """
+    Restaurants of the queryset within radius_km of the point, annotated
+    with `distance` (km).
+    """
+    cells = covering_cells(latitude, longitude, radius_km)
+    if cells:
+        # Prefix ranges rather than startswith: LIKE cannot use the index
+        # on SQLite or on Postgres columns with a non-C collation
+        in_cells = Q()
+        for cell in cells:
+            upper = _prefix_upper_bound(cell)
+            cell_range = Q(geohash__gte=cell)
+            if upper:
+                cell_range &= Q(geohash__lt=upper)
+            in_cells |= cell_range
+        queryset = queryset.filter(in_cells)
+
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+    queryset = queryset.filter(latitude__gte=min_lat, latitude__lte=max_lat)
+    if min_lng is not None:
+        queryset = queryset.filter(longitude__gte=min_lng, longitude__lte=max_lng)
+
+    return queryset.annotate(
+        distance=distance_expression(latitude, longitude)
+    ).filter(distance__lte=radius_km)
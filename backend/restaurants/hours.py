@@ -0,0 +1,133 @@
+"""
+Opening hours for restaurants app.
+
+Restaurant.business_hours ({"monday": {"open": "09:00", "close": "22:00"}, ...})
+is compiled on save into a weekly schedule: sorted, merged [start, end)
+intervals in minutes since Monday 00:00 local time. A closing time at or
+before the opening time means the restaurant closes the next day, so
+overnight hours are supported; Sunday nights wrap around to Monday.
+
+The schedule is stored on the restaurant for serialization and mirrored
+into OpeningInterval rows so open-now filtering runs in the database.
+"""
+from datetime import timedelta
+
+from django.db.models import Exists, Min, OuterRef, Q
+from django.utils import timezone
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+DAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+def _parse_minutes(value):
+    """Minutes since midnight of "HH:MM" or "HH:MM:SS", None when invalid."""
+    try:
+        parts = [int(part) for part in str(value).split(':')]
+    except ValueError:
+        return None
+    if len(parts) not in (2, 3) or not (0 <= parts[0] < 24 and 0 <= parts[1] < 60):
+        return None
+    return parts[0] * 60 + parts[1]
+
+
+def compile_business_hours(business_hours):
+    """
+    Weekly [start, end) minute intervals of business_hours. Restaurants
+    without business hours are always open; days with missing or invalid
+    hours are closed.
+    """
+    if not business_hours:
+        return [[0, MINUTES_PER_WEEK]]
+    if not isinstance(business_hours, dict):
+        return []
+
+    intervals = []
+    for day_index, day in enumerate(DAYS):
+        hours = business_hours.get(day)
+        if not isinstance(hours, dict):
+            continue
+        opens, closes = _parse_minutes(hours.get('open')), _parse_minutes(hours.get('close'))
+        if opens is None or closes is None:
+            continue
+        if closes == MINUTES_PER_DAY - 1:
+            # "23:59" means until midnight
+            closes = MINUTES_PER_DAY
+        elif closes <= opens:
+            closes += MINUTES_PER_DAY
+
+        start = day_index * MINUTES_PER_DAY + opens
+        end = day_index * MINUTES_PER_DAY + closes
+        if end > MINUTES_PER_WEEK:
+            intervals.append([0, end - MINUTES_PER_WEEK])
+            end = MINUTES_PER_WEEK
+        intervals.append([start, end])
+
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def minute_of_week(moment=None):
+    """Minutes since Monday 00:00 local time."""
+    moment = timezone.localtime(moment)
+    return moment.weekday() * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
+
+
+def is_open_at(schedule, minute):
+    return any(start <= minute < end for start, end in schedule)
+
+
+def sync_opening_intervals(restaurant):
+    """Replace the restaurant's OpeningInterval rows with its schedule."""
+    from restaurants.models import OpeningInterval
+
+    OpeningInterval.objects.filter(restaurant=restaurant).delete()
+    OpeningInterval.objects.bulk_create([
+        OpeningInterval(restaurant=restaurant, start_minute=start, end_minute=end)
+        for start, end in restaurant.weekly_schedule
+    ])
+
+
+def open_at(moment=None):
+    """Exists() expression: the restaurant's schedule is open at moment (default now)."""
+    from restaurants.models import OpeningInterval
+
+    minute = minute_of_week(moment)
+    return Exists(OpeningInterval.objects.filter(
+        restaurant=OuterRef('pk'), start_minute__lte=minute, end_minute__gt=minute
+    ))
+
+
+def filter_open_now(queryset, moment=None):
+    """Active restaurants accepting orders and open at moment (default now)."""
+    return queryset.filter(status='ACTIVE', is_accepting_orders=True).filter(open_at(moment))
+
+
+def next_schedule_change(moment=None):
+    """
+    The next moment after moment (default now) at which any restaurant opens
+    or closes according to the OpeningInterval rows, None when there are none.
+    """
+    from restaurants.models import OpeningInterval
+
+    moment = timezone.localtime(moment)
+    minute = minute_of_week(moment)
+    bounds = OpeningInterval.objects.aggregate(
+        next_start=Min('start_minute', filter=Q(start_minute__gt=minute)),
+        next_end=Min('end_minute', filter=Q(end_minute__gt=minute)),
+        first_start=Min('start_minute'),
+    )
+    upcoming = [bound for bound in (bounds['next_start'], bounds['next_end']) if bound is not None]
+    if upcoming:
+        target = min(upcoming)
+    elif bounds['first_start'] is not None:
+        # Nothing left this week: the first opening of next week
+        target = bounds['first_start'] + MINUTES_PER_WEEK
+    else:
+        return None
+    return moment.replace(second=0, microsecond=0) + timedelta(minutes=target - minute)
@@ -0,0 +1,14 @@
+"""Rebuild restaurant rating aggregates from reviews."""
+from django.core.management.base import BaseCommand
+from restaurants.ratings import recompute_ratings
+
+
+class Command(BaseCommand):
+    help = 'Recompute average ratings and per-dimension review aggregates from reviews.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('restaurant_ids', nargs='*', type=int, help='Restaurants to repair (default: all)')
+
+    def handle(self, *args, **options):
+        updated = recompute_ratings(options['restaurant_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f'Recomputed ratings of {updated} restaurants'))
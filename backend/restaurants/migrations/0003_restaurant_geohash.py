@@ -0,0 +1,31 @@
+# Generated by Django 5.1.14 on 2026-10-18 19:09
+
+from django.db import migrations, models
+
+from restaurants.geo import encode_geohash
+
+
+def populate_geohash(apps, schema_editor):
+    Restaurant = apps.get_model('restaurants', 'Restaurant')
+    restaurants = list(
+        Restaurant.objects.filter(latitude__isnull=False, longitude__isnull=False).only('latitude', 'longitude')
+    )
+    for restaurant in restaurants:
+        restaurant.geohash = encode_geohash(restaurant.latitude, restaurant.longitude)
+    Restaurant.objects.bulk_update(restaurants, ['geohash'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='restaurant',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12),
+        ),
+        migrations.RunPython(populate_geohash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.1.14 on 2026-10-18 19:18
+
+from django.db import migrations, models
+
+from restaurants.tags import rebuild_tags
+
+
+def populate_tags(apps, schema_editor):
+    rebuild_tags(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0003_restaurant_geohash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Cuisine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(max_length=120, unique=True)),
+            ],
+            options={
+                'db_table': 'cuisines',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Feature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(max_length=120, unique=True)),
+            ],
+            options={
+                'db_table': 'features',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='cuisine_tags',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='restaurants', to='restaurants.cuisine'),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='feature_tags',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='restaurants', to='restaurants.feature'),
+        ),
+        migrations.RunPython(populate_tags, migrations.RunPython.noop),
+    ]
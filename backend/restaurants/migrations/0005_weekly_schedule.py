@@ -0,0 +1,50 @@
+# Generated by Django 5.1.14 on 2026-10-18 19:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from restaurants.hours import compile_business_hours
+
+
+def compile_schedules(apps, schema_editor):
+    Restaurant = apps.get_model('restaurants', 'Restaurant')
+    OpeningInterval = apps.get_model('restaurants', 'OpeningInterval')
+    restaurants = list(Restaurant.objects.only('business_hours'))
+    intervals = []
+    for restaurant in restaurants:
+        restaurant.weekly_schedule = compile_business_hours(restaurant.business_hours)
+        intervals.extend(
+            OpeningInterval(restaurant_id=restaurant.pk, start_minute=start, end_minute=end)
+            for start, end in restaurant.weekly_schedule
+        )
+    Restaurant.objects.bulk_update(restaurants, ['weekly_schedule'], batch_size=1000)
+    OpeningInterval.objects.bulk_create(intervals, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0004_cuisine_feature_tags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='restaurant',
+            name='weekly_schedule',
+            field=models.JSONField(default=list, editable=False),
+        ),
+        migrations.CreateModel(
+            name='OpeningInterval',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_minute', models.PositiveIntegerField()),
+                ('end_minute', models.PositiveIntegerField()),
+                ('restaurant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='opening_intervals', to='restaurants.restaurant')),
+            ],
+            options={
+                'db_table': 'restaurant_opening_intervals',
+                'indexes': [models.Index(fields=['restaurant', 'start_minute', 'end_minute'], name='opening_restaurant_start_idx')],
+            },
+        ),
+        migrations.RunPython(compile_schedules, migrations.RunPython.noop),
+    ]
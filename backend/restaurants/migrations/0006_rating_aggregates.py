@@ -0,0 +1,55 @@
+# Generated by Django 5.1.14 on 2026-10-18 19:23
+
+from django.db import migrations, models
+
+from restaurants.ratings import recompute_ratings
+
+
+def populate_rating_aggregates(apps, schema_editor):
+    recompute_ratings(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0005_weekly_schedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='restaurant',
+            name='ambiance_rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='ambiance_rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='food_rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='food_rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='service_rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='service_rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_rating_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.14 on 2026-10-18 20:35
+
+from django.db import migrations, models
+
+from restaurants.tags import rebuild_tags
+
+
+def repopulate_tags(apps, schema_editor):
+    # Non-Latin tag names had no slug before, so they were never linked
+    rebuild_tags(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0006_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cuisine',
+            name='slug',
+            field=models.SlugField(allow_unicode=True, max_length=120, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='feature',
+            name='slug',
+            field=models.SlugField(allow_unicode=True, max_length=120, unique=True),
+        ),
+        migrations.RunPython(repopulate_tags, migrations.RunPython.noop),
+    ]
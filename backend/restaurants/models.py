@@ -1,9 +1,47 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from users.models import User
+from restaurants.geo import encode_geohash
+from restaurants.hours import compile_business_hours
+from core.tracking import TrackedFieldsMixin
 
+RATING_AGGREGATE_FIELDS = [
+    'rating_sum',
+    'food_rating_sum', 'food_rating_count',
+    'service_rating_sum', 'service_rating_count',
+    'ambiance_rating_sum', 'ambiance_rating_count',
+]
 
-class Restaurant(models.Model):
+
+class Cuisine(models.Model):
+    """Cuisine lookup, normalized from Restaurant.cuisine_type."""
+    
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=120, unique=True, allow_unicode=True)
+    
+    class Meta:
+        db_table = 'cuisines'
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+
+
+class Feature(models.Model):
+    """Feature lookup (e.g. Delivery, WiFi), normalized from Restaurant.features."""
+    
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=120, unique=True, allow_unicode=True)
+    
+    class Meta:
+        db_table = 'features'
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+
+
+class Restaurant(TrackedFieldsMixin, models.Model):
     """Restaurant model."""
     
     STATUS_CHOICES = [
@@ -20,6 +58,8 @@ class Restaurant(models.Model):
         ('$$$$', 'Very Expensive'),
     ]
     
+    tracked_fields = ('cuisine_type', 'features', 'business_hours')
+    
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='restaurants')
     name = models.CharField(max_length=200)
     slug = models.SlugField(max_length=250, unique=True)
@@ -40,19 +80,35 @@ class Restaurant(models.Model):
     country = models.CharField(max_length=100, default='USA')
     latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    # Derived from latitude/longitude on save, indexed for nearby search (see restaurants.geo)
+    geohash = models.CharField(max_length=12, blank=True, db_index=True, editable=False)
     
     # Business hours
     business_hours = models.JSONField(default=dict)  # e.g., {"monday": {"open": "09:00", "close": "22:00"}}
+    # Compiled from business_hours on save: [[start, end), ...] minutes since Monday 00:00 (see restaurants.hours)
+    weekly_schedule = models.JSONField(default=list, editable=False)
     
     # Status and ratings
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
     is_accepting_orders = models.BooleanField(default=True)
     average_rating = models.DecimalField(max_digits=3, decimal_places=2, default=0.0)
     total_reviews = models.IntegerField(default=0)
+    # Running review aggregates, maintained incrementally (see restaurants.ratings)
+    rating_sum = models.PositiveIntegerField(default=0)
+    food_rating_sum = models.PositiveIntegerField(default=0)
+    food_rating_count = models.PositiveIntegerField(default=0)
+    service_rating_sum = models.PositiveIntegerField(default=0)
+    service_rating_count = models.PositiveIntegerField(default=0)
+    ambiance_rating_sum = models.PositiveIntegerField(default=0)
+    ambiance_rating_count = models.PositiveIntegerField(default=0)
     
     # Features
     features = models.JSONField(default=list)  # e.g., ["Delivery", "Takeout", "Dine-in", "WiFi"]
     
+    # Indexed copies of cuisine_type/features, kept in sync on save (see restaurants.tags)
+    cuisine_tags = models.ManyToManyField(Cuisine, related_name='restaurants', blank=True, editable=False)
+    feature_tags = models.ManyToManyField(Feature, related_name='restaurants', blank=True, editable=False)
+    
     # Images
     logo = models.ImageField(upload_to='restaurants/logos/', blank=True, null=True)
     cover_image = models.ImageField(upload_to='restaurants/covers/', blank=True, null=True)
@@ -73,13 +129,27 @@ class Restaurant(models.Model):
     def __str__(self):
         return self.name
     
+    def save(self, *args, **kwargs):
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+        else:
+            self.geohash = ''
+        self.weekly_schedule = compile_business_hours(self.business_hours)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if {'latitude', 'longitude'} & update_fields:
+                update_fields.add('geohash')
+            if 'business_hours' in update_fields:
+                update_fields.add('weekly_schedule')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+    
     def update_rating(self):
-        """Update average rating based on reviews."""
-        reviews = self.reviews.all()
-        if reviews.exists():
-            self.total_reviews = reviews.count()
-            self.average_rating = reviews.aggregate(models.Avg('rating'))['rating__avg']
-            self.save()
+        """Recompute rating aggregates from all reviews (repairs only; reviews update them incrementally)."""
+        from restaurants.ratings import recompute_ratings
+        recompute_ratings([self.pk])
+        self.refresh_from_db(fields=['average_rating', 'total_reviews', *RATING_AGGREGATE_FIELDS])
 
 
 class RestaurantImage(models.Model):
@@ -99,9 +169,11 @@ class RestaurantImage(models.Model):
         return f"{self.restaurant.name} - Image {self.id}"
 
 
-class Review(models.Model):
+class Review(TrackedFieldsMixin, models.Model):
     """Restaurant review model."""
     
+    tracked_fields = ('restaurant_id', 'rating', 'food_rating', 'service_rating', 'ambiance_rating')
+    
     restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE, related_name='reviews')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reviews')
     order = models.ForeignKey('orders.Order', on_delete=models.SET_NULL, null=True, blank=True, related_name='review')
@@ -126,11 +198,6 @@ class Review(models.Model):
     
     def __str__(self):
         return f"{self.user.email} - {self.restaurant.name} ({self.rating}★)"
-    
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # Update restaurant rating
-        self.restaurant.update_rating()
 
 
 class Table(models.Model):
@@ -150,3 +217,19 @@ class Table(models.Model):
     def __str__(self):
         return f"{self.restaurant.name} - Table {self.table_number}"
 
+
+class OpeningInterval(models.Model):
+    """One interval of a restaurant's weekly_schedule, for open-now queries."""
+    
+    restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE, related_name='opening_intervals')
+    start_minute = models.PositiveIntegerField()  # minutes since Monday 00:00
+    end_minute = models.PositiveIntegerField()
+    
+    class Meta:
+        db_table = 'restaurant_opening_intervals'
+        indexes = [
+            models.Index(fields=['restaurant', 'start_minute', 'end_minute'], name='opening_restaurant_start_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.restaurant.name} - {self.start_minute}-{self.end_minute}"
@@ -0,0 +1,127 @@
+"""
+Restaurant rating aggregates for restaurants app.
+
+Restaurants keep running sums and counts of their reviews' overall and
+per-dimension ratings. Every review save or delete applies its delta to
+those counters in one UPDATE with F() expressions, recomputing
+average_rating in the same statement, so no review history is rescanned.
+recompute_ratings rebuilds the counters from scratch for repairs.
+"""
+from collections import defaultdict
+
+from django.apps import apps as global_apps
+from django.db.models import Avg, Case, Count, DecimalField, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from restaurants.models import RATING_AGGREGATE_FIELDS, Restaurant
+
+RATING_DIMENSIONS = ['food_rating', 'service_rating', 'ambiance_rating']
+
+
+def _review_deltas(ratings, sign):
+    """Counter deltas of one review's ratings, added (+1) or removed (-1)."""
+    deltas = {'total_reviews': sign, 'rating_sum': sign * ratings['rating']}
+    for dimension in RATING_DIMENSIONS:
+        if ratings.get(dimension) is not None:
+            deltas[f'{dimension}_sum'] = sign * ratings[dimension]
+            deltas[f'{dimension}_count'] = sign
+    return deltas
+
+
+def _apply_deltas(restaurant_id, deltas):
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+
+    count_delta, sum_delta = deltas.get('total_reviews', 0), deltas.get('rating_sum', 0)
+    if count_delta or sum_delta:
+        # Right-hand F() values are read before the update, so compute the
+        # average from the post-update counters explicitly
+        updates['average_rating'] = Case(
+            When(
+                total_reviews__gt=-count_delta,
+                then=Cast(F('rating_sum') + sum_delta, FloatField()) / (F('total_reviews') + count_delta),
+            ),
+            default=Value(0),
+            output_field=DecimalField(max_digits=3, decimal_places=2),
+        )
+    Restaurant.objects.filter(pk=restaurant_id).update(updated_at=timezone.now(), **updates)
+
+
+def _ratings(review, previous=False):
+    fields = ['restaurant_id', 'rating', *RATING_DIMENSIONS]
+    if previous:
+        return {field: review.get_previous_value(field) for field in fields}
+    return {field: getattr(review, field) for field in fields}
+
+
+def record_review_saved(review, created):
+    """Apply a created or edited review to its restaurant's counters."""
+    new = _ratings(review)
+    if created:
+        _apply_deltas(new['restaurant_id'], _review_deltas(new, 1))
+        return
+
+    old = _ratings(review, previous=True)
+    if old == new:
+        return
+    if old['restaurant_id'] != new['restaurant_id']:
+        _apply_deltas(old['restaurant_id'], _review_deltas(old, -1))
+        _apply_deltas(new['restaurant_id'], _review_deltas(new, 1))
+        return
+
+    deltas = defaultdict(int)
+    for ratings, sign in ((old, -1), (new, 1)):
+        for field, delta in _review_deltas(ratings, sign).items():
+            deltas[field] += delta
+    _apply_deltas(new['restaurant_id'], deltas)
+
+
+def record_review_deleted(review):
+    """Remove a deleted review from its restaurant's counters."""
+    old = _ratings(review, previous=True)
+    if old['rating'] is None:
+        # Never loaded from the database; fall back to the instance values
+        old = _ratings(review)
+    _apply_deltas(old['restaurant_id'], _review_deltas(old, -1))
+
+
+def recompute_ratings(restaurant_ids=None, apps=global_apps, batch_size=500):
+    """
+    Rebuild the rating counters of the given restaurants (all when None)
+    from their reviews with one grouped aggregation. Migrations pass their
+    historical `apps`. Returns the number of restaurants updated.
+    """
+    Restaurant = apps.get_model('restaurants', 'Restaurant')
+    Review = apps.get_model('restaurants', 'Review')
+
+    reviews = Review.objects.all()
+    restaurants = Restaurant.objects.only('id')
+    if restaurant_ids is not None:
+        reviews = reviews.filter(restaurant_id__in=restaurant_ids)
+        restaurants = restaurants.filter(pk__in=restaurant_ids)
+
+    aggregates = {}
+    for dimension in ['rating', *RATING_DIMENSIONS]:
+        aggregates[f'{dimension}_sum'] = Sum(dimension)
+        aggregates[f'{dimension}_count'] = Count(dimension)
+    aggregates['average'] = Avg('rating')
+    stats = {
+        row['restaurant_id']: row
+        for row in reviews.values('restaurant_id').annotate(**aggregates).order_by()
+    }
+
+    fields = ['average_rating', 'total_reviews', *RATING_AGGREGATE_FIELDS]
+    updated = list(restaurants)
+    for restaurant in updated:
+        row = stats.get(restaurant.pk, {})
+        restaurant.total_reviews = row.get('rating_count', 0)
+        restaurant.rating_sum = row.get('rating_sum') or 0
+        restaurant.average_rating = round(row.get('average') or 0, 2)
+        for dimension in RATING_DIMENSIONS:
+            setattr(restaurant, f'{dimension}_sum', row.get(f'{dimension}_sum') or 0)
+            setattr(restaurant, f'{dimension}_count', row.get(f'{dimension}_count', 0))
+    Restaurant.objects.bulk_update(updated, fields, batch_size=batch_size)
+    return len(updated)
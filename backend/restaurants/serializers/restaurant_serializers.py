@@ -1,45 +1,42 @@
 ﻿"""Serializers for restaurants app."""
 from rest_framework import serializers
-from django.utils import timezone
-from datetime import datetime
-from restaurants.models import Restaurant, RestaurantImage, Review, Table
+from restaurants.hours import is_open_at, minute_of_week
+from restaurants.models import RATING_AGGREGATE_FIELDS, Restaurant, RestaurantImage, Review, Table
+from restaurants.ratings import RATING_DIMENSIONS
 
 
 class RestaurantSerializer(serializers.ModelSerializer):
     is_open_now = serializers.SerializerMethodField()
+    distance = serializers.SerializerMethodField()
+    rating_breakdown = serializers.SerializerMethodField()
     
     class Meta:
         model = Restaurant
-        fields = '__all__'
+        # Tag links mirror cuisine_type/features; rating counters feed rating_breakdown
+        exclude = ['cuisine_tags', 'feature_tags', *RATING_AGGREGATE_FIELDS]
         read_only_fields = ['owner', 'average_rating', 'total_reviews', 'slug']
     
+    def get_distance(self, obj):
+        # Only set for ?near= searches (km)
+        distance = getattr(obj, 'distance', None)
+        return round(distance, 3) if distance is not None else None
+    
+    def get_rating_breakdown(self, obj):
+        breakdown = {}
+        for dimension in RATING_DIMENSIONS:
+            count = getattr(obj, f'{dimension}_count')
+            total = getattr(obj, f'{dimension}_sum')
+            breakdown[dimension.replace('_rating', '')] = {
+                'average': round(total / count, 2) if count else None,
+                'count': count,
+            }
+        return breakdown
+    
     def get_is_open_now(self, obj):
         if not obj.is_accepting_orders or obj.status != 'ACTIVE':
             return False
-        if not obj.business_hours:
-            return True
-        now = timezone.localtime(timezone.now())
-        day_name = now.strftime('%A').lower()
-        if day_name not in obj.business_hours:
-            return False
-        today_hours = obj.business_hours[day_name]
-        if not today_hours.get('open') or not today_hours.get('close'):
-            return False
-        current_time = now.time()
-        try:
-            open_str = today_hours['open']
-            close_str = today_hours['close']
-            if len(open_str) == 5:
-                open_time = datetime.strptime(open_str, '%H:%M').time()
-                close_time = datetime.strptime(close_str, '%H:%M').time()
-            else:
-                open_time = datetime.strptime(open_str, '%H:%M:%S').time()
-                close_time = datetime.strptime(close_str, '%H:%M:%S').time()
-            if open_time.hour == 0 and open_time.minute == 0 and close_time.hour == 23 and close_time.minute == 59:
-                return True
-            return open_time <= current_time <= close_time
-        except:
-            return False
+        # weekly_schedule is compiled on save, so no parsing here
+        return is_open_at(obj.weekly_schedule, minute_of_week())
 
 
 class RestaurantImageSerializer(serializers.ModelSerializer):
@@ -0,0 +1,42 @@
+"""Signals for restaurants app."""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core.cache import bump_cache_version_on_commit
+from restaurants.models import Restaurant, Review
+from restaurants.hours import sync_opening_intervals
+from restaurants.ratings import record_review_deleted, record_review_saved
+from restaurants.tags import sync_restaurant_tags
+from restaurants.views import RESTAURANT_CACHE_NAMESPACE
+
+
+@receiver(post_save, sender=Restaurant)
+def sync_tags(sender, instance, **kwargs):
+    """Keep the cuisine/feature lookup links in step with the JSON fields."""
+    sync_restaurant_tags(instance)
+
+
+@receiver(post_save, sender=Restaurant)
+def sync_schedule(sender, instance, **kwargs):
+    """Mirror the compiled weekly schedule into OpeningInterval rows."""
+    if instance.has_field_changed('business_hours'):
+        sync_opening_intervals(instance)
+
+
+@receiver(post_save, sender=Restaurant)
+@receiver(post_delete, sender=Restaurant)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_restaurant_cache(sender, instance, **kwargs):
+    """Drop cached public restaurant responses once a restaurant/review change commits."""
+    bump_cache_version_on_commit(RESTAURANT_CACHE_NAMESPACE)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    """Apply the review's rating delta to its restaurant's counters."""
+    record_review_saved(instance, created)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    record_review_deleted(instance)
@@ -0,0 +1,123 @@
+"""
+Cuisine and feature tags for restaurants app.
+
+Restaurant.cuisine_type and Restaurant.features stay the JSON source of
+truth; on save they are mirrored into the Cuisine/Feature lookup tables and
+the restaurants' many-to-many links, whose indexed join tables serve
+filtering and facet counts instead of JSON containment scans. Tags are
+matched by slug, so "Dine-in" and "dine in" are the same feature; slugs keep
+non-Latin letters, so "Казахская" is tagged (and filtered) as "казахская".
+"""
+from django.apps import apps as global_apps
+from django.db.models import Count, F
+from django.utils.text import slugify
+
+from restaurants.models import Cuisine, Feature, Restaurant
+
+# (JSON field, lookup model, many-to-many field)
+TAG_FIELDS = [
+    ('cuisine_type', Cuisine, 'cuisine_tags'),
+    ('features', Feature, 'feature_tags'),
+]
+
+
+def normalize_tags(values):
+    """{slug: name} of the JSON tag values, first spelling wins."""
+    tags = {}
+    for value in values if isinstance(values, list) else []:
+        name = str(value).strip()
+        slug = slugify(name, allow_unicode=True)
+        if slug and slug not in tags:
+            tags[slug] = name
+    return tags
+
+
+def parse_tag_param(value):
+    """Slugs of a comma-separated tag query parameter, None when it is blank."""
+    if not value or not value.strip():
+        return None
+    return list(normalize_tags(value.split(',')))
+
+
+def sync_restaurant_tags(restaurant):
+    """Mirror the restaurant's changed JSON tags into its lookup links."""
+    for field, model, relation in TAG_FIELDS:
+        if not restaurant.has_field_changed(field):
+            continue
+        tags = normalize_tags(getattr(restaurant, field))
+        if not tags and not restaurant.get_previous_value(field):
+            # Nothing linked before and nothing to link now
+            continue
+        model.objects.bulk_create(
+            [model(slug=slug, name=name) for slug, name in tags.items()],
+            ignore_conflicts=True,
+        )
+        getattr(restaurant, relation).set(model.objects.filter(slug__in=list(tags)))
+
+
+def rebuild_tags(apps=global_apps):
+    """
+    Rebuild every restaurant's tag links from its JSON tags and drop unused
+    tags. Migrations pass their historical `apps`.
+    """
+    Restaurant = apps.get_model('restaurants', 'Restaurant')
+    for field, model, relation in TAG_FIELDS:
+        Tag = apps.get_model('restaurants', model.__name__)
+        Link = Restaurant._meta.get_field(relation).remote_field.through
+        tag_column = f'{model._meta.model_name}_id'
+
+        restaurant_tags = {
+            restaurant_id: normalize_tags(values)
+            for restaurant_id, values in Restaurant.objects.values_list('id', field)
+        }
+        names = {}
+        for tags in restaurant_tags.values():
+            for slug, name in tags.items():
+                names.setdefault(slug, name)
+        Tag.objects.bulk_create([Tag(slug=slug, name=name) for slug, name in names.items()], ignore_conflicts=True)
+        tag_ids = dict(Tag.objects.values_list('slug', 'id'))
+        Link.objects.all().delete()
+        Link.objects.bulk_create(
+            [
+                Link(restaurant_id=restaurant_id, **{tag_column: tag_ids[slug]})
+                for restaurant_id, tags in restaurant_tags.items()
+                for slug in tags
+            ],
+            batch_size=1000,
+        )
+        Tag.objects.filter(restaurants__isnull=True).delete()
+
+
+def _links(relation):
+    """(join model, tag field name) of a many-to-many tag relation."""
+    field = Restaurant._meta.get_field(relation)
+    return field.remote_field.through, field.related_model._meta.model_name
+
+
+def filter_by_tags(queryset, relation, slugs, match_all=False):
+    """
+    Restaurants linked to any (or, with match_all, every) of the tag slugs.
+    None applies no filter; an empty list (a parameter without a usable tag)
+    matches nothing.
+    """
+    if slugs is None:
+        return queryset
+    if not slugs:
+        return queryset.none()
+    through, tag = _links(relation)
+    links = through.objects.filter(**{f'{tag}__slug__in': slugs})
+    if match_all:
+        links = links.values('restaurant_id').annotate(matched=Count('id')).filter(matched=len(slugs))
+    return queryset.filter(pk__in=links.values('restaurant_id'))
+
+
+def tag_facets(queryset, relation):
+    """[{slug, name, count}] of the tags of the queryset's restaurants, most common first."""
+    through, tag = _links(relation)
+    rows = (
+        through.objects.filter(restaurant_id__in=queryset.order_by().values('pk'))
+        .values(slug=F(f'{tag}__slug'), name=F(f'{tag}__name'))
+        .annotate(count=Count('restaurant_id'))
+        .order_by('-count', 'name')
+    )
+    return list(rows)
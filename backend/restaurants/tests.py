@@ -1,3 +1,372 @@
-from django.test import TestCase
+from datetime import datetime, timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from core.cache import get_cache_version
+from restaurants.geo import covering_cells, encode_geohash
+from restaurants.hours import MINUTES_PER_WEEK, compile_business_hours, next_schedule_change
+from restaurants.models import Restaurant, Review
+from restaurants.views import RESTAURANT_CACHE_NAMESPACE
+from users.models import User
+
+
+def create_restaurant(owner, **kwargs):
+    defaults = {
+        'name': 'Nomad',
+        'slug': 'nomad',
+        'description': 'Kazakh cuisine',
+        'phone': '+77001234567',
+        'email': 'nomad@example.com',
+        'street_address': 'Abay 1',
+        'city': 'Almaty',
+        'state': 'Almaty',
+        'postal_code': '050000',
+        'status': 'ACTIVE',
+    }
+    defaults.update(kwargs)
+    return Restaurant.objects.create(owner=owner, **defaults)
+
+
+class RestaurantResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.owner = User.objects.create_user(
+            email='owner@example.com', username='owner', password='pass', role='RESTAURANT_OWNER'
+        )
+        self.customer = User.objects.create_user(
+            email='customer@example.com', username='customer', password='pass'
+        )
+        self.restaurant = create_restaurant(self.owner)
+
+    def test_list_is_served_from_cache(self):
+        self.client.get('/api/v1/restaurants/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v1/restaurants/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+
+    def test_query_parameters_are_cached_separately(self):
+        self.client.get('/api/v1/restaurants/')
+        response = self.client.get('/api/v1/restaurants/', {'search': 'missing'})
+        self.assertEqual(response.data['count'], 0)
+
+    def test_restaurant_save_invalidates_cache(self):
+        self.client.get(f'/api/v1/restaurants/{self.restaurant.slug}/')
+        self.restaurant.name = 'Nomad Grill'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.restaurant.save()
+        response = self.client.get(f'/api/v1/restaurants/{self.restaurant.slug}/')
+        self.assertEqual(response.data['name'], 'Nomad Grill')
+
+    def test_review_save_invalidates_cache(self):
+        self.client.get('/api/v1/restaurants/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(restaurant=self.restaurant, user=self.customer, rating=4, comment='Good')
+        response = self.client.get('/api/v1/restaurants/')
+        self.assertEqual(response.data['results'][0]['total_reviews'], 1)
+
+    def test_cache_is_invalidated_on_commit(self):
+        version = get_cache_version(RESTAURANT_CACHE_NAMESPACE)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.restaurant.name = 'Nomad Grill'
+            self.restaurant.save()
+        # Until the write commits, readers keep caching under the old version
+        self.assertEqual(get_cache_version(RESTAURANT_CACHE_NAMESPACE), version)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_cache_version(RESTAURANT_CACHE_NAMESPACE), version + 1)
+
+    def test_owner_responses_are_not_cached(self):
+        create_restaurant(self.owner, name='Pending', slug='pending', status='PENDING')
+        self.client.get('/api/v1/restaurants/')
+        self.client.force_authenticate(self.owner)
+        response = self.client.get('/api/v1/restaurants/')
+        self.assertEqual(response.data['count'], 2)
+
+
+class ConditionalListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.owner = User.objects.create_user(
+            email='owner@example.com', username='owner', password='pass', role='RESTAURANT_OWNER'
+        )
+        self.customer = User.objects.create_user(
+            email='customer@example.com', username='customer', password='pass'
+        )
+        self.restaurant = create_restaurant(self.owner, business_hours={
+            'friday': {'open': '11:00', 'close': '15:00'},
+        })
+
+    def get(self, moment, **headers):
+        with mock.patch('django.utils.timezone.now', return_value=moment):
+            return self.client.get('/api/v1/restaurants/', **headers)
+
+    def test_not_modified_without_serializing(self):
+        moment = datetime(2026, 3, 6, 12, 0, tzinfo=dt_timezone.utc)
+        etag = self.get(moment)['ETag']
+        with self.assertNumQueries(0):
+            response = self.get(moment, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        cache.clear()
+        # The aggregates and the next opening-hours change
+        with self.assertNumQueries(2):
+            response = self.get(moment, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(restaurant=self.restaurant, user=self.customer, rating=5, comment='Great')
+        response = self.get(moment, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_follows_opening_hours(self):
+        etag = self.get(datetime(2026, 3, 6, 12, 0, tzinfo=dt_timezone.utc))['ETag']
+        response = self.get(datetime(2026, 3, 6, 14, 0, tzinfo=dt_timezone.utc), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        # Closed at 15:00, so is_open_now changed
+        response = self.get(datetime(2026, 3, 6, 16, 0, tzinfo=dt_timezone.utc), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data['results'][0]['is_open_now'])
+        self.assertNotIn('Last-Modified', response)
+
+    def test_next_schedule_change(self):
+        friday_noon = datetime(2026, 3, 6, 12, 0, 30, tzinfo=dt_timezone.utc)
+        self.assertEqual(next_schedule_change(friday_noon), datetime(2026, 3, 6, 15, 0, tzinfo=dt_timezone.utc))
+        # After the week's last closing: next week's first opening
+        friday_evening = datetime(2026, 3, 6, 16, 0, tzinfo=dt_timezone.utc)
+        self.assertEqual(next_schedule_change(friday_evening), datetime(2026, 3, 13, 11, 0, tzinfo=dt_timezone.utc))
+
+
+class NearbySearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        owner = User.objects.create_user(
+            email='owner@example.com', username='owner', password='pass', role='RESTAURANT_OWNER'
+        )
+        # Distances from Republic Square, Almaty (43.2389, 76.9453)
+        self.close = create_restaurant(owner, name='Close', slug='close', latitude='43.2479', longitude='76.9453')
+        self.farther = create_restaurant(owner, name='Farther', slug='farther', latitude='43.2389', longitude='76.9945')
+        self.outside = create_restaurant(owner, name='Outside', slug='outside', latitude='43.4189', longitude='76.9453')
+        create_restaurant(owner, name='Unplaced', slug='unplaced')
+
+    def search(self, **params):
+        response = self.client.get('/api/v1/restaurants/', {'near': '43.2389,76.9453', **params})
+        self.assertEqual(response.status_code, 200)
+        return [(row['name'], row['distance']) for row in response.data['results']]
+
+    def test_results_within_radius_sorted_by_distance(self):
+        results = self.search(radius=5)
+        self.assertEqual([name for name, _ in results], ['Close', 'Farther'])
+        self.assertAlmostEqual(results[0][1], 1.0, delta=0.01)
+        self.assertAlmostEqual(results[1][1], 4.0, delta=0.05)
+
+    def test_larger_radius(self):
+        self.assertEqual([name for name, _ in self.search(radius=25)], ['Close', 'Farther', 'Outside'])
+
+    def test_explicit_ordering_wins(self):
+        results = self.search(radius=25, ordering='-name')
+        self.assertEqual([name for name, _ in results], ['Outside', 'Farther', 'Close'])
+
+    def test_invalid_parameters(self):
+        for params in ({'near': 'abc'}, {'near': '95,10'}, {'near': '43,76', 'radius': '0'}):
+            response = self.client.get('/api/v1/restaurants/', params)
+            self.assertEqual(response.status_code, 400)
+
+    def test_geohash_is_kept_in_sync(self):
+        self.assertEqual(encode_geohash(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        self.close.latitude = self.outside.latitude
+        self.close.save(update_fields=['latitude'])
+        self.close.refresh_from_db()
+        self.assertEqual(self.close.geohash, self.outside.geohash)
+
+    def test_cells_cover_antimeridian(self):
+        cells = covering_cells(0, 179.999, 5)
+        self.assertIn(encode_geohash(0, -179.99, len(cells[0])), cells)
+
+
+class TagFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        owner = User.objects.create_user(
+            email='owner@example.com', username='owner', password='pass', role='RESTAURANT_OWNER'
+        )
+        create_restaurant(owner, name='Napoli', slug='napoli', cuisine_type=['Italian', 'Pizza'],
+                          features=['Delivery', 'WiFi'])
+        create_restaurant(owner, name='Roma', slug='roma', cuisine_type=['Italian'], features=['Dine-in'])
+        self.nomad = create_restaurant(owner, cuisine_type=['Kazakh'], features=['Delivery', 'Dine in'])
+
+    def names(self, **params):
+        response = self.client.get('/api/v1/restaurants/', {'ordering': 'name', **params})
+        self.assertEqual(response.status_code, 200)
+        return [row['name'] for row in response.data['results']]
+
+    def test_cuisine_filter(self):
+        self.assertEqual(self.names(cuisine='italian'), ['Napoli', 'Roma'])
+        self.assertEqual(self.names(cuisine_type='Kazakh'), ['Nomad'])
+        self.assertEqual(self.names(cuisine='pizza,kazakh'), ['Napoli', 'Nomad'])
+        self.assertEqual(self.names(cuisine='pizza,italian', cuisine_match='all'), ['Napoli'])
+
+    def test_cyrillic_cuisine(self):
+        self.nomad.cuisine_type = ['Казахская']
+        self.nomad.save()
+        self.assertEqual(self.names(cuisine='Казахская'), ['Nomad'])
+        self.assertEqual(self.names(cuisine='казахская,pizza'), ['Napoli', 'Nomad'])
+        self.assertEqual(self.names(cuisine='Узбекская'), [])
+
+    def test_tag_parameter_without_slugs_matches_nothing(self):
+        self.assertEqual(self.names(cuisine='!!!'), [])
+        self.assertEqual(self.names(cuisine=''), ['Napoli', 'Nomad', 'Roma'])
+
+    def test_feature_filter(self):
+        self.assertEqual(self.names(feature='delivery,wifi'), ['Napoli'])
+        self.assertEqual(self.names(feature='wifi,dine-in', feature_match='any'), ['Napoli', 'Nomad', 'Roma'])
+
+    def test_facets(self):
+        response = self.client.get('/api/v1/restaurants/', {'cuisine': 'italian', 'facets': 'true'})
+        facets = response.data['facets']
+        self.assertEqual(
+            [(row['slug'], row['count']) for row in facets['cuisines']], [('italian', 2), ('pizza', 1)]
+        )
+        self.assertEqual(
+            [(row['name'], row['count']) for row in facets['features']],
+            [('Delivery', 1), ('Dine-in', 1), ('WiFi', 1)],
+        )
+
+    def test_tags_follow_json_edits(self):
+        self.nomad.features.remove('Delivery')
+        self.nomad.save()
+        self.assertEqual(self.names(feature='delivery'), ['Napoli'])
+        self.nomad.cuisine_type = []
+        self.nomad.save()
+        self.assertEqual(self.names(cuisine='kazakh'), [])
+
+    def test_unchanged_tags_are_not_resynced(self):
+        self.nomad.name = 'Nomad Grill'
+        with self.assertNumQueries(2):  # UPDATE restaurant + search entry upsert
+            self.nomad.save()
+
+
+class CompileBusinessHoursTests(SimpleTestCase):
+    def test_regular_and_overnight_hours(self):
+        schedule = compile_business_hours({
+            'monday': {'open': '09:00', 'close': '22:00'},
+            'friday': {'open': '18:00:00', 'close': '02:00:00'},
+            'saturday': {'open': '00:00', 'close': '23:59'},
+        })
+        friday, saturday = 4 * 1440, 5 * 1440
+        # Friday night runs into Saturday, which is open all day
+        self.assertEqual(schedule, [[540, 1320], [friday + 1080, saturday + 1440]])
+
+    def test_sunday_night_wraps_to_monday(self):
+        schedule = compile_business_hours({'sunday': {'open': '20:00', 'close': '03:00'}})
+        self.assertEqual(schedule, [[0, 180], [6 * 1440 + 1200, MINUTES_PER_WEEK]])
+
+    def test_missing_and_invalid_hours(self):
+        self.assertEqual(compile_business_hours({}), [[0, MINUTES_PER_WEEK]])
+        self.assertEqual(compile_business_hours({'monday': {'open': '9am', 'close': '22:00'}, 'tuesday': {}}), [])
+
+
+class OpenNowTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        owner = User.objects.create_user(
+            email='owner@example.com', username='owner', password='pass', role='RESTAURANT_OWNER'
+        )
+        self.late = create_restaurant(owner, name='Late', slug='late', business_hours={
+            'friday': {'open': '18:00', 'close': '02:00'},
+        })
+        create_restaurant(owner, name='Lunch', slug='lunch', business_hours={
+            'friday': {'open': '11:00', 'close': '15:00'}, 'saturday': {'open': '11:00', 'close': '15:00'},
+        })
+        create_restaurant(owner, name='Always', slug='always')
+
+    def open_restaurants(self, moment):
+        with mock.patch('django.utils.timezone.now', return_value=moment):
+            response = self.client.get('/api/v1/restaurants/', {'open_now': 'true', 'ordering': 'name'})
+        self.assertEqual(response.status_code, 200)
+        for row in response.data['results']:
+            self.assertTrue(row['is_open_now'])
+        return [row['name'] for row in response.data['results']]
+
+    def test_filter_runs_on_compiled_schedule(self):
+        # 2026-03-06 is a Friday
+        self.assertEqual(self.open_restaurants(datetime(2026, 3, 6, 12, 0, tzinfo=dt_timezone.utc)), ['Always', 'Lunch'])
+        self.assertEqual(self.open_restaurants(datetime(2026, 3, 7, 1, 30, tzinfo=dt_timezone.utc)), ['Always', 'Late'])
+
+    def test_schedule_follows_business_hours_edits(self):
+        self.late.business_hours = {'saturday': {'open': '01:00', 'close': '05:00'}}
+        self.late.save()
+        self.assertEqual(self.late.opening_intervals.count(), 1)
+        self.assertEqual(self.open_restaurants(datetime(2026, 3, 7, 1, 30, tzinfo=dt_timezone.utc)), ['Always', 'Late'])
+        self.assertEqual(self.open_restaurants(datetime(2026, 3, 7, 0, 30, tzinfo=dt_timezone.utc)), ['Always'])
+
+
+class IncrementalRatingTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user(
+            email='owner@example.com', username='owner', password='pass', role='RESTAURANT_OWNER'
+        )
+        self.restaurant = create_restaurant(owner)
+        self.users = [
+            User.objects.create_user(email=f'user{i}@example.com', username=f'user{i}', password='pass')
+            for i in range(3)
+        ]
+
+    def review(self, user, rating, **dimensions):
+        return Review.objects.create(restaurant=self.restaurant, user=user, rating=rating, comment='', **dimensions)
+
+    def assertRating(self, average, total, food=None):
+        self.restaurant.refresh_from_db()
+        self.assertEqual(str(self.restaurant.average_rating), average)
+        self.assertEqual(self.restaurant.total_reviews, total)
+        if food is not None:
+            self.assertEqual((self.restaurant.food_rating_sum, self.restaurant.food_rating_count), food)
+
+    def test_create_edit_delete(self):
+        first = self.review(self.users[0], 5, food_rating=4)
+        self.review(self.users[1], 4)
+        second = self.review(self.users[2], 2, food_rating=2)
+        self.assertRating('3.67', 3, food=(6, 2))
+
+        second.rating = 5
+        second.food_rating = None
+        second.save()
+        self.assertRating('4.67', 3, food=(4, 1))
+
+        first.delete()
+        self.assertRating('4.50', 2, food=(0, 0))
+        Review.objects.all().delete()
+        self.assertRating('0.00', 0)
+
+    def test_new_review_does_not_rescan_reviews(self):
+        self.review(self.users[0], 5)
+        # INSERT review + one UPDATE of the restaurant counters
+        with self.assertNumQueries(2):
+            self.review(self.users[1], 3)
+
+    def test_recompute_repairs_drift(self):
+        self.review(self.users[0], 5, service_rating=3)
+        self.review(self.users[1], 2)
+        Restaurant.objects.filter(pk=self.restaurant.pk).update(average_rating=1, total_reviews=9, rating_sum=0)
+        self.restaurant.update_rating()
+        self.assertRating('3.50', 2)
+        self.assertEqual(self.restaurant.service_rating_sum, 3)
+
+    def test_rating_breakdown(self):
+        self.review(self.users[0], 5, food_rating=5, service_rating=4)
+        self.review(self.users[1], 3, food_rating=4)
+        response = APIClient().get(f'/api/v1/restaurants/{self.restaurant.slug}/')
+        self.assertEqual(response.data['rating_breakdown'], {
+            'food': {'average': 4.5, 'count': 2},
+            'service': {'average': 4.0, 'count': 1},
+            'ambiance': {'average': None, 'count': 0},
+        })
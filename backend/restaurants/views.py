@@ -2,14 +2,30 @@
 Views for restaurants app.
 """
 from rest_framework import viewsets, filters
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.db.models import Count, Q, Sum
 from django_filters.rest_framework import DjangoFilterBackend
 from restaurants.models import Restaurant, Review
 from restaurants.serializers.restaurant_serializers import RestaurantSerializer, ReviewSerializer
+from restaurants.geo import filter_nearby
+from restaurants.hours import filter_open_now, next_schedule_change, open_at
+from restaurants.tags import filter_by_tags, parse_tag_param, tag_facets
+from search.views import FullTextSearchFilter
+from core.cache import CachedResponseMixin, make_cache_key
+from core.conditional import ConditionalListMixin
 from core.permissions import IsRestaurantOwnerOrReadOnly
 
 
-class RestaurantViewSet(viewsets.ModelViewSet):
+RESTAURANT_CACHE_NAMESPACE = 'restaurants'
+
+
+class RestaurantViewSet(ConditionalListMixin, CachedResponseMixin, viewsets.ModelViewSet):
     """
     API endpoint for restaurants.
     
@@ -25,23 +41,98 @@ class RestaurantViewSet(viewsets.ModelViewSet):
     lookup_field = 'slug'
     
     # Фильтрация - УБРАЛИ cuisine_type из filterset_fields
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter]
     filterset_fields = ['price_range', 'status']  # ← Убрали cuisine_type!
-    search_fields = ['name', 'description']
+    search_fields = ['name', 'description']  # indexed in search.models.SearchEntry
+    search_kind = 'RESTAURANT'
     ordering_fields = ['average_rating', 'created_at', 'name']
     ordering = ['-average_rating']
     
+    # Public responses are cached until a Restaurant/Review change (see signals)
+    cache_namespace = RESTAURANT_CACHE_NAMESPACE
+    cache_timeout = settings.RESTAURANT_CACHE_TIMEOUT
+    
+    # is_open_now follows the clock, not updated_at, so only ETags are emitted
+    conditional_last_modified = False
+    
+    def get_conditional_aggregates(self):
+        aggregates = super().get_conditional_aggregates()
+        # Which restaurants are open right now (count and id checksum)
+        is_open = Q(open_at(), is_accepting_orders=True, status='ACTIVE')
+        aggregates['open_count'] = Count('pk', filter=is_open)
+        aggregates['open_ids'] = Sum('pk', filter=is_open)
+        return aggregates
+    
+    def is_public_request(self):
+        user = self.request.user
+        return not user.is_authenticated or user.role != 'RESTAURANT_OWNER'
+    
+    def should_cache_response(self, request):
+        # Owners also see their non-active restaurants, so skip them;
+        # open_now results change with the clock
+        return (
+            super().should_cache_response(request)
+            and self.is_public_request()
+            and 'open_now' not in request.query_params
+        )
+    
+    def get_list_state(self, queryset):
+        if not self.should_cache_response(self.request):
+            return super().get_list_state(queryset)
+        # Cached next to the responses: Restaurant/Review changes bump the
+        # namespace, and the entry is only used until the next opening or
+        # closing time moves the open-now aggregates
+        key = make_cache_key(self.cache_namespace, 'list-state', self.request.build_absolute_uri())
+        now = timezone.now()
+        cached = cache.get(key)
+        if cached is not None and now < cached[1]:
+            return cached[0]
+        state = super().get_list_state(queryset)
+        valid_until = now + timedelta(seconds=self.cache_timeout)
+        change = next_schedule_change(now)
+        if change is not None:
+            valid_until = min(valid_until, change)
+        cache.set(key, (state, valid_until), self.cache_timeout)
+        return state
+    
+    def get_response_cache_key(self, request):
+        # Cached lists are keyed by their aggregates, so is_open_now never goes stale
+        state = sorted(self.list_state.items()) if self.action == 'list' else ''
+        return make_cache_key(self.cache_namespace, self.action, request.build_absolute_uri(), state)
+    
+    def get_near_point(self):
+        """Parse ?near=lat,lng&radius=km; None when no nearby search was requested."""
+        near = self.request.query_params.get('near')
+        if not near:
+            return None
+        try:
+            latitude, longitude = (float(value) for value in near.split(','))
+            radius = float(self.request.query_params.get('radius', settings.RESTAURANT_NEARBY_DEFAULT_RADIUS_KM))
+        except ValueError:
+            raise ValidationError({'near': 'Expected near=<latitude>,<longitude> and a numeric radius (km).'})
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValidationError({'near': 'Coordinates out of range.'})
+        if not 0 < radius <= settings.RESTAURANT_NEARBY_MAX_RADIUS_KM:
+            raise ValidationError({
+                'radius': f'Radius must be between 0 and {settings.RESTAURANT_NEARBY_MAX_RADIUS_KM} km.'
+            })
+        return latitude, longitude, radius
+    
     def get_queryset(self):
         queryset = Restaurant.objects.all()
         
         # Filter by status for non-owners
-        if not self.request.user.is_authenticated or self.request.user.role != 'RESTAURANT_OWNER':
+        if self.is_public_request():
             queryset = queryset.filter(status='ACTIVE')
         
-        # РУЧНАЯ фильтрация по cuisine_type (JSONField)
-        cuisine = self.request.query_params.get('cuisine_type')
-        if cuisine:
-            queryset = queryset.filter(cuisine_type__contains=[cuisine])
+        # Фильтрация по кухням и удобствам через индексированные таблицы:
+        # ?cuisine=italian,pizza (любая из, или все при cuisine_match=all)
+        # ?feature=delivery,wifi (все, или любая при feature_match=any)
+        params = self.request.query_params
+        cuisines = parse_tag_param(params.get('cuisine') or params.get('cuisine_type', ''))
+        queryset = filter_by_tags(queryset, 'cuisine_tags', cuisines, params.get('cuisine_match') == 'all')
+        features = parse_tag_param(params.get('feature', ''))
+        queryset = filter_by_tags(queryset, 'feature_tags', features, params.get('feature_match') != 'any')
         
         # Фильтр по рейтингу
         min_rating = self.request.query_params.get('min_rating')
@@ -51,6 +142,33 @@ class RestaurantViewSet(viewsets.ModelViewSet):
             except ValueError:
                 pass
         
+        # Открытые сейчас: ?open_now=true (по расписанию в БД)
+        if params.get('open_now') in ('1', 'true'):
+            queryset = filter_open_now(queryset)
+        
+        # Поиск поблизости: ?near=lat,lng&radius=km
+        near = self.get_near_point()
+        if near:
+            queryset = filter_nearby(queryset, *near)
+        
+        return queryset
+    
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        # ?facets=true: cuisine/feature counts over the whole filtered list
+        if self.request.query_params.get('facets') in ('1', 'true'):
+            queryset = self.filter_queryset(self.get_queryset())
+            response.data['facets'] = {
+                'cuisines': tag_facets(queryset, 'cuisine_tags'),
+                'features': tag_facets(queryset, 'feature_tags'),
+            }
+        return response
+    
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        # Nearby results are sorted by distance unless another ordering is asked for
+        if self.request.query_params.get('near') and self.request.query_params.get('ordering') in (None, '', 'distance'):
+            queryset = queryset.order_by('distance', '-average_rating')
         return queryset
 
 
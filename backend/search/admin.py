@@ -0,0 +1,10 @@
+"""Admin configuration for search app."""
+from django.contrib import admin
+from search.models import SearchEntry
+
+
+@admin.register(SearchEntry)
+class SearchEntryAdmin(admin.ModelAdmin):
+    list_display = ['title', 'kind', 'restaurant', 'is_available', 'updated_at']
+    list_filter = ['kind', 'is_available']
+    search_fields = ['title']
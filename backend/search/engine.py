@@ -0,0 +1,179 @@
+"""
+Full-text search engine for search app.
+
+The inverted index over SearchEntry depends on the database:
+
+* PostgreSQL: a GIN index on a weighted tsvector expression, ranked with
+  ts_rank_cd.
+* SQLite: an FTS5 external-content table kept in sync by triggers, ranked
+  with bm25.
+* Anything else: unindexed icontains matching, unranked.
+
+Query terms are matched as prefixes and all of them must match. Title matches
+weigh more than keywords (cuisines, category), which weigh more than content.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+MAX_TERMS = 8
+
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(keywords, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(content, '')), 'C')"
+)
+
+POSTGRES_INDEX_SQL = [
+    f"CREATE INDEX IF NOT EXISTS search_entries_vector_idx ON search_entries USING GIN (({POSTGRES_VECTOR}))",
+]
+POSTGRES_DROP_SQL = ["DROP INDEX IF EXISTS search_entries_vector_idx"]
+
+SQLITE_INDEX_SQL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS search_entries_fts USING fts5(
+        title, keywords, content,
+        content='search_entries', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS search_entries_fts_insert AFTER INSERT ON search_entries BEGIN
+        INSERT INTO search_entries_fts(rowid, title, keywords, content)
+        VALUES (new.id, new.title, new.keywords, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS search_entries_fts_delete AFTER DELETE ON search_entries BEGIN
+        INSERT INTO search_entries_fts(search_entries_fts, rowid, title, keywords, content)
+        VALUES ('delete', old.id, old.title, old.keywords, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS search_entries_fts_update AFTER UPDATE ON search_entries BEGIN
+        INSERT INTO search_entries_fts(search_entries_fts, rowid, title, keywords, content)
+        VALUES ('delete', old.id, old.title, old.keywords, old.content);
+        INSERT INTO search_entries_fts(rowid, title, keywords, content)
+        VALUES (new.id, new.title, new.keywords, new.content);
+    END""",
+    # Index rows that existed before the table
+    "INSERT INTO search_entries_fts(search_entries_fts) VALUES ('rebuild')",
+]
+SQLITE_DROP_SQL = [
+    "DROP TRIGGER IF EXISTS search_entries_fts_insert",
+    "DROP TRIGGER IF EXISTS search_entries_fts_delete",
+    "DROP TRIGGER IF EXISTS search_entries_fts_update",
+    "DROP TABLE IF EXISTS search_entries_fts",
+]
+
+
+def create_index(schema_editor):
+    """Create the full-text index for the current database, if supported."""
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': POSTGRES_INDEX_SQL, 'sqlite': SQLITE_INDEX_SQL}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': POSTGRES_DROP_SQL, 'sqlite': SQLITE_DROP_SQL}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def parse_terms(query):
+    """Lower-cased word terms of a user query, at most MAX_TERMS."""
+    return re.findall(r'\w+', query.lower())[:MAX_TERMS]
+
+
+def _filters_sql(kind, restaurant_id, public_only):
+    sql = " AND r.status = 'ACTIVE' AND e.is_available" if public_only else ""
+    params = []
+    if kind:
+        sql += " AND e.kind = %s"
+        params.append(kind)
+    if restaurant_id:
+        sql += " AND e.restaurant_id = %s"
+        params.append(restaurant_id)
+    return sql, params
+
+
+def _search_postgres(terms, kind, restaurant_id, public_only, columns):
+    filters, params = _filters_sql(kind, restaurant_id, public_only)
+    vector = POSTGRES_VECTOR.replace('coalesce(', 'coalesce(e.')
+    sql = (
+        f"SELECT {columns}, ts_rank_cd({vector}, q.query) AS score "
+        f"FROM search_entries e JOIN restaurants r ON r.id = e.restaurant_id, "
+        f"to_tsquery('simple', %s) AS q(query) "
+        f"WHERE {vector} @@ q.query{filters} "
+        f"ORDER BY score DESC, e.id"
+    )
+    return sql, [' & '.join(f'{term}:*' for term in terms), *params]
+
+
+def _search_sqlite(terms, kind, restaurant_id, public_only, columns):
+    filters, params = _filters_sql(kind, restaurant_id, public_only)
+    sql = (
+        f"SELECT {columns}, -bm25(search_entries_fts, 10.0, 5.0, 1.0) AS score "
+        "FROM search_entries_fts "
+        "JOIN search_entries e ON e.id = search_entries_fts.rowid "
+        "JOIN restaurants r ON r.id = e.restaurant_id "
+        f"WHERE search_entries_fts MATCH %s{filters} "
+        "ORDER BY score DESC, e.id"
+    )
+    return sql, [' '.join(f'"{term}"*' for term in terms), *params]
+
+
+QUERY_BUILDERS = {'postgresql': _search_postgres, 'sqlite': _search_sqlite}
+
+
+def _fallback_queryset(terms, kind, restaurant_id, public_only):
+    from search.models import SearchEntry
+
+    queryset = SearchEntry.objects.all()
+    if public_only:
+        queryset = queryset.filter(restaurant__status='ACTIVE', is_available=True)
+    if kind:
+        queryset = queryset.filter(kind=kind)
+    if restaurant_id:
+        queryset = queryset.filter(restaurant_id=restaurant_id)
+    for term in terms:
+        queryset = queryset.filter(
+            Q(title__icontains=term) | Q(keywords__icontains=term) | Q(content__icontains=term)
+        )
+    return queryset
+
+
+def search(query, kind=None, restaurant_id=None, public_only=True, limit=20, offset=0):
+    """
+    Return [(entry_id, score)] of the SearchEntry rows matching query, best
+    first. Unless public_only is False, entries of non-active restaurants and
+    unavailable menu items are skipped. Pass limit=None for every match.
+    """
+    terms = parse_terms(query)
+    if not terms:
+        return []
+
+    builder = QUERY_BUILDERS.get(connection.vendor)
+    if builder is None:
+        ids = _fallback_queryset(terms, kind, restaurant_id, public_only).order_by('id').values_list('id', flat=True)
+        if limit is not None:
+            ids = ids[offset:offset + limit]
+        return [(entry_id, 0.0) for entry_id in ids]
+
+    sql, params = builder(terms, kind, restaurant_id, public_only, 'e.id')
+    if limit is not None:
+        sql += " LIMIT %s OFFSET %s"
+        params += [limit, offset]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def matching_object_ids(query, kind, public_only=True):
+    """
+    Subquery of the object ids of `kind` matching query, for use as
+    `queryset.filter(pk__in=...)`.
+    """
+    terms = parse_terms(query)
+    builder = QUERY_BUILDERS.get(connection.vendor)
+    if builder is None:
+        return _fallback_queryset(terms, kind, None, public_only).values('object_id')
+    sql, params = builder(terms, kind, None, public_only, 'e.object_id')
+    # Ranking is irrelevant inside IN (...): wrap to select the ids only
+    return RawSQL(f"SELECT object_id FROM ({sql}) AS matches", params)
@@ -0,0 +1,94 @@
+"""
+Search index maintenance for search app.
+
+Each restaurant and menu item is mirrored into one SearchEntry row. Rows are
+written with a bulk upsert on (kind, object_id), so saving an object costs a
+single statement; the database-side full-text index follows the rows (GIN
+expression index on Postgres, FTS5 triggers on SQLite).
+"""
+from itertools import chain, islice
+
+from django.apps import apps as global_apps
+
+DIETARY_TAGS = [
+    ('is_vegetarian', 'vegetarian'),
+    ('is_vegan', 'vegan'),
+    ('is_gluten_free', 'gluten-free'),
+]
+
+
+def restaurant_document(restaurant):
+    """SearchEntry field values of a restaurant."""
+    cuisines = restaurant.cuisine_type if isinstance(restaurant.cuisine_type, list) else []
+    return {
+        'kind': 'RESTAURANT',
+        'object_id': restaurant.pk,
+        'restaurant_id': restaurant.pk,
+        'title': restaurant.name,
+        'keywords': ' '.join([*map(str, cuisines), restaurant.city]),
+        'content': restaurant.description,
+        'is_available': True,
+    }
+
+
+def menu_item_document(item, category_name):
+    """SearchEntry field values of a menu item."""
+    tags = [tag for field, tag in DIETARY_TAGS if getattr(item, field)]
+    return {
+        'kind': 'MENU_ITEM',
+        'object_id': item.pk,
+        'restaurant_id': item.restaurant_id,
+        'title': item.name,
+        'keywords': ' '.join([category_name, *tags]),
+        'content': item.description,
+        'is_available': item.is_available,
+    }
+
+
+def upsert_entries(documents, apps=global_apps):
+    SearchEntry = apps.get_model('search', 'SearchEntry')
+    SearchEntry.objects.bulk_create(
+        [SearchEntry(**document) for document in documents],
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['kind', 'object_id'],
+        update_fields=['restaurant', 'title', 'keywords', 'content', 'is_available', 'updated_at'],
+    )
+
+
+def index_restaurant(restaurant):
+    upsert_entries([restaurant_document(restaurant)])
+
+
+def index_menu_items(items):
+    """Index menu items; `items` should have their category selected."""
+    upsert_entries([menu_item_document(item, item.category.name) for item in items])
+
+
+def remove_entries(kind, object_ids):
+    from search.models import SearchEntry
+    SearchEntry.objects.filter(kind=kind, object_id__in=object_ids).delete()
+
+
+def rebuild_index(apps=global_apps, batch_size=2000):
+    """
+    Recreate every entry from restaurants and menu items. Migrations pass
+    their historical `apps`. Returns the number of entries written.
+    """
+    Restaurant = apps.get_model('restaurants', 'Restaurant')
+    MenuItem = apps.get_model('menu', 'MenuItem')
+    SearchEntry = apps.get_model('search', 'SearchEntry')
+
+    SearchEntry.objects.all().delete()
+    documents = chain(
+        (restaurant_document(restaurant) for restaurant in Restaurant.objects.iterator(chunk_size=batch_size)),
+        (
+            menu_item_document(item, item.category.name)
+            for item in MenuItem.objects.select_related('category').iterator(chunk_size=batch_size)
+        ),
+    )
+    written = 0
+    while batch := list(islice(documents, batch_size)):
+        upsert_entries(batch, apps)
+        written += len(batch)
+    return written
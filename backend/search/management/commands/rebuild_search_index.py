@@ -0,0 +1,11 @@
+"""Recreate the search index from restaurants and menu items."""
+from django.core.management.base import BaseCommand
+from search.indexing import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Recreate every search entry from restaurants and menu items.'
+
+    def handle(self, *args, **options):
+        written = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {written} search entries'))
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.14 on 2026-10-18 19:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('restaurants', '0003_restaurant_geohash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('RESTAURANT', 'Restaurant'), ('MENU_ITEM', 'Menu Item')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('keywords', models.TextField(blank=True)),
+                ('content', models.TextField(blank=True)),
+                ('is_available', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('restaurant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='restaurants.restaurant')),
+            ],
+            options={
+                'verbose_name_plural': 'Search Entries',
+                'db_table': 'search_entries',
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from search.engine import create_index, drop_index
+from search.indexing import rebuild_index
+
+
+def create_full_text_index(apps, schema_editor):
+    create_index(schema_editor)
+    rebuild_index(apps)
+
+
+def drop_full_text_index(apps, schema_editor):
+    drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('menu', '0002_initial'),
+        ('restaurants', '0003_restaurant_geohash'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_full_text_index, drop_full_text_index),
+    ]
@@ -0,0 +1,36 @@
+from django.db import models
+from restaurants.models import Restaurant
+
+
+class SearchEntry(models.Model):
+    """
+    Searchable text of one restaurant or menu item.
+
+    Rows are maintained by search.signals; the full-text index over them is
+    created by the migrations (see search.engine).
+    """
+    
+    KIND_CHOICES = [
+        ('RESTAURANT', 'Restaurant'),
+        ('MENU_ITEM', 'Menu Item'),
+    ]
+    
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE, related_name='search_entries')
+    
+    # Ranked by weight: title > keywords > content
+    title = models.CharField(max_length=255)
+    keywords = models.TextField(blank=True)  # e.g., cuisines, menu category
+    content = models.TextField(blank=True)
+    
+    is_available = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'search_entries'
+        unique_together = ['kind', 'object_id']
+        verbose_name_plural = 'Search Entries'
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} - {self.title}"
@@ -0,0 +1,15 @@
+"""Serializers for search app."""
+from rest_framework import serializers
+from search.models import SearchEntry
+
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    restaurant = serializers.SerializerMethodField()
+    score = serializers.FloatField(read_only=True)
+    
+    class Meta:
+        model = SearchEntry
+        fields = ['kind', 'object_id', 'title', 'keywords', 'restaurant', 'score']
+    
+    def get_restaurant(self, obj):
+        return {'id': obj.restaurant_id, 'name': obj.restaurant.name, 'slug': obj.restaurant.slug}
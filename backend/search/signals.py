@@ -0,0 +1,29 @@
+"""Signals for search app: keep SearchEntry rows in step with their sources."""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from menu.models import MenuCategory, MenuItem
+from restaurants.models import Restaurant
+from search.indexing import index_menu_items, index_restaurant, remove_entries
+
+
+@receiver(post_save, sender=Restaurant)
+def index_saved_restaurant(sender, instance, **kwargs):
+    # Deleting a restaurant cascades to all of its entries
+    index_restaurant(instance)
+
+
+@receiver(post_save, sender=MenuItem)
+def index_saved_menu_item(sender, instance, **kwargs):
+    index_menu_items([instance])
+
+
+@receiver(post_delete, sender=MenuItem)
+def remove_deleted_menu_item(sender, instance, **kwargs):
+    remove_entries('MENU_ITEM', [instance.pk])
+
+
+@receiver(post_save, sender=MenuCategory)
+def reindex_renamed_category(sender, instance, created, **kwargs):
+    """Category names are indexed with their items."""
+    if not created and instance.has_field_changed('name'):
+        index_menu_items(instance.items.select_related('category'))
@@ -0,0 +1,78 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from menu.models import MenuCategory, MenuItem
+from restaurants.tests import create_restaurant
+from search.indexing import rebuild_index
+from search.models import SearchEntry
+from users.models import User
+
+
+class FullTextSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.owner = User.objects.create_user(
+            email='owner@example.com', username='owner', password='pass', role='RESTAURANT_OWNER'
+        )
+        self.nomad = create_restaurant(
+            self.owner, cuisine_type=['Kazakh', 'Grill'], description='Beshbarmak and lamb dishes'
+        )
+        self.napoli = create_restaurant(
+            self.owner, name='Napoli', slug='napoli', cuisine_type=['Italian', 'Pizza'],
+            description='Wood-fired pizza',
+        )
+        self.category = MenuCategory.objects.create(restaurant=self.nomad, name='Mains')
+        self.item = MenuItem.objects.create(
+            restaurant=self.nomad, category=self.category, name='Lamb shashlik',
+            description='Grilled on charcoal', price='12.50',
+        )
+
+    def search(self, **params):
+        response = self.client.get('/api/v1/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return [(row['kind'], row['title']) for row in response.data['results']]
+
+    def test_matches_restaurants_cuisines_and_menu_items(self):
+        self.assertEqual(self.search(q='pizza'), [('RESTAURANT', 'Napoli')])
+        self.assertEqual(self.search(q='kazakh'), [('RESTAURANT', 'Nomad')])
+        self.assertEqual(self.search(q='shash'), [('MENU_ITEM', 'Lamb shashlik')])
+
+    def test_title_matches_rank_first(self):
+        # "lamb" is the item's name but only the restaurant's description
+        self.assertEqual(self.search(q='lamb'), [('MENU_ITEM', 'Lamb shashlik'), ('RESTAURANT', 'Nomad')])
+        self.assertEqual(self.search(q='lamb', type='restaurant'), [('RESTAURANT', 'Nomad')])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.item.name = 'Lamb kebab'
+        self.item.save()
+        self.assertEqual(self.search(q='kebab'), [('MENU_ITEM', 'Lamb kebab')])
+        self.category.name = 'Grill specials'
+        self.category.save()
+        self.assertEqual(self.search(q='specials'), [('MENU_ITEM', 'Lamb kebab')])
+        self.item.delete()
+        self.assertEqual(self.search(q='kebab'), [])
+        self.napoli.status = 'INACTIVE'
+        self.napoli.save()
+        self.assertEqual(self.search(q='pizza'), [])
+
+    def test_rebuild_index(self):
+        SearchEntry.objects.all().delete()
+        self.assertEqual(rebuild_index(), 3)
+        self.assertEqual(self.search(q='wood fired'), [('RESTAURANT', 'Napoli')])
+
+    def test_restaurant_list_search_uses_index(self):
+        response = self.client.get('/api/v1/restaurants/', {'search': 'beshbarmak'})
+        self.assertEqual([row['name'] for row in response.data['results']], ['Nomad'])
+
+    def test_empty_query(self):
+        response = self.client.get('/api/v1/search/', {'q': '  ?! '})
+        self.assertEqual(response.status_code, 400)
+
+    def test_limit_is_validated(self):
+        response = self.client.get('/api/v1/search/', {'q': 'nomad', 'limit': '-1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+        response = self.client.get('/api/v1/search/', {'q': 'nomad', 'limit': 'all'})
+        self.assertEqual(response.status_code, 400)
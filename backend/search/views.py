@@ -0,0 +1,67 @@
+"""Views for search app."""
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from search.engine import matching_object_ids, parse_terms, search
+from search.models import SearchEntry
+from search.serializers.search_serializers import SearchResultSerializer
+
+
+MAX_RESULTS = 50
+
+
+class SearchView(APIView):
+    """
+    Full-text search over restaurants (name, cuisines, city, description)
+    and menu items (name, category, dietary tags, description), best match
+    first.
+    
+    Query parameters: q, type (restaurant | menu_item), restaurant (id),
+    limit (1-50), offset.
+    """
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        if not parse_terms(query):
+            raise ValidationError({'q': 'Enter at least one search term.'})
+        
+        kind = request.query_params.get('type')
+        if kind:
+            kind = kind.upper()
+            if kind not in dict(SearchEntry.KIND_CHOICES):
+                raise ValidationError({'type': 'Expected restaurant or menu_item.'})
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), MAX_RESULTS)
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+            restaurant_id = int(request.query_params['restaurant']) if request.query_params.get('restaurant') else None
+        except ValueError:
+            raise ValidationError({'detail': 'limit, offset and restaurant must be integers.'})
+        
+        matches = search(query, kind=kind, restaurant_id=restaurant_id, limit=limit, offset=offset)
+        entries = SearchEntry.objects.select_related('restaurant').in_bulk([entry_id for entry_id, _ in matches])
+        results = []
+        for entry_id, score in matches:
+            entry = entries[entry_id]
+            entry.score = round(score, 4)
+            results.append(entry)
+        
+        return Response({
+            'query': query,
+            'results': SearchResultSerializer(results, many=True).data,
+        })
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter backed by the full-text index instead of icontains scans.
+    Views set `search_kind` to the SearchEntry kind of their model.
+    """
+    
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        if not parse_terms(query):
+            return queryset
+        return queryset.filter(pk__in=matching_object_ids(query, view.search_kind, public_only=False))
@@ -1,8 +1,9 @@
 from django.db import models
 from users.models import User
+from core.tracking import TrackedFieldsMixin
 
 
-class SupportTicket(models.Model):
+class SupportTicket(TrackedFieldsMixin, models.Model):
     """Support ticket model."""
     
     STATUS_CHOICES = [
@@ -30,6 +31,8 @@ class SupportTicket(models.Model):
         ('OTHER', 'Other'),
     ]
     
+    tracked_fields = ('status',)
+    
     ticket_number = models.CharField(max_length=50, unique=True, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='support_tickets')
     
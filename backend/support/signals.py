@@ -1,20 +1,15 @@
 """Signals for support app."""
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save
 from django.dispatch import receiver
 from support.models import SupportTicket, TicketComment
-from notifications.models import Notification
+from notifications.outbox import notify
 
 
-@receiver(pre_save, sender=SupportTicket)
-def store_previous_ticket_status(sender, instance, **kwargs):
-    """Store previous status on instance to detect actual status changes."""
-    if instance.pk:
-        try:
-            instance._previous_status = SupportTicket.objects.get(pk=instance.pk).status
-        except SupportTicket.DoesNotExist:
-            instance._previous_status = None
-    else:
-        instance._previous_status = None
+def notify_ticket(ticket, title, message):
+    notify(
+        ticket.user_id, 'SYSTEM', title, message,
+        data={'ticket_id': ticket.pk}, coalesce_key=f'ticket:{ticket.pk}',
+    )
 
 
 @receiver(post_save, sender=SupportTicket)
@@ -22,33 +17,27 @@ def create_ticket_notification(sender, instance, created, **kwargs):
     """Create notification when ticket is created or status changes."""
 
     if created:
-        Notification.objects.create(
-            user=instance.user,
-            notification_type='SYSTEM',
-            title='Support Ticket Created',
-            message=(
+        notify_ticket(
+            instance, 'Support Ticket Created',
+            (
                 f'Your support ticket #{instance.ticket_number} has been created. '
                 f'We will respond shortly.'
             ),
         )
     else:
-        previous_status = getattr(instance, '_previous_status', None)
+        previous_status = instance.get_previous_value('status')
         if previous_status == instance.status:
             return
 
         if instance.status == 'IN_PROGRESS':
-            Notification.objects.create(
-                user=instance.user,
-                notification_type='SYSTEM',
-                title='Ticket In Progress',
-                message=f'Your support ticket #{instance.ticket_number} is being worked on.',
+            notify_ticket(
+                instance, 'Ticket In Progress',
+                f'Your support ticket #{instance.ticket_number} is being worked on.',
             )
         elif instance.status == 'RESOLVED':
-            Notification.objects.create(
-                user=instance.user,
-                notification_type='SYSTEM',
-                title='Ticket Resolved',
-                message=f'Your support ticket #{instance.ticket_number} has been resolved.',
+            notify_ticket(
+                instance, 'Ticket Resolved',
+                f'Your support ticket #{instance.ticket_number} has been resolved.',
             )
 
 
@@ -56,12 +45,10 @@ def create_ticket_notification(sender, instance, created, **kwargs):
 def create_comment_notification(sender, instance, created, **kwargs):
     """Notify user when admin responds to their ticket."""
 
-    if created and instance.user != instance.ticket.user:
-        Notification.objects.create(
-            user=instance.ticket.user,
-            notification_type='SYSTEM',
-            title='New Response on Your Ticket',
-            message=(
+    if created and instance.user_id != instance.ticket.user_id:
+        notify_ticket(
+            instance.ticket, 'New Response on Your Ticket',
+            (
                 f'You have a new response on support ticket '
                 f'#{instance.ticket.ticket_number}.'
             ),
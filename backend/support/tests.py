@@ -1,3 +1,52 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from notifications.models import Notification
+from support.models import SupportTicket
+from users.models import User
+
+
+class TicketStatusTrackingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        dispatch = mock.patch('notifications.tasks.dispatch_notifications.delay')
+        dispatch.start()
+        self.addCleanup(dispatch.stop)
+        self.user = User.objects.create_user(
+            email='customer@example.com', username='customer', password='pass'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket = SupportTicket.objects.create(
+                user=self.user, category='ORDER', subject='Late order', description='Where is it?'
+            )
+        self.ticket = SupportTicket.objects.select_related('user').get(pk=ticket.pk)
+
+    def titles(self):
+        return list(Notification.objects.filter(user=self.user).order_by('id').values_list('title', flat=True))
+
+    def test_status_change_saves_without_reading_the_row(self):
+        self.ticket.status = 'IN_PROGRESS'
+        # Only the UPDATE: no SELECT of the previous status, and the
+        # notification is inserted once the transaction commits
+        with self.captureOnCommitCallbacks() as callbacks, self.assertNumQueries(1):
+            self.ticket.save()
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.titles(), ['Support Ticket Created', 'Ticket In Progress'])
+
+    def test_unchanged_status_does_not_notify_again(self):
+        self.ticket.status = 'IN_PROGRESS'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ticket.save()
+        self.ticket.priority = 'HIGH'
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(1):
+            self.ticket.save()
+        self.assertEqual(self.titles(), ['Support Ticket Created', 'Ticket In Progress'])
+
+    def test_previous_value_follows_refresh(self):
+        SupportTicket.objects.filter(pk=self.ticket.pk).update(status='RESOLVED')
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.get_previous_value('status'), 'RESOLVED')
+        self.assertFalse(self.ticket.has_field_changed('status'))